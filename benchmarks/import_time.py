@@ -0,0 +1,122 @@
+"""
+Import time of the stiffpy packages
+
+Every package is imported in a fresh interpreter with python -X importtime
+(as a batch job that starts a new process per model), the cumulative import
+time of the package, its heaviest imports and the optional heavy modules
+(matplotlib, scipy) loaded by the import are reported.
+
+Usage
+-----
+python benchmarks/import_time.py [--repeat 5] [--top 5] [--json import_time.json] [--check]
+
+--check exits with status 1 if a package loads one of the heavy modules
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+
+PACKAGES = ('stiffpy', 'stiffpy.beam', 'stiffpy.truss', 'stiffpy.frame', 'stiffpy.spring')
+# Modules that must only be loaded on first use (plotting, scipy solvers)
+HEAVY_MODULES = ('matplotlib', 'scipy')
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_importtime(output: str):
+    """
+    Modules in the output of python -X importtime, in import order (a module
+    follows the modules it imports)
+
+    Returns
+    -------
+    modules: list
+        (name, self time, cumulative time, depth) of every module, times in
+        microseconds, depth 0 for the modules imported by the script
+    """
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_time, cumulative, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip()) - 1)//2
+        modules.append((name.strip(), int(self_time), int(cumulative), depth))
+    return modules
+
+
+def imported_by(modules, package: str):
+    """
+    Cumulative time of the package and the modules imported by its import
+    (see parse_importtime)
+    """
+    end = next(i for i, (name, *_, depth) in enumerate(modules) if name == package and depth == 0)
+    start = max((i + 1 for i, (*_, depth) in enumerate(modules[:end]) if depth == 0), default=0)
+    return modules[end][2], modules[start:end]
+
+
+def import_time(package: str):
+    """
+    Import the package in a new interpreter
+
+    Returns
+    -------
+    modules: list
+        See parse_importtime
+    heavy: list
+        Heavy modules loaded by the import
+    """
+    code = f"import sys, {package}; print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    environment = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+            capture_output=True, text=True, cwd=ROOT, env=environment, check=True)
+    return parse_importtime(process.stderr), process.stdout.split()
+
+
+def benchmark(packages=PACKAGES, repeat: int=5, top: int=5):
+    """
+    Best import time of each package over repeat fresh interpreters
+
+    Returns
+    -------
+    results: dict
+        By package: cumulative_ms, the heaviest imports [(module, cumulative_ms)]
+        and the heavy modules loaded
+    """
+    results = {}
+    for package in packages:
+        runs = [imported_by(modules, package) + (heavy,)
+                for modules, heavy in (import_time(package) for _ in range(repeat))]
+        cumulative, imported, heavy = min(runs, key=lambda run: run[0])
+        # Top level modules other than stiffpy (what the import pays for)
+        heaviest = sorted(((name, module_cumulative) for name, _, module_cumulative, _ in imported
+            if '.' not in name and name != 'stiffpy'), key=lambda item: -item[1])[:top]
+        results[package] = {
+                'cumulative_ms': cumulative/1000,
+                'heaviest': [(name, module_cumulative/1000) for name, module_cumulative in heaviest],
+                'heavy_modules': heavy}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=5)
+    parser.add_argument('--json', help='Write the results to this file')
+    parser.add_argument('--check', action='store_true', help='Fail if a heavy module is loaded')
+    arguments = parser.parse_args()
+    results = benchmark(repeat=arguments.repeat, top=arguments.top)
+    for package, result in results.items():
+        heaviest = ', '.join(f'{name} {ms:.1f}' for name, ms in result['heaviest'])
+        print(f"{package:16} {result['cumulative_ms']:8.1f} ms  [{heaviest}]"
+                + (f"  loads {' '.join(result['heavy_modules'])}" if result['heavy_modules'] else ''))
+    if arguments.json:
+        with open(arguments.json, 'w') as file:
+            json.dump(results, file, indent=2)
+    if arguments.check and any(result['heavy_modules'] for result in results.values()):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
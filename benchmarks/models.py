@@ -0,0 +1,107 @@
+"""
+Synthetic models of parametric size for the benchmarks
+
+Every function builds a solvable structure whose number of members grows
+linearly with size, using the classes of its package (stiffpy.truss,
+stiffpy.beam, stiffpy.frame and stiffpy.spring) as a user would.
+"""
+from stiffpy.material import Material
+from stiffpy.section import Section
+
+
+def _section():
+    material = Material(E=2e7, f_y=1, f_u=1)
+    return Section(A=0.01, Ix=1e-4, material=material)
+
+
+def truss(size: int, sparse: bool=False):
+    """
+    Pratt truss of size panels (4 size + 1 members), pinned and roller
+    supported, loaded at the top chord
+    """
+    from stiffpy.truss import Truss, Member, Node, Force
+    section = _section()
+    bottom = [Node((2*i, 0), no=i + 1) for i in range(size + 1)]
+    top = [Node((2*i, 2), no=size + i + 2) for i in range(size + 1)]
+    members = [Member(bottom[i], bottom[i + 1], section) for i in range(size)]
+    members += [Member(top[i], top[i + 1], section) for i in range(size)]
+    members += [Member(bottom[i], top[i], section) for i in range(size + 1)]
+    members += [Member(bottom[i], top[i + 1], section) if i < size//2
+            else Member(top[i], bottom[i + 1], section) for i in range(size)]
+    for node in top:
+        node.force = Force((0, -10))
+    bottom[0].restrains = (True, True)
+    bottom[-1].restrains = (False, True)
+    structure = Truss(sparse=sparse)
+    structure.members = members
+    return structure
+
+
+def continuous_beam(size: int, sparse: bool=False):
+    """
+    Beam of size spans on simple supports, fixed at the left end, with a
+    uniform load on every span and a point force at the middle of every
+    span
+    """
+    from stiffpy.beam import Beam, Member, Node, DistributedForce, Force
+    section = _section()
+    nodes = [Node(5*i, no=i + 1) for i in range(size + 1)]
+    members = [Member(nodes[i], nodes[i + 1], section) for i in range(size)]
+    for member in members:
+        member.distributed_loads = (0, DistributedForce(-10, -10, 5))
+        member.forces = (2.5, Force(-20))
+    nodes[0].restrains = (True, True)
+    for node in nodes[1:]:
+        node.restrains = (True, False)
+    structure = Beam(sparse=sparse)
+    structure.members = members
+    return structure
+
+
+def frame(size: int, sparse: bool=False, bays: int=3):
+    """
+    Plane frame of size storeys and bays bays, fixed at the base, with a
+    uniform load on the beams and a lateral force at every storey
+    """
+    from stiffpy.frame import Frame, Member, Node, DistributedForce, Force
+    section = _section()
+    nodes = [[Node((6*bay, 3*storey), no=storey*(bays + 1) + bay + 1) for bay in range(bays + 1)]
+            for storey in range(size + 1)]
+    members = []
+    for storey in range(1, size + 1):
+        for bay in range(bays + 1):
+            members.append(Member(nodes[storey - 1][bay], nodes[storey][bay], section))
+        for bay in range(bays):
+            beam = Member(nodes[storey][bay], nodes[storey][bay + 1], section)
+            beam.distributed_loads = (0, DistributedForce((0, -10), (0, -10), 6))
+            members.append(beam)
+        nodes[storey][0].force = Force((5, 0))
+    for node in nodes[0]:
+        node.restrains = (True, True, True)
+    structure = Frame(sparse=sparse)
+    structure.members = members
+    return structure
+
+
+def spring_chain(size: int, sparse: bool=False):
+    """
+    Chain of size springs fixed at both ends with a force at every inner
+    node
+    """
+    from stiffpy.spring import Spring, Member, Node, Force
+    nodes = [Node(i, no=i + 1) for i in range(size + 1)]
+    members = [Member(nodes[i], nodes[i + 1], 10 + i % 3) for i in range(size)]
+    for node in nodes[1:-1]:
+        node.force = Force(1)
+    nodes[0].restrains = True
+    nodes[-1].restrains = True
+    structure = Spring(sparse=sparse)
+    structure.members = members
+    return structure
+
+
+MODELS = {
+        'truss': truss,
+        'continuous_beam': continuous_beam,
+        'frame': frame,
+        'spring_chain': spring_chain}
@@ -0,0 +1,248 @@
+"""
+Benchmark suite of stiffpy
+
+Every stage of an analysis (model construction, assembly of the stiffness
+matrix, solve with the matrix assembled, redistribution of the results to
+the nodes, member end actions, evaluation of the diagrams and rendering
+with PlotterStructure) is timed on the synthetic models of
+benchmarks/models.py for several sizes, the import time of the packages is
+measured in fresh interpreters (see import_time.py).
+
+The time of a stage is the best of repeat runs (a new model every run),
+its peak memory is measured by tracemalloc in a separate run (tracemalloc
+slows down the code it traces).
+
+Usage
+-----
+python benchmarks/run.py [--models truss frame] [--sizes 10 100] [--repeat 3]
+        [--output results.json] [--baseline baseline.json]
+        [--time-threshold 0.25] [--memory-threshold 0.10] [--sparse] [--no-plot]
+        [--ordering rcm]
+
+With --baseline the results are compared with a previous output, the
+stages slower (or using more memory) than the baseline by more than the
+threshold are reported as regressions and the exit status is 1. The
+baselines are machine dependent, keep one per machine (e.g: run with
+--output baseline.json on the main branch).
+"""
+import argparse
+import datetime
+import importlib.util
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+from models import MODELS
+import import_time
+
+
+DEFAULT_SIZES = (10, 100, 500)
+# Differences below these are noise, they are never regressions
+MINIMUM_TIME = 1e-3
+MINIMUM_MEMORY = 64*1024
+
+
+def _axes():
+    """
+    Axes of a figure of a non interactive backend
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    from matplotlib import pyplot as plt
+    return plt.subplots(2, 1)[1]
+
+
+def _stages(build, size: int, sparse: bool, plot: bool, ordering: str=None):
+    """
+    Stages of an analysis of a new model, every stage is a function run
+    after the previous one
+
+    Returns
+    -------
+    stages: list
+        (name, function) of every stage
+    """
+    from stiffpy.member import MEMBER_RESULTS_CACHE
+    model = {}
+
+    def construction():
+        model['structure'] = build(size, sparse)
+        model['structure'].ordering = ordering
+
+    def assembly():
+        model['structure']._assemble()
+
+    def solve():
+        # The blocks assembled by the previous stage are reused
+        model['structure']._solve()
+
+    def redistribution():
+        model['structure']._redistribution()
+
+    def end_actions():
+        model['structure']._end_actions()
+
+    def diagrams():
+        for member in model['structure'].members:
+            member.bending
+            member.deflection
+
+    def render():
+        from stiffpy.plotter.plotter_structure import PlotterStructure
+        axes = _axes()
+        plotter = PlotterStructure(model['structure'])
+        plotter.draw(axes[0])
+        plotter.draw_deformated_shape(axes[1])
+        from matplotlib import pyplot as plt
+        plt.close('all')
+
+    # The cached results of the previous runs would hide the diagrams stage
+    MEMBER_RESULTS_CACHE.clear()
+    stages = [('construction', construction), ('assembly', assembly), ('solve', solve),
+            ('redistribution', redistribution), ('end_actions', end_actions), ('diagrams', diagrams)]
+    if plot and importlib.util.find_spec('matplotlib') is not None:
+        stages.append(('plot', render))
+    return stages
+
+
+def _timed(stages):
+    times = {}
+    for name, function in stages:
+        start = time.perf_counter()
+        function()
+        times[name] = time.perf_counter() - start
+    return times
+
+
+def _peak_memory(stages):
+    memory = {}
+    tracemalloc.start()
+    try:
+        for name, function in stages:
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            function()
+            memory[name] = tracemalloc.get_traced_memory()[1] - current
+    finally:
+        tracemalloc.stop()
+    return memory
+
+
+def benchmark_model(name: str, size: int, repeat: int=3, sparse: bool=False, plot: bool=True,
+        ordering: str=None):
+    """
+    Time (seconds, best of repeat) and peak memory (bytes) of every stage of
+    the analysis of a model
+
+    Returns
+    -------
+    results: dict
+        {'time': ..., 'peak_memory': ...} by stage
+    """
+    build = MODELS[name]
+    runs = [_timed(_stages(build, size, sparse, plot, ordering)) for _ in range(repeat)]
+    memory = _peak_memory(_stages(build, size, sparse, plot, ordering))
+    return {stage: {'time': min(run[stage] for run in runs), 'peak_memory': memory[stage]}
+            for stage in runs[0]}
+
+
+def benchmark(models=tuple(MODELS), sizes=DEFAULT_SIZES, repeat: int=3, sparse: bool=False,
+        plot: bool=True, imports: bool=True, ordering: str=None):
+    """
+    Results of every model and size (see benchmark_model) and import times
+    (see import_time.benchmark)
+    """
+    results = {
+            'metadata': {
+                'date': datetime.datetime.now().isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'numpy': np.__version__,
+                'platform': platform.platform(),
+                'repeat': repeat,
+                'sparse': sparse,
+                'ordering': ordering},
+            'models': {}}
+    if imports:
+        results['import'] = import_time.benchmark(repeat=repeat)
+    for name in models:
+        results['models'][name] = {}
+        for size in sizes:
+            results['models'][name][str(size)] = benchmark_model(name, size, repeat, sparse, plot, ordering)
+            print(f'{name} {size}: ' + ', '.join(f"{stage} {values['time']*1e3:.1f} ms"
+                for stage, values in results['models'][name][str(size)].items()), flush=True)
+    return results
+
+
+def compare(results: dict, baseline: dict, time_threshold: float=0.25, memory_threshold: float=0.10):
+    """
+    Regressions of the results with respect to the baseline
+
+    Parameters
+    ----------
+    time_threshold, memory_threshold: float
+        Allowed relative increase of the time and of the peak memory
+
+    Returns
+    -------
+    regressions: list
+        (benchmark, measure, baseline value, value) of every regression
+    """
+    regressions = []
+    for name, sizes in results['models'].items():
+        for size, stages in sizes.items():
+            baseline_stages = baseline.get('models', {}).get(name, {}).get(size, {})
+            for stage, values in stages.items():
+                if stage not in baseline_stages:
+                    continue
+                for measure, threshold, minimum in (('time', time_threshold, MINIMUM_TIME),
+                        ('peak_memory', memory_threshold, MINIMUM_MEMORY)):
+                    old, new = baseline_stages[stage][measure], values[measure]
+                    if new > old*(1 + threshold) and new - old > minimum:
+                        regressions.append((f'{name}[{size}].{stage}', measure, old, new))
+    for package, values in results.get('import', {}).items():
+        old = baseline.get('import', {}).get(package)
+        if old is not None and values['cumulative_ms'] > old['cumulative_ms']*(1 + time_threshold) \
+                and values['cumulative_ms'] - old['cumulative_ms'] > MINIMUM_TIME*1e3:
+            regressions.append((f'import {package}', 'cumulative_ms', old['cumulative_ms'], values['cumulative_ms']))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--models', nargs='+', choices=tuple(MODELS), default=tuple(MODELS))
+    parser.add_argument('--sizes', nargs='+', type=int, default=DEFAULT_SIZES)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--sparse', action='store_true', help='Sparse assembly and solver')
+    parser.add_argument('--no-plot', action='store_true', help='Skip the plot stage')
+    parser.add_argument('--ordering', choices=('rcm', 'amd'), help='Fill reducing ordering of the nodes')
+    parser.add_argument('--no-import', action='store_true', help='Skip the import times')
+    parser.add_argument('--output', help='Write the results to this JSON file')
+    parser.add_argument('--baseline', help='Compare with the results in this JSON file')
+    parser.add_argument('--time-threshold', type=float, default=0.25)
+    parser.add_argument('--memory-threshold', type=float, default=0.10)
+    arguments = parser.parse_args()
+    results = benchmark(arguments.models, arguments.sizes, arguments.repeat, arguments.sparse,
+            not arguments.no_plot, not arguments.no_import, arguments.ordering)
+    if arguments.output:
+        with open(arguments.output, 'w') as file:
+            json.dump(results, file, indent=2)
+    if arguments.baseline:
+        with open(arguments.baseline) as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, arguments.time_threshold, arguments.memory_threshold)
+        for benchmark_name, measure, old, new in regressions:
+            print(f'REGRESSION {benchmark_name} {measure}: {old:.4g} -> {new:.4g} ({new/old - 1:+.0%})')
+        if regressions:
+            sys.exit(1)
+        print('No regressions')
+
+
+if __name__ == '__main__':
+    main()
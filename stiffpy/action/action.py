@@ -2,9 +2,11 @@ import numpy as np
 from typing import Tuple
 
 from stiffpy.section import Section
+from stiffpy.kernels import local_stiffness_matrices, condensation_operator
+from stiffpy.tracking import Tracked
 
 
-class Action:
+class Action(Tracked):
     """
     Generic Action Class. Due to the abstract nature of this class, it acts
     like an interface.
@@ -23,7 +25,16 @@ class Action:
         Implements the stiffness matrix for a fixed member, this array will
         be use for the transformation of the action in the member into nodal
         actions
+
+    Notes
+    -----
+    The member of a member load observes it, assigning its position or its
+    magnitudes marks the loads of the member as changed
     """
+    __slots__ = ('_position', '_member_length', '_member_section', '_node_1_releases',
+            '_node_2_releases')
+    _tracked_attributes = frozenset(('_position',))
+
     def __init__(self):
         pass
 
@@ -55,24 +66,28 @@ class Action:
     @property
     def initial_stiffness(self):
         # Only for member loads
-        e, g, a, ix, iy, j, l = self.member_section.material.E, \
-                self.member_section.material.G, \
-                self.member_section.A, \
-                self.member_section.Ix, \
-                self.member_section.Iy, \
-                self.member_section.J, \
-                self.member_length
-        stiffness = np.zeros((12, 12))
-        stiffness[[0,6],[0,6]], stiffness[6,0] = e*a/l, -e*a/l
-        stiffness[[1,7],[1,7]], stiffness[7,1] = 12*e*ix/l**3, -12*e*ix/l**3
-        stiffness[[2,8],[2,8]], stiffness[8,2] = 12*e*iy/l**3, -12*e*iy/l**3
-        stiffness[[3,9],[3,9]], stiffness[9,3] = g*j/l, -g*j/l
-        stiffness[[4,10],[4,10]] = 4*e*iy/l
-        stiffness[[5,11],[5,11]] = 4*e*ix/l
-        stiffness[[4,10],[2,2]], stiffness[[8,10],[4,8]] = -6*e*iy/l**2, 6*e*iy/l**2
-        stiffness[[5,11],[1,1]], stiffness[[7,11],[5,7]] = 6*e*ix/l**2, -6*e*ix/l**2
-        stiffness[10,4], stiffness[11,5] = 2*e*iy/l, 2*e*ix/l
-        return stiffness + stiffness.T - np.diag(stiffness.diagonal())
+        return local_stiffness_matrices(
+                self.member_section.material.E,
+                self.member_section.material.G,
+                self.member_section.A,
+                self.member_section.Ix,
+                self.member_section.Iy,
+                self.member_section.J,
+                self.member_length)
+
+    def _release(self, action_array: np.ndarray) -> np.ndarray:
+        """
+        Move the fixed-end actions of the released degrees to the not
+        released ones (the released degrees end with zero actions)
+
+        Parameters
+        ----------
+        action_array: np.ndarray
+            Actions of the totally fixed member, shape (12,)
+        """
+        # Only for member loads
+        merge_releases = np.array(tuple(self.node_1_releases) + tuple(self.node_2_releases))
+        return condensation_operator(merge_releases, self.member_length).T @ action_array
 
     @member_length.setter
     def member_length(self, length: float):
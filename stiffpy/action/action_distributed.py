@@ -4,6 +4,9 @@ from .action import Action
 
 
 class ActionDistributed(Action):
+    __slots__ = ('initial_magnitudes', 'final_magnitudes', 'length')
+    _tracked_attributes = Action._tracked_attributes | {'initial_magnitudes', 'final_magnitudes', 'length'}
+
     def __init__(self,
             initial_magnitudes: Tuple[float, float, float],
             final_magnitudes: Tuple[float, float, float],
@@ -16,6 +16,9 @@ class ActionPuntual(Action):
     magnitude: float
         Magnitude of the action
     """
+    __slots__ = ('components',)
+    _tracked_attributes = Action._tracked_attributes | {'components'}
+
     def __init__(self, components: Tuple[float, float, float]):
         """
         ActionPuntual implements the natural bahaviour of a Puntual
@@ -28,7 +31,12 @@ class ActionPuntual(Action):
             Z of the local axis.
         """
         self.components = np.array(components)
-        self.magnitude = np.linalg.norm(self.components)
+
+    @property
+    def magnitude(self) -> float:
+        # Computed when requested, the results of every solve build many
+        # actions
+        return np.linalg.norm(self.components)
 
     def __str__(self):
         return f"ActionPuntual {self.components}"
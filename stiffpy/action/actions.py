@@ -4,6 +4,8 @@ from .action_puntual import ActionPuntual
 
 
 class Force(ActionPuntual):
+    __slots__ = ()
+
     def __init__(self, components: Tuple[float, float, float]):
         super().__init__(components)
 
@@ -21,9 +23,6 @@ class Force(ActionPuntual):
         a = self.position
         b = self.member_length - self.position
         length = self.member_length
-        node_1_releases = self.node_1_releases
-        node_2_releases = self.node_2_releases
-        merge_releases = np.array(node_1_releases + node_2_releases)
         # Totally fixed-end  actions
         moment_left_y = self.components[2]*a*b**2/length**2
         moment_right_y = -self.components[2]*a**2*b/length**2
@@ -42,22 +41,14 @@ class Force(ActionPuntual):
                 moment_left_x, moment_left_y, moment_left_z, force_right_x, \
                 force_right_y, force_right_z, moment_right_x, moment_right_y, \
                 moment_right_z])
-        actions_gone_due_to_releases = action_array[merge_releases]
-        actions_stayed = action_array[~merge_releases]
-        displacements_due_to_releases = -actions_gone_due_to_releases/\
-                self.initial_stiffness[merge_releases,merge_releases]
-        stiffness_stayed_actions = self.initial_stiffness[:,merge_releases]\
-                [~merge_releases,:]
-        new_actions_due_to_releases = stiffness_stayed_actions @\
-                displacements_due_to_releases
-        summed_actions = actions_stayed + new_actions_due_to_releases
-        action_array[~merge_releases] = summed_actions
-        action_array = action_array * ~merge_releases
+        action_array = self._release(action_array)
         return Force(-action_array[:3]), Moment(-action_array[3:6]), \
                 Force(-action_array[6:9]), Moment(-action_array[9:12])
 
 
 class Moment(ActionPuntual):
+    __slots__ = ()
+
     def __init__(self, compoenents: Tuple[float, float, float]):
         super().__init__(compoenents)
 
@@ -75,9 +66,6 @@ class Moment(ActionPuntual):
         a = self.position
         b = self.member_length - self.position
         length = self.member_length
-        node_1_releases = self.node_1_releases
-        node_2_releases = self.node_2_releases
-        merge_releases = np.array(node_1_releases + node_2_releases)
         # Totally fixed-end  actions
         force_left_z = 6*self.components[1]*a*b/length**3
         force_right_z = -6*self.components[1]*a*b/length**3
@@ -96,16 +84,6 @@ class Moment(ActionPuntual):
             moment_left_x, moment_left_y, moment_left_z, force_right_x, 
             force_right_y, force_right_z, moment_right_x, moment_right_y, 
             moment_right_z])
-        actions_gone_due_to_releases = action_array[merge_releases]
-        actions_stayed = action_array[~merge_releases]
-        displacements_due_to_releases = -actions_gone_due_to_releases/\
-                self.initial_stiffness[merge_releases,merge_releases]
-        stiffness_stayed_actions = self.initial_stiffness[:,merge_releases]\
-                [~merge_releases,:]
-        new_actions_due_to_releases = stiffness_stayed_actions @\
-                displacements_due_to_releases
-        summed_actions = actions_stayed + new_actions_due_to_releases
-        action_array[~merge_releases] = summed_actions
-        action_array = action_array * ~merge_releases
+        action_array = self._release(action_array)
         return Force(-action_array[:3]), Moment(action_array[3:6]), \
                 Force(-action_array[6:9]), Moment(action_array[9:12])
@@ -5,6 +5,8 @@ from .actions import Force, Moment
 
 
 class DistributedForce(ActionDistributed):
+    __slots__ = ()
+
     def __init__(self,
             initial_magnitudes: Tuple[float, float, float],
             final_magnitudes: Tuple[float, float, float],
@@ -20,9 +22,6 @@ class DistributedForce(ActionDistributed):
         c = self.length
         b = self.member_length - a - c
         length = self.member_length
-        node_1_releases = self.node_1_releases
-        node_2_releases = self.node_2_releases
-        merge_releases = np.array(node_1_releases + node_2_releases)
         harmonic = 1 + b/(length - a) + b**2/(length - a)**2
         # Totally fixed-end  actions
         # Forces X-Y, Moments Z
@@ -75,16 +74,6 @@ class DistributedForce(ActionDistributed):
             moment_left_x, moment_left_y, moment_left_z, force_right_x, 
             force_right_y, force_right_z, moment_right_x, moment_right_y, 
             moment_right_z])
-        actions_gone_due_to_releases = action_array[merge_releases]
-        actions_stayed = action_array[~merge_releases]
-        displacements_due_to_releases = -actions_gone_due_to_releases/\
-                self.initial_stiffness[merge_releases,merge_releases]
-        stiffness_stayed_actions = self.initial_stiffness[:,merge_releases]\
-                [~merge_releases,:]
-        new_actions_due_to_releases = stiffness_stayed_actions @\
-                displacements_due_to_releases
-        summed_actions = actions_stayed + new_actions_due_to_releases
-        action_array[~merge_releases] = summed_actions
-        action_array = action_array * ~merge_releases
+        action_array = self._release(action_array)
         return Force(-action_array[:3]), Moment(-action_array[3:6]), \
                 Force(-action_array[6:9]), Moment(-action_array[9:12])
@@ -0,0 +1,241 @@
+"""
+This module defines AnalysisResult class
+
+An AnalysisResult keeps the results of a solve (Structure.solve) in read
+only arrays indexed by node and member, apart from the nodes and members of
+the model: several results (e.g: of different load cases solved in parallel
+threads with the same factorization) coexist and a result can be pickled
+and sent to other processes without the model.
+
+The nodes are identified by their id (see NodeRegistry) and the members by
+their row in Structure.members, the Node and Member objects of the model
+solved are accepted too. NodeResult and MemberResult are views of the
+result with the attributes a solve writes in the nodes and members (force, moment,
+displacements, force_left, ...).
+
+Example
+-------
+result = structure.solve()
+result.node(node).displacements
+result.member(member).force_left
+results = list(ThreadPoolExecutor().map(structure.solve, structure.load_cases))
+"""
+import numpy as np
+from .action.actions import Force, Moment
+from .member import Member
+from .node import Node
+
+
+def _read_only(values) -> np.ndarray:
+    values = np.array(values, dtype=float)
+    values.flags.writeable = False
+    return values
+
+
+class AnalysisResult:
+    """
+    Immutable results of a solve
+
+    Attributes
+    ----------
+    name: str
+        Name of the load case solved, None for the loads of the model
+    generation: int
+        Generation of the solve (see Structure.solve_generation)
+    node_ids: tuple
+        Id of the node of each row (see NodeRegistry)
+    displacements: np.ndarray
+        Displacements of the free degrees (same order as Structure.displacements)
+    reactions: np.ndarray
+        Reactions of the restrained degrees (same order as Structure.reactions)
+    node_actions: np.ndarray
+        Structure oriented actions applied at every node, shape (nodes, 6)
+    imposed_displacements: np.ndarray
+        Structure oriented displacements imposed at every node, shape (nodes, 6)
+    node_displacements: np.ndarray
+        Structure oriented displacements of every node (imposed
+        displacements not included), shape (nodes, 6)
+    node_reactions: np.ndarray
+        Structure oriented reactions (supports and elastic supports) of
+        every node, shape (nodes, 6)
+    member_end_actions: np.ndarray
+        Member oriented end actions of every member [force_left, moment_left,
+        force_right, moment_right], shape (members, 12)
+    solver_statistics: dict
+        Statistics of the solver (see Solver.statistics)
+    """
+    def __init__(self, name, generation: int, node_ids, displacements, reactions,
+            node_actions, imposed_displacements, node_displacements, node_reactions,
+            member_end_actions, member_serial_numbers=(), solver_statistics=None, node_serial_numbers=()):
+        """
+        Parameters
+        ----------
+        member_serial_numbers, node_serial_numbers: tuple
+            Serial number of the Member and Node object of each row, empty
+            for the models without objects (see Structure.from_arrays)
+        """
+        values = {
+            'name': name,
+            'generation': generation,
+            'node_ids': tuple(node_ids),
+            'displacements': _read_only(displacements),
+            'reactions': _read_only(reactions),
+            'node_actions': _read_only(node_actions),
+            'imposed_displacements': _read_only(imposed_displacements),
+            'node_displacements': _read_only(node_displacements),
+            'node_reactions': _read_only(node_reactions),
+            'member_end_actions': _read_only(member_end_actions),
+            'solver_statistics': dict(solver_statistics or {}),
+            '_member_serial_numbers': tuple(member_serial_numbers),
+            '_node_serial_numbers': tuple(node_serial_numbers)}
+        values['_node_rows'] = {no: row for row, no in enumerate(values['node_ids'])}
+        values['_node_serial_rows'] = {serial_number: row for row, serial_number in
+                enumerate(values['_node_serial_numbers'])}
+        values['_member_rows'] = {serial_number: row for row, serial_number in
+                enumerate(values['_member_serial_numbers'])}
+        self.__dict__.update(values)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __reduce__(self):
+        return (type(self), (self.name, self.generation, self.node_ids, self.displacements,
+            self.reactions, self.node_actions, self.imposed_displacements, self.node_displacements,
+            self.node_reactions, self.member_end_actions, self._member_serial_numbers,
+            self.solver_statistics, self._node_serial_numbers))
+
+    def __str__(self):
+        return f"AnalysisResult {self.name}" if self.name is not None else "AnalysisResult"
+
+    @property
+    def number_of_nodes(self) -> int:
+        return len(self.node_ids)
+
+    @property
+    def number_of_members(self) -> int:
+        return len(self.member_end_actions)
+
+    def node_row(self, node) -> int:
+        """
+        Row of a node (Node or node id) in the node arrays
+        """
+        if isinstance(node, Node):
+            if node._serial_number in self._node_serial_rows:
+                return self._node_serial_rows[node._serial_number]
+            no = node.no
+        else:
+            no = node
+        if no is None or no not in self._node_rows:
+            raise KeyError(f'Node {no!r} is not in the result')
+        return self._node_rows[no]
+
+    def member_row(self, member) -> int:
+        """
+        Row of a member (Member or row in Structure.members) in the member
+        arrays
+        """
+        if isinstance(member, Member):
+            if member._serial_number not in self._member_rows:
+                raise KeyError(f'{member} is not in the result')
+            return self._member_rows[member._serial_number]
+        row = int(member)
+        if not 0 <= row < self.number_of_members:
+            raise KeyError(f'Member {row} is not in the result')
+        return row
+
+    def node_displacement(self, node) -> np.ndarray:
+        return self.node_displacements[self.node_row(node)]
+
+    def node_reaction(self, node) -> np.ndarray:
+        return self.node_reactions[self.node_row(node)]
+
+    def end_actions(self, member) -> np.ndarray:
+        return self.member_end_actions[self.member_row(member)]
+
+    def node(self, node) -> 'NodeResult':
+        """
+        Results of a node (Node or node id)
+        """
+        return NodeResult(self, self.node_row(node))
+
+    def member(self, member) -> 'MemberResult':
+        """
+        Results of a member (Member or row in Structure.members)
+        """
+        return MemberResult(self, self.member_row(member))
+
+
+class NodeResult:
+    """
+    View of the results of a node with the attributes Structure.solve
+    writes in the Node
+
+    Attributes
+    ----------
+    force, moment: Force, Moment
+        Applied action plus reaction
+    displacements: np.ndarray
+        Imposed plus computed displacements
+    reaction: np.ndarray
+        Structure oriented reaction [forces, moments]
+    """
+    __slots__ = ('result', 'row')
+
+    def __init__(self, result: AnalysisResult, row: int):
+        self.result = result
+        self.row = row
+
+    @property
+    def no(self):
+        return self.result.node_ids[self.row]
+
+    @property
+    def reaction(self) -> np.ndarray:
+        return self.result.node_reactions[self.row]
+
+    @property
+    def force(self) -> Force:
+        return Force(self.result.node_actions[self.row, :3] + self.reaction[:3])
+
+    @property
+    def moment(self) -> Moment:
+        return Moment(self.result.node_actions[self.row, 3:] + self.reaction[3:])
+
+    @property
+    def displacements(self) -> np.ndarray:
+        return self.result.imposed_displacements[self.row] + self.result.node_displacements[self.row]
+
+
+class MemberResult:
+    """
+    View of the end actions of a member with the attributes Structure.solve
+    writes in the Member (member oriented)
+    """
+    __slots__ = ('result', 'row')
+
+    def __init__(self, result: AnalysisResult, row: int):
+        self.result = result
+        self.row = row
+
+    @property
+    def end_actions(self) -> np.ndarray:
+        return self.result.member_end_actions[self.row]
+
+    @property
+    def force_left(self) -> Force:
+        return Force(self.end_actions[0:3])
+
+    @property
+    def moment_left(self) -> Moment:
+        return Moment(self.end_actions[3:6])
+
+    @property
+    def force_right(self) -> Force:
+        return Force(self.end_actions[6:9])
+
+    @property
+    def moment_right(self) -> Moment:
+        return Moment(self.end_actions[9:12])
@@ -2,6 +2,8 @@ from ...action.distributed_force import DistributedForce as DF
 
 
 class DistributedForce(DF):
+    __slots__ = ()
+
     def __init__(self,
             inital_magnitude: float,
             final_magnitude: float,
@@ -1,17 +1,20 @@
 from ..structure import Structure
+from ..solver import chain_solver
 import numpy as np
-from scipy.linalg import eigvals, eig
 
 
 class Beam(Structure):
     def draw_deformations(self, factor=1):
         super().draw_deformations('2d', factor)
 
+    def _default_solver(self):
+        # Continuous beams are chains, banded solver if the bandwidth is small
+        return chain_solver(self.plan.half_bandwidth, self.number_of_degrees_of_freedom, self.sparse)
+
     def _stack_restrains(self) -> np.ndarray:
         # SetUp
         restrains_list = []
-        # Sort Nodes
-        order_nodes = sorted(list(self.nodes), key=lambda x: x.no)
-        for node in order_nodes:
+        # Nodes in row order
+        for node in self.plan.nodes:
             restrains_list.extend(node.restrains[[1, 5]])
         return ~np.array(restrains_list)
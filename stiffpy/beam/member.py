@@ -5,6 +5,8 @@ from ..section import Section
 
 
 class Member(Member1):
+    __slots__ = ()
+
     def __init__(self,
             node_1: Node,
             node_2: Node,
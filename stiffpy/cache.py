@@ -0,0 +1,165 @@
+"""
+This module defines LRUCache class
+
+A small thread safe least recently used cache with hit and miss counters,
+used to share values that are expensive to compute and repeat many times in
+a model (e.g. the condensation operators of the member releases) or that
+are read many times (e.g. the diagrams of the members).
+"""
+import sys
+import threading
+from collections import OrderedDict
+
+
+def sizeof(value) -> int:
+    """
+    Approximate memory of a cached value in bytes, the arrays (and objects
+    with a nbytes attribute e.g: Diagram) are counted by their data
+    """
+    if hasattr(value, 'nbytes'):
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sum(sizeof(item) for item in value.values())
+    if isinstance(value, (tuple, list)):
+        return sum(sizeof(item) for item in value)
+    return sys.getsizeof(value)
+
+
+def deep_sizeof(value, seen: set=None) -> int:
+    """
+    Approximate memory of an object and of what it holds in bytes, the
+    containers, arrays and the objects with __slots__ (nodes, members and
+    actions) are followed, the other objects are counted by themselves
+
+    Parameters
+    ----------
+    value: object
+        Object to measure
+    seen: set
+        Ids of the objects already counted (they count 0), share it between
+        calls to count the shared objects once (e.g: the nodes of the members)
+    """
+    seen = set() if seen is None else seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    # sys.getsizeof includes the data of the arrays that own it
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        return size + sum(deep_sizeof(item, seen) for item in value.values())
+    if isinstance(value, (tuple, list, set, frozenset)):
+        return size + sum(deep_sizeof(item, seen) for item in value)
+    for cls in type(value).__mro__:
+        for name in cls.__dict__.get('__slots__', ()):
+            if name != '__weakref__' and hasattr(value, name):
+                size += deep_sizeof(getattr(value, name), seen)
+    return size
+
+
+class LRUCache:
+    """
+    Least recently used cache
+
+    Attributes
+    ----------
+    maxsize: int
+        Maximum number of entries, None means no limit
+    maxbytes: int
+        Maximum memory of the entries (see sizeof), None means no limit
+    nbytes: int
+        Memory of the entries
+    hits: int
+        Number of lookups that found the key
+    misses: int
+        Number of lookups that did not find the key
+    """
+    def __init__(self, maxsize: int=128, maxbytes: int=None):
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        """
+        Value of the key (marked as the most recently used) or default
+        """
+        with self._lock:
+            if key in self._data:
+                self.hits += 1
+                self._data.move_to_end(key)
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        """
+        Store the value, the least recently used entries are evicted when
+        the cache is full (maxsize or maxbytes)
+        """
+        with self._lock:
+            if key in self._data:
+                self.nbytes -= self._sizes[key]
+            self._data[key] = value
+            self._data.move_to_end(key)
+            self._sizes[key] = sizeof(value)
+            self.nbytes += self._sizes[key]
+            self._evict()
+
+    def _evict(self):
+        while self._data and (
+                (self.maxsize is not None and len(self._data) > self.maxsize)
+                or (self.maxbytes is not None and self.nbytes > self.maxbytes)):
+            key, _ = self._data.popitem(last=False)
+            self.nbytes -= self._sizes.pop(key)
+
+    def get_or_compute(self, key, function):
+        """
+        Value of the key, if it is not in the cache function() is called and
+        its result stored
+        """
+        with self._lock:
+            if key in self._data:
+                self.hits += 1
+                self._data.move_to_end(key)
+                return self._data[key]
+            self.misses += 1
+        value = function()
+        self.put(key, value)
+        return value
+
+    def sizes(self) -> dict:
+        """
+        Memory of each entry by key (see sizeof)
+        """
+        with self._lock:
+            return dict(self._sizes)
+
+    def clear(self):
+        """
+        Remove every entry and reset the counters
+        """
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self.nbytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> dict:
+        """
+        Counters of the cache: hits, misses, size, maxsize, nbytes and
+        maxbytes
+        """
+        return {'hits': self.hits, 'misses': self.misses,
+                'size': len(self._data), 'maxsize': self.maxsize,
+                'nbytes': self.nbytes, 'maxbytes': self.maxbytes}
@@ -0,0 +1,180 @@
+"""
+This module defines LoadCombinations and Envelope classes
+
+The structure is linear, so the results of a load combination are the
+superposition of the results of its load cases. LoadCombinations keeps a
+table of factors (combinations x load cases) and combines the stored
+LoadCaseResult objects with one matrix product, without solving again.
+
+Example
+-------
+combinations = LoadCombinations({
+    '1.4D': {'dead': 1.4},
+    '1.2D+1.6L': {'dead': 1.2, 'live': 1.6}})
+structure.solve_load_cases()
+results = combinations.combine(structure.load_case_results)
+envelopes = combinations.envelopes(structure)
+"""
+import numpy as np
+from typing import Dict, List, Tuple
+from .diagram import Diagram
+from .load_case import LoadCaseResult
+
+
+DIAGRAMS = ('axial_force', 'torsion', 'shear_xy', 'shear_xz', 'bending_xy', 'bending_xz')
+
+
+class Envelope:
+    """
+    Maximum and minimum values of an internal action diagram over all the
+    combinations
+
+    Attributes
+    ----------
+    name: str
+        Name of the diagram e.g: 'bending_xy'
+    members: list
+        Members of the structure
+    maximum: list
+        Maximum along the domain of each member
+    minimum: list
+        Minimum along the domain of each member
+    peaks: list
+        Exact extremes of each member ((location, maximum), (location,
+        minimum)) over all the combinations (see Diagram.maximum)
+    """
+    def __init__(self, name: str, members: List, maximum: List[np.ndarray], minimum: List[np.ndarray],
+            peaks: List[Tuple[Tuple[float, float], Tuple[float, float]]]=None):
+        self.name = name
+        self.members = members
+        self.maximum = maximum
+        self.minimum = minimum
+        self.peaks = peaks
+        self._member_indexes = {id(member): i for i, member in enumerate(members)}
+
+    def __str__(self):
+        return f"Envelope {self.name}"
+
+    def of(self, member):
+        """
+        Maximum and minimum along the domain of the member
+        """
+        index = self._member_indexes[id(member)]
+        return self.maximum[index], self.minimum[index]
+
+    def peak(self, member):
+        """
+        Exact ((location, maximum), (location, minimum)) of the member
+        """
+        return self.peaks[self._member_indexes[id(member)]]
+
+
+class LoadCombinations:
+    """
+    Table of load combinations
+
+    Attributes
+    ----------
+    combinations: Dict[str, Dict[str, float]]
+        Factor of each load case by combination name, load cases that are
+        not in a combination have zero factor
+    """
+    def __init__(self, combinations: Dict[str, Dict[str, float]]):
+        self.combinations = dict(combinations)
+
+    @property
+    def names(self) -> List[str]:
+        return list(self.combinations)
+
+    def factors(self, case_names: List[str]) -> np.ndarray:
+        """
+        Factor matrix, shape (combinations, load cases)
+        """
+        case_indexes = {name: i for i, name in enumerate(case_names)}
+        factors = np.zeros((len(self.combinations), len(case_names)))
+        for row, combination in enumerate(self.combinations.values()):
+            for case_name, factor in combination.items():
+                if case_name not in case_indexes:
+                    raise KeyError(f'Load case {case_name} has not been solved')
+                factors[row, case_indexes[case_name]] = factor
+        return factors
+
+    def combine(self, load_case_results: Dict[str, LoadCaseResult]) -> Dict[str, LoadCaseResult]:
+        """
+        Results of every combination by superposition of the load case
+        results
+
+        Parameters
+        ----------
+        load_case_results: Dict[str, LoadCaseResult]
+            Results of Structure.solve_load_cases
+
+        Returns
+        -------
+        combination_results: Dict[str, LoadCaseResult]
+        """
+        if not load_case_results:
+            raise ValueError('There are no load case results to combine, solve the load cases first')
+        case_names = list(load_case_results)
+        factors = self.factors(case_names)
+        results = list(load_case_results.values())
+        first = results[0]
+        combined = {}
+        for attribute in ('displacements', 'reactions', 'node_displacements',
+                'node_reactions', 'member_end_actions'):
+            stacked = np.stack([getattr(result, attribute) for result in results])
+            combined[attribute] = np.tensordot(factors, stacked, axes=1)
+        return {name: LoadCaseResult(
+            name,
+            first.nodes,
+            first.members,
+            *(combined[attribute][row] for attribute in ('displacements',
+                'reactions', 'node_displacements', 'node_reactions',
+                'member_end_actions')))
+            for row, name in enumerate(self.combinations)}
+
+    def envelopes(self, structure) -> Dict[str, Envelope]:
+        """
+        Envelopes of the internal action diagrams of every member over all
+        the combinations, the values of every combination are one product
+        of the factors and the values of the load cases, the exact extremes
+        are computed for all the combinations together (see
+        Diagram.linear_combination_extremes)
+
+        Parameters
+        ----------
+        structure: Structure
+            Structure whose load cases have been solved
+
+        Returns
+        -------
+        envelopes: Dict[str, Envelope]
+            One Envelope for each diagram: axial_force, torsion, shear_xy,
+            shear_xz, bending_xy and bending_xz
+        """
+        load_cases = structure.load_cases
+        load_case_results = structure.load_case_results
+        missing = [load_case.name for load_case in load_cases if load_case.name not in load_case_results]
+        if not load_cases or missing:
+            raise ValueError(f'The load cases {missing} have not been solved, call solve_load_cases first'
+                    if missing else 'The structure has no load cases')
+        factors = self.factors([load_case.name for load_case in load_cases])
+        # Member end actions, shape (load cases, members, 12)
+        end_actions = np.stack([load_case_results[load_case.name].member_end_actions for load_case in load_cases])
+        maximum = {name: [] for name in DIAGRAMS}
+        minimum = {name: [] for name in DIAGRAMS}
+        peaks = {name: [] for name in DIAGRAMS}
+        for i, member in enumerate(structure.members):
+            case_diagrams = [member._internal_diagrams(end_actions[column, i],
+                *load_case.member_loads.get(member, ((), (), ())))
+                for column, load_case in enumerate(load_cases)]
+            domain = member.domain
+            for name in DIAGRAMS:
+                diagrams = [diagrams[name] for diagrams in case_diagrams]
+                # Values of every combination, shape (combinations, points)
+                values = factors @ np.array([diagram.evaluate(domain) for diagram in diagrams])
+                maximum[name].append(values.max(axis=0))
+                minimum[name].append(values.min(axis=0))
+                peaks[name].append(Diagram.linear_combination_extremes(diagrams, factors))
+        return {name: Envelope(name, structure.members, maximum[name], minimum[name], peaks[name])
+                for name in DIAGRAMS}
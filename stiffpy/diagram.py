@@ -0,0 +1,370 @@
+"""
+This module defines Diagram class
+
+A Diagram is a piecewise polynomial function along a member, e.g: the
+internal actions (axial force, torsion, shear and bending moment) and the
+deformations of the member. The breakpoints are the ends of the member and
+the positions where the loads start or end, so the diagrams are exact and
+only a few coefficients are stored by member.
+
+The diagrams are built from Macaulay terms: a polynomial p(x - a) that is
+zero for x < a, e.g: a point force F at a adds the term (a, [F]) to the shear
+and (a, [0, F]) to the bending moment.
+
+Notes
+-----
+The diagrams are continuous from the right, at a breakpoint with a jump (a
+point force or moment) the value of the segment that starts there is used,
+at the end of the member the value of the last segment is used.
+"""
+import numpy as np
+from math import comb
+from typing import List, Tuple
+
+
+def _shift(coefficients: np.ndarray, offset) -> np.ndarray:
+    """
+    Coefficients (ascending powers of t) of p(t + offset), p given by its
+    coefficients, offset can be an array, shape (..., degree + 1)
+    """
+    coefficients = np.asarray(coefficients, dtype=float)
+    offset = np.asarray(offset, dtype=float)[..., np.newaxis]
+    degree = coefficients.shape[-1] - 1
+    shifted = np.zeros(np.broadcast_shapes(coefficients.shape, offset.shape))
+    for k in range(degree + 1):
+        for j in range(k, degree + 1):
+            shifted[..., k] += comb(j, k)*coefficients[..., j]*offset[..., 0]**(j - k)
+    return shifted
+
+
+def _real_roots(coefficients: np.ndarray, width: float) -> np.ndarray:
+    """
+    Real roots in [0, width] of a polynomial (ascending powers of t), an
+    identically zero polynomial has no roots
+    """
+    coefficients = np.trim_zeros(np.asarray(coefficients, dtype=float), 'b')
+    if len(coefficients) < 2:
+        return np.empty(0)
+    roots = np.roots(coefficients[::-1])
+    scale = max(width, 1)
+    roots = roots[np.abs(roots.imag) <= 1e-9*scale].real
+    tolerance = 1e-12*scale
+    return np.clip(roots[(roots >= -tolerance) & (roots <= width + tolerance)], 0, width)
+
+
+def _stationary_points(coefficients: np.ndarray, widths: np.ndarray) -> np.ndarray:
+    """
+    Points of every segment where an extreme value can be: both ends and
+    the real roots of the derivative in the segment, NaN where there is no
+    root (the derivative of a segment has fewer roots than its degree)
+
+    Parameters
+    ----------
+    coefficients: np.ndarray
+        Ascending powers of the distance to the start of the segment, shape
+        (..., segments, degree + 1)
+    widths: np.ndarray
+        Width of every segment, shape (segments,)
+
+    Returns
+    -------
+    t: np.ndarray
+        Distance of the points to the start of their segment, shape (...,
+        segments, points)
+    """
+    degree = coefficients.shape[-1] - 1
+    shape = coefficients.shape[:-1]
+    ends = [np.zeros(shape), np.broadcast_to(widths, shape)]
+    if degree <= 3:
+        # Roots of the derivative (at most quadratic) in closed form
+        slope = np.zeros(shape + (3,))
+        slope[..., :degree] = coefficients[..., 1:]*np.arange(1, degree + 1)
+        c, b, a = slope[..., 0], slope[..., 1], slope[..., 2]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            root = np.sqrt(b**2 - 4*a*c)
+            quadratic = [(-b + root)/(2*a), (-b - root)/(2*a)]
+            linear = -c/b
+        roots = [np.where(a != 0, quadratic[0], np.where(b != 0, linear, np.nan)),
+                np.where(a != 0, quadratic[1], np.nan)]
+    else:
+        roots = np.full(shape + (degree - 1,), np.nan)
+        for index in np.ndindex(shape):
+            found = _real_roots(coefficients[index][1:]*np.arange(1, degree + 1), widths[index[-1]])
+            roots[index][:len(found)] = found
+        roots = list(np.moveaxis(roots, -1, 0))
+    tolerance = 1e-12*np.maximum(widths, 1)
+    for root in roots:
+        root[(root < -tolerance) | (root > widths + tolerance)] = np.nan
+    return np.stack(ends + [np.clip(root, 0, widths) for root in roots], axis=-1)
+
+
+class Diagram:
+    """
+    Piecewise polynomial function along a member
+
+    Attributes
+    ----------
+    breakpoints: np.ndarray
+        Start of each segment and end of the last one, shape (segments + 1,)
+    coefficients: np.ndarray
+        Coefficients of each segment, ascending powers of the distance to
+        the start of the segment, shape (segments, degree + 1)
+    """
+    def __init__(self, breakpoints, coefficients):
+        self.breakpoints = np.asarray(breakpoints, dtype=float)
+        self.coefficients = np.asarray(coefficients, dtype=float).reshape(len(self.breakpoints) - 1, -1)
+
+    @classmethod
+    def from_terms(cls, length: float, terms: List[Tuple[float, List[float]]]):
+        """
+        Diagram along [0, length] as the sum of Macaulay terms
+
+        Parameters
+        ----------
+        length: float
+            Length of the member
+        terms: list
+            (start, coefficients) of each term, the polynomial (ascending
+            powers of x - start) is zero before start, the terms that start
+            at the end of the member or after it are ignored
+        """
+        terms = [(float(start), np.asarray(coefficients, dtype=float)) for start, coefficients in terms]
+        starts = [start for start, _ in terms if 0 < start < length]
+        breakpoints = np.unique(np.concatenate(([0, length], starts)))
+        degree = max((len(coefficients) - 1 for _, coefficients in terms), default=0)
+        segment_starts = breakpoints[:-1]
+        diagram = np.zeros((len(segment_starts), degree + 1))
+        for start, coefficients in terms:
+            active = segment_starts >= start
+            if active.any():
+                diagram[active, :len(coefficients)] += _shift(coefficients, segment_starts[active] - start)
+        return cls(breakpoints, diagram)
+
+    @classmethod
+    def linear_combination_extremes(cls, diagrams: List['Diagram'], factors):
+        """
+        Exact maximum and minimum over all the diagrams sum_j factors[i, j]
+        diagrams[j] (e.g: the load combinations of the diagrams of the load
+        cases), computed together over the union of the breakpoints without
+        building a Diagram per combination
+
+        Parameters
+        ----------
+        diagrams: list
+            Diagrams along the same member
+        factors: np.ndarray
+            Shape (combinations, diagrams)
+
+        Returns
+        -------
+        maximum, minimum: Tuple[float, float]
+            Location and value of the largest and of the smallest value of
+            all the combinations
+        """
+        breakpoints = np.unique(np.concatenate([diagram.breakpoints for diagram in diagrams]))
+        degree = max(diagram.degree for diagram in diagrams)
+        stacked = np.stack([diagram._refine(breakpoints, degree) for diagram in diagrams])
+        # Shape (combinations, segments, degree + 1)
+        coefficients = np.tensordot(np.asarray(factors, dtype=float), stacked, axes=1)
+        widths = np.diff(breakpoints)
+        t = _stationary_points(coefficients, widths)
+        # Candidates of every combination, NaN where there is none
+        values = np.zeros_like(t)
+        for power in range(degree, -1, -1):
+            values = values*t + coefficients[..., power, np.newaxis]
+        points = np.broadcast_to(breakpoints[:-1, np.newaxis] + t, t.shape)
+        values = values.reshape(len(values), -1)
+        points = points.reshape(len(points), -1)
+        maximum = np.unravel_index(np.nanargmax(values), values.shape)
+        minimum = np.unravel_index(np.nanargmin(values), values.shape)
+        return (float(points[maximum]), float(values[maximum])), (float(points[minimum]), float(values[minimum]))
+
+    @property
+    def length(self) -> float:
+        return self.breakpoints[-1] - self.breakpoints[0]
+
+    @property
+    def nbytes(self) -> int:
+        return self.breakpoints.nbytes + self.coefficients.nbytes
+
+    @property
+    def degree(self) -> int:
+        return self.coefficients.shape[1] - 1
+
+    def _segments(self, x: np.ndarray) -> np.ndarray:
+        return np.clip(np.searchsorted(self.breakpoints, x, side='right') - 1, 0, len(self.coefficients) - 1)
+
+    def evaluate(self, x):
+        """
+        Value of the diagram at the points x (scalar or array)
+        """
+        x = np.asarray(x, dtype=float)
+        segments = self._segments(x)
+        t = x - self.breakpoints[segments]
+        coefficients = self.coefficients[segments]
+        values = np.zeros_like(t)
+        for power in range(self.degree, -1, -1):
+            values = values*t + coefficients[..., power]
+        return values if values.ndim else float(values)
+
+    def __call__(self, x):
+        return self.evaluate(x)
+
+    def derivative(self):
+        """
+        Derivative of the diagram (the jumps are not included)
+        """
+        if self.degree == 0:
+            return Diagram(self.breakpoints, np.zeros_like(self.coefficients))
+        powers = np.arange(1, self.degree + 1)
+        return Diagram(self.breakpoints, self.coefficients[:, 1:]*powers)
+
+    def antiderivative(self, initial: float=0):
+        """
+        Continuous antiderivative of the diagram
+
+        Parameters
+        ----------
+        initial: float
+            Value of the antiderivative at the start of the member
+        """
+        powers = np.arange(1, self.degree + 2)
+        coefficients = np.zeros((len(self.coefficients), self.degree + 2))
+        coefficients[:, 1:] = self.coefficients/powers
+        # Integral of every segment, accumulated as the constant of the next
+        widths = np.diff(self.breakpoints)
+        integrals = (coefficients*widths[:, np.newaxis]**np.arange(self.degree + 2)).sum(axis=1)
+        coefficients[:, 0] = initial + np.concatenate(([0], np.cumsum(integrals)[:-1]))
+        return Diagram(self.breakpoints, coefficients)
+
+    def integral(self) -> float:
+        """
+        Integral of the diagram along the member
+        """
+        return self.antiderivative().evaluate(self.breakpoints[-1])
+
+    def roots(self) -> np.ndarray:
+        """
+        Sorted points where the diagram is zero (e.g: zero shear locations),
+        the segments that are identically zero are skipped
+        """
+        widths = np.diff(self.breakpoints)
+        roots = [start + _real_roots(coefficients, width)
+                for start, coefficients, width in zip(self.breakpoints, self.coefficients, widths)]
+        return np.unique(np.round(np.concatenate(roots), 12)) if roots else np.empty(0)
+
+    def _candidates(self):
+        """
+        Points where an extreme value can be, and the values: both sides of
+        every breakpoint and the stationary points of every segment
+        """
+        widths = np.diff(self.breakpoints)
+        derivative = self.derivative()
+        points, values = [], []
+        for start, width, coefficients, slope in zip(self.breakpoints, widths,
+                self.coefficients, derivative.coefficients):
+            t = np.concatenate(([0, width], _real_roots(slope, width)))
+            points.append(start + t)
+            values.append(np.polynomial.polynomial.polyval(t, coefficients))
+        return np.concatenate(points), np.concatenate(values)
+
+    def maximum(self) -> Tuple[float, float]:
+        """
+        Location and value of the maximum of the diagram
+        """
+        points, values = self._candidates()
+        i = np.argmax(values)
+        return float(points[i]), float(values[i])
+
+    def minimum(self) -> Tuple[float, float]:
+        """
+        Location and value of the minimum of the diagram
+        """
+        points, values = self._candidates()
+        i = np.argmin(values)
+        return float(points[i]), float(values[i])
+
+    def absolute_maximum(self) -> Tuple[float, float]:
+        """
+        Location and value (with its sign) of the maximum absolute value of
+        the diagram, e.g: the design bending moment
+        """
+        points, values = self._candidates()
+        i = np.argmax(np.abs(values))
+        return float(points[i]), float(values[i])
+
+    def _refine(self, breakpoints: np.ndarray, degree: int) -> np.ndarray:
+        """
+        Coefficients of the same function over finer breakpoints
+        """
+        starts = breakpoints[:-1]
+        segments = self._segments(starts)
+        coefficients = np.zeros((len(starts), degree + 1))
+        coefficients[:, :self.degree + 1] = _shift(self.coefficients[segments], starts - self.breakpoints[segments])
+        return coefficients
+
+    def __add__(self, other):
+        if isinstance(other, Diagram):
+            breakpoints = np.union1d(self.breakpoints, other.breakpoints)
+            degree = max(self.degree, other.degree)
+            return Diagram(breakpoints, self._refine(breakpoints, degree) + other._refine(breakpoints, degree))
+        coefficients = self.coefficients.copy()
+        coefficients[:, 0] += other
+        return Diagram(self.breakpoints, coefficients)
+
+    def __radd__(self, other):
+        return self + other
+
+    def __neg__(self):
+        return Diagram(self.breakpoints, -self.coefficients)
+
+    def __sub__(self, other):
+        return self + (-other)
+
+    def __rsub__(self, other):
+        return -self + other
+
+    def __mul__(self, factor: float):
+        return Diagram(self.breakpoints, self.coefficients*factor)
+
+    def __rmul__(self, factor: float):
+        return self*factor
+
+    def __truediv__(self, factor: float):
+        return Diagram(self.breakpoints, self.coefficients/factor)
+
+    def __repr__(self):
+        return f"Diagram(segments={len(self.coefficients)}, degree={self.degree})"
+
+
+def linear_load_terms(position: float, length: float, initial: float, final: float,
+        integrations: int=0) -> List[Tuple[float, np.ndarray]]:
+    """
+    Macaulay terms of a linearly varying load (or of its integrals)
+
+    Parameters
+    ----------
+    position: float
+        Start of the load
+    length: float
+        Length of the load
+    initial, final: float
+        Intensity at the start and at the end of the load
+    integrations: int
+        Times the load is integrated from the start of the member, e.g: 1
+        for the shear and 2 for the bending moment
+
+    Returns
+    -------
+    terms: list
+        (start, coefficients) of the terms
+    """
+    if length == 0:
+        return []
+    slope = (final - initial)/length
+    # q(x) = initial <x - a>^0 + slope <x - a>^1 - final <x - e>^0 - slope <x - e>^1
+    terms = [(position, np.array([initial, slope])), (position + length, np.array([-final, -slope]))]
+    for _ in range(integrations):
+        terms = [(start, np.concatenate(([0], coefficients/np.arange(1, len(coefficients) + 1))))
+                for start, coefficients in terms]
+    return terms
@@ -0,0 +1,224 @@
+"""
+This module defines DofPlan class
+
+A DofPlan is the compiled numbering of the degrees of freedom of a
+structure: which structure index belongs to each degree of each node, where
+the degrees of each member are scattered and the order that puts the free
+degrees first and the restrained degrees last. It is built once by
+Structure.compile and used by the assembly, the action vectors and the
+redistribution of the results.
+
+The degrees are numbered node by node in the order of the node rows (the
+order of the node ids, see NodeRegistry), unless a fill reducing ordering of the nodes is given (see ordering.py),
+then the free and the restrained degrees are reordered node by node in that
+order (the structure indexes and the results by node do not change, only
+the order of the solved system).
+
+Notes
+-----
+The plan is immutable (its arrays are read only), the structure builds a new
+one when its members or the releases or restrains of its nodes and members
+change.
+"""
+import numpy as np
+from typing import List
+from .ordering import node_ranks
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    array.flags.writeable = False
+    return array
+
+
+class DofPlan:
+    """
+    Compiled numbering of the degrees of freedom of a structure
+
+    Attributes
+    ----------
+    nodes: tuple
+        Nodes in row order (see NodeRegistry), the row of every node array
+    node_ids: tuple
+        Id of the node of each row
+    node_indexes: dict
+        Row of each node
+    node_degrees: np.ndarray
+        Structure index of each degree of each node, -1 if the degree is
+        released at the node, shape (nodes, 6)
+    node_offsets: np.ndarray
+        First structure index of each node, shape (nodes + 1,)
+    member_nodes: np.ndarray
+        Rows of the left and right node of each member, shape (members, 2)
+    member_degrees: np.ndarray
+        Structure index of each degree [node_1 (6), node_2 (6)] of each
+        member, -1 if the degree is released at the member, shape (members, 12)
+    restrains: np.ndarray
+        True if the structure index is restrained
+    elastic_constants: np.ndarray
+        Elastic constant of each structure index
+    reorder_indexes: np.ndarray
+        Structure indexes, free degrees first and restrained degrees last
+        (node by node in the order of the ordering, if any)
+    inverse_reorder_indexes: np.ndarray
+        Position of each structure index in reorder_indexes
+    natural_reorder_indexes: np.ndarray
+        reorder_indexes without ordering (order of the node rows)
+    number_of_degrees: int
+        Number of not released degrees of the structure
+    number_of_degrees_of_freedom: int
+        Number of free (not restrained) degrees
+    ordering: str
+        Fill reducing ordering of the nodes (see ordering.ORDERINGS), None
+        if the degrees are in the order of the node numbers
+    """
+    def __init__(self, nodes: List, members: List, ordering: str=None, node_ids=None):
+        """
+        Parameters
+        ----------
+        nodes: list
+            Nodes in row order, e.g: NodeRegistry.nodes
+        members: list
+            Members, their nodes must be in nodes
+        ordering: str, None
+            Fill reducing ordering of the nodes (see ordering.ORDERINGS)
+        node_ids: list, None
+            Id of each node, e.g: NodeRegistry.ids, default Node.no
+        """
+        nodes = tuple(nodes)
+        node_indexes = {node: i for i, node in enumerate(nodes)}
+        self._compile(
+                np.array([node.release for node in nodes], dtype=bool).reshape(-1, 6),
+                np.array([node.restrains for node in nodes], dtype=bool).reshape(-1, 6),
+                np.array([node.elastic_constants for node in nodes], dtype=float).reshape(-1, 6),
+                np.array([[node_indexes[member.node_1], node_indexes[member.node_2]]
+                    for member in members], dtype=int).reshape(-1, 2),
+                np.array([tuple(member.node_1_release) + tuple(member.node_2_release)
+                    for member in members], dtype=bool).reshape(-1, 12),
+                ordering)
+        self.nodes = nodes
+        self.node_ids = tuple(node.no for node in nodes) if node_ids is None else tuple(node_ids)
+        self.node_indexes = node_indexes
+
+    @classmethod
+    def from_arrays(cls, node_releases, restrains, elastic_constants, member_nodes, member_releases,
+            ordering: str=None, node_ids=None):
+        """
+        Plan of a model stored as arrays (see ModelArrays), nodes and
+        node_indexes are empty
+
+        Parameters
+        ----------
+        node_releases, restrains, elastic_constants: np.ndarray
+            Releases, restrains and elastic constants of each node, shape
+            (nodes, 6)
+        member_nodes: np.ndarray
+            Rows of the left and right node of each member, shape (members, 2)
+        member_releases: np.ndarray
+            Releases of each member [node_1 (6), node_2 (6)], shape (members, 12)
+        ordering: str, None
+            Fill reducing ordering of the nodes (see ordering.ORDERINGS)
+        node_ids: list, None
+            Id of the node of each row, default 1, 2, ...
+        """
+        plan = cls.__new__(cls)
+        plan._compile(
+                np.asarray(node_releases, dtype=bool).reshape(-1, 6),
+                np.asarray(restrains, dtype=bool).reshape(-1, 6),
+                np.asarray(elastic_constants, dtype=float).reshape(-1, 6),
+                np.asarray(member_nodes, dtype=int).reshape(-1, 2),
+                np.asarray(member_releases, dtype=bool).reshape(-1, 12),
+                ordering)
+        plan.nodes = ()
+        plan.node_ids = tuple(range(1, len(plan.node_degrees) + 1)) if node_ids is None else tuple(node_ids)
+        plan.node_indexes = {}
+        return plan
+
+    def _compile(self, node_releases, node_restrains, node_elastic_constants, member_nodes, member_releases,
+            ordering):
+        # Nodes
+        not_released = ~node_releases
+        node_degrees = np.full(node_releases.shape, -1)
+        node_degrees[not_released] = np.arange(not_released.sum())
+        self.node_degrees = _read_only(node_degrees)
+        self.node_offsets = _read_only(np.concatenate(([0], np.cumsum(not_released.sum(axis=1)))))
+        self.number_of_degrees = int(not_released.sum())
+        # Members
+        self.member_nodes = _read_only(np.array(member_nodes, dtype=int))
+        member_degrees = node_degrees[self.member_nodes].reshape(-1, 12)
+        member_degrees[member_releases] = -1
+        self.member_degrees = _read_only(member_degrees)
+        # Structure degrees
+        self.restrains = _read_only(node_restrains[not_released])
+        self.elastic_constants = _read_only(node_elastic_constants[not_released])
+        indexes = np.arange(self.number_of_degrees)
+        self.natural_reorder_indexes = _read_only(np.concatenate((indexes[~self.restrains], indexes[self.restrains])))
+        self.ordering = ordering
+        if ordering is None:
+            self.reorder_indexes = self.natural_reorder_indexes
+        else:
+            # Free degrees first and restrained last, node by node in the order of the ranks
+            ranks = node_ranks(ordering, len(node_releases), self.member_nodes)[self.degree_nodes]
+            self.reorder_indexes = _read_only(np.lexsort((indexes, ranks, self.restrains)))
+        self.inverse_reorder_indexes = _read_only(np.argsort(self.reorder_indexes))
+        self.number_of_degrees_of_freedom = int((~self.restrains).sum())
+
+    @property
+    def degree_nodes(self) -> np.ndarray:
+        """
+        Node row of each structure index
+        """
+        return np.repeat(np.arange(len(self.node_offsets) - 1), np.diff(self.node_offsets))
+
+    @property
+    def half_bandwidth(self) -> int:
+        """
+        Half bandwidth of the free degrees block of the reordered stiffness
+        matrix (largest distance between two free degrees of a member), it
+        depends on the node numbers (or on the ordering), e.g: it is small
+        for chains numbered along the chain
+        """
+        return self.band_statistics()['half_bandwidth']
+
+    def band_statistics(self, ordered: bool=True) -> dict:
+        """
+        Half bandwidth and profile (number of entries between the first
+        entry of each row and the diagonal, the storage of a skyline
+        factorization) of the free degrees block of the reordered stiffness
+        matrix
+
+        Parameters
+        ----------
+        ordered: bool
+            If False the statistics of the order of the node numbers (the
+            order without ordering)
+        """
+        reorder_indexes = self.reorder_indexes if ordered else self.natural_reorder_indexes
+        inverse_reorder_indexes = self.inverse_reorder_indexes if ordered else np.argsort(reorder_indexes)
+        kept = self.member_degrees >= 0
+        positions = np.where(kept, inverse_reorder_indexes[np.where(kept, self.member_degrees, 0)], -1)
+        free = kept & (positions < self.number_of_degrees_of_freedom)
+        highest = np.where(free, positions, -1).max(axis=1, initial=-1)
+        lowest = np.where(free, positions, self.number_of_degrees).min(axis=1, initial=self.number_of_degrees)
+        bandwidths = (highest - lowest)[highest >= 0]
+        # First column of every row of the free block
+        first_columns = np.arange(self.number_of_degrees_of_freedom)
+        np.minimum.at(first_columns, positions[free], np.broadcast_to(lowest[:, np.newaxis], positions.shape)[free])
+        return {
+                'half_bandwidth': int(bandwidths.max(initial=0)),
+                'profile': int((np.arange(self.number_of_degrees_of_freedom) - first_columns).sum())}
+
+    @property
+    def ordering_statistics(self) -> dict:
+        """
+        band_statistics before (order of the node numbers) and after the
+        ordering
+        """
+        return {'before': self.band_statistics(ordered=False), 'after': self.band_statistics()}
+
+    def member_indexes(self, row: int) -> np.ndarray:
+        """
+        Structure indexes of the not released degrees of the member in the
+        row, same order as its structure_oriented_stiffness_matrix
+        """
+        degrees = self.member_degrees[row]
+        return degrees[degrees >= 0]
@@ -3,5 +3,7 @@ from ...action.actions import Force as Force1
 
 
 class Force(Force1):
+    __slots__ = ()
+
     def __init__(self, components:Tuple[float, float]):
         super().__init__((components[0], components[1], 0))
@@ -0,0 +1,446 @@
+"""
+This module implements the element computations for many members at once
+
+Every function works with stacks of 12x12 matrices (one per member) in the
+member degrees order [node_1 forces, node_1 moments, node_2 forces,
+node_2 moments]. Released degrees are kept in the stack as zero rows and
+columns, so members with different releases can be stored together and
+scattered with the same (members, 12) index arrays (see DofPlan).
+
+The release condensation is done with operators C (see
+condensation_operator) that only depend on the release pattern and the
+member length. The stacks of members are condensed with one batched pinv
+per release pattern (see condensation_operators), the operators of single
+members are shared through CONDENSATION_CACHE.
+
+Notes
+-----
+Everything that starts with local or global are refering to the coordinates
+use to define that variable
+"""
+import numpy as np
+from .cache import LRUCache
+
+
+# Condensation operators by (release pattern, length)
+CONDENSATION_CACHE = LRUCache(maxsize=1024)
+
+
+def member_properties(members):
+    """
+    Section and length arrays of the members
+
+    Returns
+    -------
+    e, g, a, ix, iy, j, l: np.ndarray
+        Young modulus, shear modulus, area, inertias, torsion constant and
+        length of each member
+    """
+    properties = np.array([(
+        member.section.material.E,
+        member.section.material.G,
+        member.section.A,
+        member.section.Ix,
+        member.section.Iy,
+        member.section.J,
+        member.length) for member in members], dtype=float).reshape(-1, 7)
+    return tuple(properties.T)
+
+
+def local_stiffness_matrices(e, g, a, ix, iy, j, l):
+    """
+    Member oriented stiffness matrices of fixed members
+
+    Parameters
+    ----------
+    e, g, a, ix, iy, j, l: np.ndarray
+        Young modulus, shear modulus, area, inertias, torsion constant and
+        length of each member, shape (members,)
+
+    Returns
+    -------
+    stiffness: np.ndarray
+        Shape (members, 12, 12)
+    """
+    e, g, a, ix, iy, j, l = np.broadcast_arrays(*(np.asarray(value, dtype=float)
+        for value in (e, g, a, ix, iy, j, l)))
+    stiffness = np.zeros(e.shape + (12, 12))
+    axial, torsion = e*a/l, g*j/l
+    ix_3, ix_2, ix_1 = 12*e*ix/l**3, 6*e*ix/l**2, 2*e*ix/l
+    iy_3, iy_2, iy_1 = 12*e*iy/l**3, 6*e*iy/l**2, 2*e*iy/l
+    # (row, column, value) of the upper triangle
+    upper = (
+            (0, 0, axial), (0, 6, -axial), (6, 6, axial),
+            (3, 3, torsion), (3, 9, -torsion), (9, 9, torsion),
+            (1, 1, ix_3), (1, 7, -ix_3), (7, 7, ix_3),
+            (1, 5, ix_2), (1, 11, ix_2), (5, 7, -ix_2), (7, 11, -ix_2),
+            (5, 5, 2*ix_1), (11, 11, 2*ix_1), (5, 11, ix_1),
+            (2, 2, iy_3), (2, 8, -iy_3), (8, 8, iy_3),
+            (2, 4, -iy_2), (2, 10, -iy_2), (4, 8, iy_2), (8, 10, iy_2),
+            (4, 4, 2*iy_1), (10, 10, 2*iy_1), (4, 10, iy_1))
+    for row, column, value in upper:
+        stiffness[..., row, column] = value
+        stiffness[..., column, row] = value
+    return stiffness
+
+
+def _condensation_key(releases, length):
+    # 12 significant digits, lengths computed from equal coordinates match
+    return (np.packbits(releases).tobytes(), float(f'{length:.12g}'))
+
+
+def _pattern_operators(releases, lengths) -> np.ndarray:
+    """
+    Condensation operators of members with the same release pattern
+    (shape (12,)) and lengths (shape (members,)), one batched pinv
+    """
+    # The blocks of the stiffness matrix (axial, torsion and both bending
+    # planes) are uncoupled and scaled by a section constant, that constant
+    # cancels in the operator, so a unit section is used
+    kept, released = np.flatnonzero(~releases), np.flatnonzero(releases)
+    operators = np.zeros((len(lengths), 12, 12))
+    operators[:, kept, kept] = 1
+    if len(released):
+        stiffness = local_stiffness_matrices(1, 1, 1, 1, 1, 1, lengths)
+        operators[np.ix_(np.arange(len(lengths)), released, kept)] = \
+                -np.linalg.pinv(stiffness[:, released[:, None], released]) @ stiffness[:, released[:, None], kept]
+    return operators
+
+
+def _compute_condensation_operator(releases, length):
+    operator = _pattern_operators(releases, np.array([length], dtype=float))[0]
+    operator.flags.writeable = False
+    return operator
+
+
+def condensation_operator(releases, length: float) -> np.ndarray:
+    """
+    Operator C of the static condensation of the released degrees
+
+    The displacements of the member are u = C u, where only the kept
+    degrees of u are used, so the condensed stiffness matrix is C^T K C
+    (K_kk - K_kr pinv(K_rr) K_rk) and the member loads f move to the kept
+    degrees as C^T f
+
+    Parameters
+    ----------
+    releases: np.ndarray
+        True if the degree is released, shape (12,)
+    length: float
+        Member length
+
+    Returns
+    -------
+    operator: np.ndarray
+        Read only array, shape (12, 12), the columns of the released degrees
+        are zero
+    """
+    releases = np.asarray(releases, dtype=bool)
+    return CONDENSATION_CACHE.get_or_compute(
+            _condensation_key(releases, length),
+            lambda: _compute_condensation_operator(releases, length))
+
+
+def condensation_operators(releases, lengths) -> np.ndarray:
+    """
+    Condensation operators of many members, shape (members, 12, 12), the
+    members are grouped by release pattern and every group is condensed
+    with one batched pinv over its lengths
+    """
+    releases = np.asarray(releases, dtype=bool).reshape(-1, 12)
+    lengths = np.broadcast_to(np.asarray(lengths, dtype=float), releases.shape[:1])
+    operators = np.empty((len(releases), 12, 12))
+    if len(releases) == 0:
+        return operators
+    patterns, groups = np.unique(releases, axis=0, return_inverse=True)
+    # Members of each pattern, consecutive in the order of the groups
+    order = np.argsort(groups.ravel(), kind='stable')
+    bounds = np.cumsum(np.bincount(groups.ravel(), minlength=len(patterns)))[:-1]
+    for pattern, members in zip(patterns, np.split(order, bounds)):
+        operators[members] = _pattern_operators(pattern, lengths[members])
+    return operators
+
+
+def condense_releases(stiffness, releases, lengths):
+    """
+    Static condensation of the released degrees C^T K C (see
+    condensation_operators)
+
+    Parameters
+    ----------
+    stiffness: np.ndarray
+        Stiffness matrices, shape (members, 12, 12)
+    releases: np.ndarray
+        True if the degree is released, shape (members, 12)
+    lengths: np.ndarray
+        Length of the members, shape (members,)
+
+    Returns
+    -------
+    condensed: np.ndarray
+        Condensed matrices with zero rows and columns at the released
+        degrees, shape (members, 12, 12)
+    """
+    operators = condensation_operators(releases, lengths)
+    return np.einsum('mji,mjk,mkl->mil', operators, stiffness, operators, optimize=True)
+
+
+def force_fixed_end_actions(positions, lengths, components):
+    """
+    Fixed-end actions of point forces on totally fixed members (same
+    expressions as Force.compute_equivalent_joint_loads)
+
+    Parameters
+    ----------
+    positions: np.ndarray
+        Distance from the left node, shape (loads,)
+    lengths: np.ndarray
+        Length of the loaded member, shape (loads,)
+    components: np.ndarray
+        Member oriented components, shape (loads, 3)
+
+    Returns
+    -------
+    actions: np.ndarray
+        Shape (loads, 12)
+    """
+    a = np.asarray(positions, dtype=float)
+    length = np.asarray(lengths, dtype=float)
+    b = length - a
+    p_x, p_y, p_z = np.asarray(components, dtype=float).reshape(-1, 3).T
+    actions = np.zeros((len(a), 12))
+    actions[:, 0] = -p_x*b/length
+    actions[:, 1] = -p_y*b**2*(3*a + b)/length**3
+    actions[:, 2] = -p_z*b**2*(3*a + b)/length**3
+    actions[:, 4] = p_z*a*b**2/length**2
+    actions[:, 5] = -p_y*a*b**2/length**2
+    actions[:, 6] = -p_x*a/length
+    actions[:, 7] = -p_y*a**2*(3*b + a)/length**3
+    actions[:, 8] = -p_z*a**2*(3*b + a)/length**3
+    actions[:, 10] = -p_z*a**2*b/length**2
+    actions[:, 11] = p_y*a**2*b/length**2
+    return actions
+
+
+def moment_fixed_end_actions(positions, lengths, components):
+    """
+    Fixed-end actions of point moments on totally fixed members (same
+    expressions as Moment.compute_equivalent_joint_loads), see
+    force_fixed_end_actions
+    """
+    a = np.asarray(positions, dtype=float)
+    length = np.asarray(lengths, dtype=float)
+    b = length - a
+    m_x, m_y, m_z = np.asarray(components, dtype=float).reshape(-1, 3).T
+    actions = np.zeros((len(a), 12))
+    actions[:, 1] = 6*m_z*a*b/length**3
+    actions[:, 2] = 6*m_y*a*b/length**3
+    actions[:, 3] = -m_x*b/length
+    actions[:, 4] = m_y*b*(b - 2*a)/length**2
+    actions[:, 5] = m_z*b*(b - 2*a)/length**2
+    actions[:, 7] = -6*m_z*a*b/length**3
+    actions[:, 8] = -6*m_y*a*b/length**3
+    actions[:, 9] = -m_x*a/length
+    actions[:, 10] = m_y*a*(a - 2*b)/length**2
+    actions[:, 11] = m_z*a*(a - 2*b)/length**2
+    return actions
+
+
+def distributed_fixed_end_actions(positions, load_lengths, lengths, initial, final):
+    """
+    Fixed-end actions of linearly varying distributed forces on totally
+    fixed members (same expressions as
+    DistributedForce.compute_equivalent_joint_loads)
+
+    Parameters
+    ----------
+    positions: np.ndarray
+        Distance from the left node to the start of the load, shape (loads,)
+    load_lengths: np.ndarray
+        Length of the loads, shape (loads,)
+    lengths: np.ndarray
+        Length of the loaded member, shape (loads,)
+    initial, final: np.ndarray
+        Member oriented magnitudes at the start and at the end of the load,
+        shape (loads, 3)
+
+    Returns
+    -------
+    actions: np.ndarray
+        Shape (loads, 12)
+    """
+    a = np.asarray(positions, dtype=float)
+    c = np.asarray(load_lengths, dtype=float)
+    length = np.asarray(lengths, dtype=float)
+    b = length - a - c
+    initial = np.asarray(initial, dtype=float).reshape(-1, 3)
+    final = np.asarray(final, dtype=float).reshape(-1, 3)
+    harmonic = 1 + b/(length - a) + b**2/(length - a)**2
+    denominator = 60*(a**2 + 2*a*b + 2*a*c + b**2 + 2*b*c + c**2)
+
+    def end_force(q_1, q_2):
+        r_1 = q_1*(length - a)**3/20/length**3
+        r_2 = q_2*(length - a)**3/20/length**3
+        return -(r_1*(7*length + 8*a - b*(3*length + 2*a)/(length - a)*harmonic
+            + 2*b**4/(length - a)**3) + r_2*((3*length + 2*a)*harmonic
+            - b**3/(length - a)**2*(2 + (15*length - 8*b)/(length - a))))
+
+    def left_moment(q_1, q_2):
+        return c*(30*a*b**2*q_1 + 30*a*b**2*q_2 + 40*a*b*c*q_1 + 20*a*b*c*q_2
+                + 15*a*c**2*q_1 + 5*a*c**2*q_2 + 10*b**2*c*q_1 + 20*b**2*c*q_2
+                + 10*b*c**2*q_1 + 10*b*c**2*q_2 + 3*c**3*q_1 + 2*c**3*q_2)/denominator
+
+    def right_moment(q_1, q_2):
+        return c*(30*a**2*b*q_1 + 30*a**2*b*q_2 + 20*a**2*c*q_1 + 10*a**2*c*q_2
+                + 20*a*b*c*q_1 + 40*a*b*c*q_2 + 10*a*c**2*q_1 + 10*a*c**2*q_2
+                + 5*b*c**2*q_1 + 15*b*c**2*q_2 + 2*c**3*q_1 + 3*c**3*q_2)/denominator
+
+    actions = np.zeros((len(a), 12))
+    # Forces X-Y, Moments Z
+    q_1, q_2 = initial[:, 1], final[:, 1]
+    actions[:, 1] = end_force(q_1, q_2)
+    actions[:, 5] = -left_moment(q_1, q_2)
+    actions[:, 7] = -((q_2 + q_1)/2*c + actions[:, 1])
+    actions[:, 11] = right_moment(q_1, q_2)
+    # Forces X-Z, Moments Y
+    q_1, q_2 = initial[:, 2], final[:, 2]
+    actions[:, 2] = end_force(q_1, q_2)
+    actions[:, 4] = left_moment(q_1, q_2)
+    actions[:, 8] = -((q_2 + q_1)/2*c + actions[:, 2])
+    actions[:, 10] = -right_moment(q_1, q_2)
+    # Forces X
+    actions[:, 0] = -final[:, 0]*c*(length - a + b)/2/length
+    actions[:, 6] = -final[:, 0]*c*(length + a - b)/2/length
+    return actions
+
+
+def direction_cosine_matrices(angles):
+    """
+    Rotation matrices from structure to member coordinates defined by the
+    direction angles of the members
+
+    The members parallel to the structure Y axis (angle_y = 0 or pi) use a
+    fixed local frame, the other members keep the local z axis in the
+    structure XZ plane
+
+    Parameters
+    ----------
+    angles: np.ndarray
+        Angles between the member and the structure axes (radians), shape
+        (members, 3)
+
+    Returns
+    -------
+    rotations: np.ndarray
+        Shape (members, 3, 3)
+    """
+    angles = np.asarray(angles, dtype=float).reshape(-1, 3)
+    cosines = np.cos(angles)
+    c_x, c_y, c_z = cosines.T
+    vertical = (angles[:, 1] == 0) | (angles[:, 1] == np.pi)
+    # Vertical members have c_xz = 0, a unit value avoids the division
+    c_xz = np.where(vertical, 1, np.sqrt(c_x**2 + c_z**2))
+    rotations = np.empty((len(angles), 3, 3))
+    rotations[:, 0] = cosines
+    rotations[:, 1] = np.column_stack((-c_y*c_x/c_xz, c_xz, -c_y*c_z/c_xz))
+    rotations[:, 2] = np.column_stack((-c_z/c_xz, np.zeros(len(angles)), c_x/c_xz))
+    rotations[vertical] = np.stack((
+            np.column_stack((np.zeros_like(c_y), c_y, np.zeros_like(c_y))),
+            np.column_stack((-c_y, np.zeros_like(c_y), np.zeros_like(c_y))),
+            np.tile([0., 0., 1.], (len(c_y), 1))), axis=1)[vertical]
+    return rotations
+
+
+def rotation_vector_matrices(rotation_vectors):
+    """
+    Rotation matrices of rotation vectors (Rodrigues formula)
+
+    Parameters
+    ----------
+    rotation_vectors: np.ndarray
+        Axis times angle (radians) of each rotation, shape (rotations, 3)
+
+    Returns
+    -------
+    rotations: np.ndarray
+        Shape (rotations, 3, 3)
+    """
+    rotation_vectors = np.asarray(rotation_vectors, dtype=float).reshape(-1, 3)
+    theta = np.linalg.norm(rotation_vectors, axis=1)
+    rotations = np.tile(np.eye(3), (len(theta), 1, 1))
+    rotated = theta > 0
+    if not rotated.any():
+        return rotations
+    theta = theta[rotated]
+    x, y, z = (rotation_vectors[rotated]/theta[:, np.newaxis]).T
+    zero = np.zeros_like(x)
+    # Cross product matrices of the unit axes
+    cross = np.stack((
+        np.column_stack((zero, -z, y)),
+        np.column_stack((z, zero, -x)),
+        np.column_stack((-y, x, zero))), axis=1)
+    rotations[rotated] += np.sin(theta)[:, np.newaxis, np.newaxis]*cross \
+            + (1 - np.cos(theta))[:, np.newaxis, np.newaxis]*(cross @ cross)
+    return rotations
+
+
+def node_rotation_matrices(angles, rotation_vectors):
+    """
+    Rotation matrices from structure to member coordinates at the nodes of
+    the members, the member direction cosines composed with the rotation
+    of the (skewed) node
+
+    Parameters
+    ----------
+    angles: np.ndarray
+        Direction angles of the members, shape (members, 3)
+    rotation_vectors: np.ndarray
+        Rotation vector (Node.angle) of the node of each member, shape
+        (members, 3)
+
+    Returns
+    -------
+    rotations: np.ndarray
+        Shape (members, 3, 3)
+    """
+    return direction_cosine_matrices(angles) @ rotation_vector_matrices(rotation_vectors)
+
+
+def transformation_matrices(node_1_rotations, node_2_rotations):
+    """
+    Block diagonal transformation matrices from structure to member
+    coordinates
+
+    Parameters
+    ----------
+    node_1_rotations, node_2_rotations: np.ndarray
+        Rotation matrices of the left and right node of each member, shape
+        (members, 3, 3)
+
+    Returns
+    -------
+    transformation: np.ndarray
+        Shape (members, 12, 12)
+    """
+    node_1_rotations = np.asarray(node_1_rotations, dtype=float).reshape(-1, 3, 3)
+    node_2_rotations = np.asarray(node_2_rotations, dtype=float).reshape(-1, 3, 3)
+    transformation = np.zeros((len(node_1_rotations), 12, 12))
+    transformation[:, 0:3, 0:3] = node_1_rotations
+    transformation[:, 3:6, 3:6] = node_1_rotations
+    transformation[:, 6:9, 6:9] = node_2_rotations
+    transformation[:, 9:12, 9:12] = node_2_rotations
+    return transformation
+
+
+def global_stiffness_matrices(stiffness, transformation):
+    """
+    Structure oriented stiffness matrices T^T K T
+
+    Parameters
+    ----------
+    stiffness: np.ndarray
+        Member oriented stiffness matrices, shape (members, 12, 12)
+    transformation: np.ndarray
+        Transformation matrices, shape (members, 12, 12)
+    """
+    return np.einsum('mji,mjk,mkl->mil', transformation, stiffness, transformation, optimize=True)
@@ -0,0 +1,127 @@
+"""
+This module defines LoadCase and LoadCaseResult classes
+
+A LoadCase groups the node and member actions of a named load state (dead,
+live, wind, ...) without modifying the nodes and members of the model, so a
+structure can solve all its load cases with a single factorization of the
+stiffness matrix (see Structure.solve_load_cases).
+
+Notes
+-----
+Imposed displacements at the supports are not part of a load case, they are
+taken into account only by Structure.solve
+"""
+import numpy as np
+from typing import Dict, List, Tuple
+from .action.actions import Force, Moment
+from .action.distributed_force import DistributedForce
+
+
+class LoadCase:
+    """
+    Named group of node and member actions
+
+    Attributes
+    ----------
+    name: str
+        Name of the load case e.g: 'dead', 'live', 'wind'
+    node_actions: Dict[Node, np.ndarray]
+        Structure oriented actions [Fx, Fy, Fz, Mx, My, Mz] of each node
+    member_loads: Dict[Member, Tuple[list, list, list]]
+        Forces, moments and distributed loads of each member
+    """
+    def __init__(self, name: str):
+        self.name = name
+        self.node_actions: Dict = {}
+        self.member_loads: Dict = {}
+
+    def __str__(self):
+        return f"LoadCase {self.name}"
+
+    def _node_action(self, node):
+        if node not in self.node_actions:
+            self.node_actions[node] = np.zeros(6)
+        return self.node_actions[node]
+
+    def _member_loads(self, member) -> Tuple[List, List, List]:
+        if member not in self.member_loads:
+            self.member_loads[member] = ([], [], [])
+        return self.member_loads[member]
+
+    def add_node_force(self, node, force: Force):
+        """
+        Add a Force to the node in this load case
+        """
+        self._node_action(node)[:3] += force.components
+
+    def add_node_moment(self, node, moment: Moment):
+        """
+        Add a Moment to the node in this load case
+        """
+        self._node_action(node)[3:] += moment.components
+
+    def add_member_force(self, member, location: float, force: Force):
+        """
+        Add a Force at the location of the member in this load case
+        """
+        self._member_loads(member)[0].append(member._place_load(location, force))
+
+    def add_member_moment(self, member, location: float, moment: Moment):
+        """
+        Add a Moment at the location of the member in this load case
+        """
+        self._member_loads(member)[1].append(member._place_load(location, moment))
+
+    def add_distributed_load(self, member, location: float, distributed_load: DistributedForce):
+        """
+        Add a DistributedForce starting at the location of the member in this
+        load case
+        """
+        self._member_loads(member)[2].append(member._place_load(location, distributed_load))
+
+
+class LoadCaseResult:
+    """
+    Results of a load case
+
+    Attributes
+    ----------
+    name: str
+        Name of the load case
+    displacements: np.ndarray
+        Displacements of the free degrees (same order as Structure.displacements)
+    reactions: np.ndarray
+        Reactions of the restrained degrees (same order as Structure.reactions)
+    node_displacements: np.ndarray
+        Structure oriented displacements of every node, shape (nodes, 6)
+    node_reactions: np.ndarray
+        Structure oriented reactions (supports and elastic supports) of
+        every node, shape (nodes, 6)
+    member_end_actions: np.ndarray
+        Member oriented end actions of every member [force_left, moment_left,
+        force_right, moment_right], shape (members, 12)
+    """
+    def __init__(self, name, nodes, members, displacements, reactions,
+            node_displacements, node_reactions, member_end_actions):
+        self.name = name
+        self.nodes = nodes
+        self.members = members
+        self.displacements = displacements
+        self.reactions = reactions
+        self.node_displacements = node_displacements
+        self.node_reactions = node_reactions
+        self.member_end_actions = member_end_actions
+        self._node_indexes = {node: i for i, node in enumerate(nodes)}
+        self._member_indexes = {id(member): i for i, member in enumerate(members)}
+
+    def __str__(self):
+        return f"LoadCaseResult {self.name}"
+
+    def node_displacement(self, node) -> np.ndarray:
+        return self.node_displacements[self._node_indexes[node]]
+
+    def node_reaction(self, node) -> np.ndarray:
+        return self.node_reactions[self._node_indexes[node]]
+
+    def end_actions(self, member) -> np.ndarray:
+        return self.member_end_actions[self._member_indexes[id(member)]]
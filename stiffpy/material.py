@@ -4,8 +4,10 @@ A36 and A572Grade50.
 
 This module use Imperial Units (lbf, in, F)
 """
+from .tracking import Tracked
 
-class Material:
+
+class Material(Tracked):
     """
     Class to define new materials
 
@@ -24,6 +26,9 @@ class Material:
     alpha: float
         Coefficient of thermal expansion 1/F
     """
+    # Attributes that change the stiffness of the members (their sections
+    # are notified)
+    _tracked_attributes = frozenset(('E', 'G', 'v'))
 
     def __init__(self, f_y: float, f_u: float, E: float, v: float=0, w: float=0, alpha: float=0):
         """
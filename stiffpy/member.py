@@ -12,16 +12,113 @@ Everything that starts with local or global are refering to the coordinates
 use to define that variable
 """
 
+import functools
+import itertools
 import numpy as np
-from typing import Tuple
-from scipy.linalg import block_diag
+from typing import Dict, Tuple
 from .node import Node
 from .section import Section
+from .kernels import member_properties, local_stiffness_matrices, condense_releases, \
+        direction_cosine_matrices, node_rotation_matrices, transformation_matrices
+from .tracking import Tracked
+from .cache import LRUCache
+from .member_loads import MemberLoadTable
+from .diagram import Diagram, linear_load_terms
+from .profiling import count
 from .action.actions import Force, Moment
 from .action.distributed_force import DistributedForce
 
 
-class Member:
+# Results (diagrams, deformations) of the members by (member, solve
+# generation, revision, result), set MEMBER_RESULTS_CACHE.maxbytes to cap
+# its memory
+MEMBER_RESULTS_CACHE = LRUCache(maxsize=4096)
+# Domains of the members by (length, resolution), shared by the members with
+# the same length
+DOMAIN_CACHE = LRUCache(maxsize=1024)
+_serial_numbers = itertools.count()
+
+
+def _read_only(value):
+    """
+    Mark the arrays of a cached result as read only
+    """
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, Diagram):
+        _read_only(value.breakpoints)
+        _read_only(value.coefficients)
+    elif isinstance(value, dict):
+        for item in value.values():
+            _read_only(item)
+    elif isinstance(value, tuple):
+        for item in value:
+            _read_only(item)
+    return value
+
+
+def memoized_result(function):
+    """
+    Property whose value is kept in MEMBER_RESULTS_CACHE until the structure
+    is solved again or the loads, nodes, releases, section or resolution of
+    the member change, the cached arrays are read only
+    """
+    name = function.__name__
+
+    @functools.wraps(function)
+    def result(self):
+        return MEMBER_RESULTS_CACHE.get_or_compute(
+                (self._result_key, name),
+                lambda: _read_only(function(self)))
+    return property(result)
+
+
+def member_node_rotations(members):
+    """
+    Rotation matrices from structure to member coordinates at the left and
+    right node of each member
+
+    The matrices of the members that are not cached are computed in a single
+    batch and cached on the members
+
+    Returns
+    -------
+    node_1_rotations, node_2_rotations: np.ndarray
+        Shape (members, 3, 3)
+    """
+    missing = [member for member in members if member._node_rotations is None]
+    if missing:
+        count('node_rotation_matrices_computed', len(missing))
+        angles = np.array([member.angle for member in missing], dtype=float).reshape(-1, 3)
+        rotation_vectors = np.array([member.node_1.angle for member in missing]
+                + [member.node_2.angle for member in missing], dtype=float).reshape(-1, 3)
+        rotations = node_rotation_matrices(np.concatenate((angles, angles)), rotation_vectors)
+        rotations.flags.writeable = False
+        for member, rotation_1, rotation_2 in zip(missing, rotations[:len(missing)], rotations[len(missing):]):
+            member._node_rotations = (rotation_1, rotation_2)
+    if len(members) == 0:
+        return np.empty((0, 3, 3)), np.empty((0, 3, 3))
+    node_1_rotations, node_2_rotations = zip(*(member._node_rotations for member in members))
+    return np.stack(node_1_rotations), np.stack(node_2_rotations)
+
+
+class Member(Tracked):
+    __slots__ = ('_node_rotations', '_member_rotation_matrix', '_serial_number',
+            '_solve_generation', '_revision', '_resolution', '_result_dtype', 'node_1',
+            'node_2', 'node_1_release', 'node_2_release', 'section', 'length', 'angle',
+            '_forces', '_moments', '_distributed_loads', 'node_1_index_not_released',
+            'node_2_index_not_released', 'node_1_number_not_released',
+            'node_2_number_not_released', '_end_action_values')
+    # Number of points of the domain where the diagrams are evaluated and
+    # dtype of the sampled results (axial_force, shear, deflection, ...) of
+    # every member, np.float32 halves their memory, see resolution and
+    # result_dtype to change them in a member
+    default_resolution = 1000
+    default_result_dtype = np.float64
+    # Attributes that change the numbering of the degrees of freedom
+    _numbering_attributes = frozenset(('node_1', 'node_2', 'node_1_release', 'node_2_release'))
+    _tracked_attributes = _numbering_attributes | {'section'}
+
     def __init__(self,
             node_1: Node,
             node_2: Node,
@@ -46,40 +143,52 @@ class Member:
             member releases of the right node (not necesarily the same as 
             the node release), default not released
         """
+        self._node_rotations = None
+        self._member_rotation_matrix = None
+        self._serial_number = next(_serial_numbers)
+        self._solve_generation = 0
+        self._revision = 0
+        self._resolution = None
+        self._result_dtype = None
+        # [force_left, moment_left, force_right, moment_right]
+        self._end_action_values = np.zeros(12)
         # check if the left and right node have the same dimension
         self.node_1 = node_1
         self.node_2 = node_2
         self.node_1_release = node_1_release
         self.node_2_release = node_2_release
-        # Change nodes release according to member releases
-        for i in range(len(node_1.release)):
+        # Change nodes release according to member releases (a new list is
+        # assigned so the structures of the nodes are notified)
+        node_1_nodal_release = list(node_1.release)
+        node_2_nodal_release = list(node_2.release)
+        for i in range(len(node_1_nodal_release)):
             # Iterate over every release of the node 1
             if node_1.default == True:
                 # Checks if its the first time we change the releases and 
                 # if it change from False to True
-                node_1.release[i] = node_1_release[i]
-            elif node_1.release[i] == True and node_1_release[i] == False \
+                node_1_nodal_release[i] = node_1_release[i]
+            elif node_1_nodal_release[i] == True and node_1_release[i] == False \
                     and node_1.default == False:
                 # Cheks if its not the firs time we change the releases and 
                 # if the release change from True to False
-                node_1.release[i] = False
-        for i in range(len(node_2.release)):
+                node_1_nodal_release[i] = False
+        for i in range(len(node_2_nodal_release)):
             # Iterate over every release of the node 2
             if node_2.default == True:
                 # Checks if its the first time we change the releases and 
                 # if it change from False to True
-                node_2.release[i] = node_2_release[i]
-            elif node_2.release[i] == True and node_2_release[i] == False \
+                node_2_nodal_release[i] = node_2_release[i]
+            elif node_2_nodal_release[i] == True and node_2_release[i] == False \
                     and node_2.default == False:
                 # Cheks if its not the firs time we change the releases and 
                 # if the release change from True to False
-                node_2.release[i] = False
+                node_2_nodal_release[i] = False
+        node_1.release = node_1_nodal_release
+        node_2.release = node_2_nodal_release
         node_1.default = False
         node_2.default = False
         self.section = section
-        r_vector = node_2.r - node_1.r
-        self.length = float(np.linalg.norm(r_vector))
-        self.angle = np.arccos(r_vector/self.length)
+        self._update_geometry()
         self._forces = []
         self._moments = []
         self._distributed_loads = []
@@ -91,9 +200,119 @@ class Member:
                 enumerate(node_2_release) if false == False] 
         self.node_1_number_not_released = len(node_1_release) - sum(node_1_release)
         self.node_2_number_not_released = len(node_2_release) - sum(node_2_release)
-        self.domain = np.linspace(0, self.length, 1000)
-        self.global_domain = (node_1.r + (np.linspace(0, 1, 1000)\
-                [..., np.newaxis]*(node_2.r - node_1.r))).T
+
+    def _update_geometry(self):
+        """
+        Length and direction angles from the node coordinates
+        """
+        r_vector = self.node_2.r - self.node_1.r
+        self.length = float(np.linalg.norm(r_vector))
+        self.angle = np.arccos(r_vector/self.length)
+
+    @property
+    def resolution(self) -> int:
+        """
+        Number of points of the domain, default Member.default_resolution
+        """
+        return self.default_resolution if self._resolution is None else self._resolution
+
+    @resolution.setter
+    def resolution(self, resolution: int):
+        self._resolution = resolution
+
+    @property
+    def result_dtype(self):
+        """
+        dtype of the sampled results, default Member.default_result_dtype
+        """
+        return self.default_result_dtype if self._result_dtype is None else self._result_dtype
+
+    @result_dtype.setter
+    def result_dtype(self, dtype):
+        self._result_dtype = dtype
+
+    @property
+    def domain(self):
+        """
+        Points along the member (resolution points) where the diagrams are
+        evaluated, read only array shared by the members of the same length
+        """
+        return DOMAIN_CACHE.get_or_compute((self.length, self.resolution),
+                lambda: _read_only(np.linspace(0, self.length, self.resolution)))
+
+    def _sample(self, diagram: Diagram) -> np.ndarray:
+        """
+        Diagram evaluated along the domain (result_dtype array)
+        """
+        return diagram.evaluate(self.domain).astype(self.result_dtype, copy=False)
+
+    @property
+    def global_domain(self):
+        """
+        Structure coordinates of the domain, shape (3, resolution)
+        """
+        return (self.node_1.r + (np.linspace(0, 1, self.resolution)\
+                [..., np.newaxis]*(self.node_2.r - self.node_1.r))).T
+
+    def _clear_rotations(self):
+        self._node_rotations = None
+        self._member_rotation_matrix = None
+
+    def _notify(self, name: str):
+        """
+        Notify the structures of the member, name is a tracked attribute,
+        'geometry' (the coordinates or angles of a node changed) or 'loads'
+        (a load was added or changed)
+        """
+        # The rotation matrices depend on the nodes and the releases, the
+        # results on everything
+        if name not in ('section', 'loads'):
+            self._clear_rotations()
+        self._revision += 1
+        if name in ('node_1', 'node_2'):
+            getattr(self, name)._observe(self)
+            if hasattr(self, 'length'):
+                self._update_geometry()
+        elif name == 'section':
+            self.section._observe(self)
+        super()._notify(name)
+
+    def _changed(self, tracked, name: str):
+        """
+        Called by the nodes, the section and the loads of the member when a
+        tracked attribute changes
+        """
+        if isinstance(tracked, Node):
+            if tracked is not self.node_1 and tracked is not self.node_2:
+                return
+            if name == 'r':
+                self._update_geometry()
+            if name in Node._geometry_attributes:
+                self._notify('geometry')
+        elif tracked is self.section:
+            # The section or its material changed
+            self._notify('section')
+        elif any(tracked is load for loads in (self._forces, self._moments, self._distributed_loads)
+                for load in loads):
+            self._notify('loads')
+
+    @property
+    def _result_key(self):
+        """
+        Key of the cached results of the member (see memoized_result)
+        """
+        return (self._serial_number, self._solve_generation, self._revision,
+                id(self.section), self.resolution, np.dtype(self.result_dtype).str)
+
+    @property
+    def node_rotation_matrices(self):
+        """
+        Cached rotation matrices from structure to member coordinates at the
+        left and right node (read only arrays, shape (3, 3))
+        """
+        if self._node_rotations is None:
+            member_node_rotations([self])
+        return self._node_rotations
 
     @property
     def member_rotation_matrix(self):
@@ -101,27 +320,18 @@ class Member:
         Compute the member_rotation_matrix
         Note:
         The member rotation matrix R transforms matrices from global to local coordinates, if you want to tranforms something from local to global coordinates use its transpose R.T
-            - node1_rotation_force: select the 3 first degrees of the node corresponding to force degrees
-            - node2_rotation_force: select the 3 first degrees of the node corresponding to force degrees
-            - node1_rotation_moment: select the 3 last degrees of the node corresponding to moment degrees
-            - node2_rotation_moment: select the 3 last degrees of the node corresponding to moment degrees
-            - node1_rotatioin_matrix_moment: compute the node rotatino matrix and according to node1_rotation_force select only the rows and columns to use
-        """
-        node1_rotation_force = ~np.array(self.node_1_release[:3])
-        node1_rotation_moment = ~np.array(self.node_1_release[3:])
-        node2_rotation_force = ~np.array(self.node_2_release[:3])
-        node2_rotation_moment = ~np.array(self.node_2_release[3:])
-        node1_rotation_matrix_force = self.node_1.compute_node_rotation_matrix(self.angle)[node1_rotation_force][:, node1_rotation_force]
-        node1_rotation_matrix_moment = self.node_1.compute_node_rotation_matrix(self.angle)[node1_rotation_moment][:, node1_rotation_moment]
-        node2_rotation_matrix_force = self.node_2.compute_node_rotation_matrix(self.angle)[node2_rotation_force][:, node2_rotation_force]
-        node2_rotation_matrix_moment = self.node_2.compute_node_rotation_matrix(self.angle)[node2_rotation_moment][:, node2_rotation_moment]
-        member_rotation = block_diag(
-                node1_rotation_matrix_force,
-                node1_rotation_matrix_moment,
-                node2_rotation_matrix_force,
-                node2_rotation_matrix_moment
-                )
-        return member_rotation
+            - Block diagonal with the node rotation matrices (forces and moments of each node), only the rows and columns of the not released degrees are kept
+            - Cached (read only) until the nodes, their coordinates or angles, or the releases change
+        """
+        count('member_rotation_matrix')
+        if self._member_rotation_matrix is None:
+            count('member_rotation_matrix_computed')
+            not_released = ~np.array(tuple(self.node_1_release) + tuple(self.node_2_release), dtype=bool)
+            transformation = transformation_matrices(*self.node_rotation_matrices)[0]
+            member_rotation = transformation[not_released][:, not_released]
+            member_rotation.flags.writeable = False
+            self._member_rotation_matrix = member_rotation
+        return self._member_rotation_matrix
 
     @property
     def forces(self):
@@ -137,63 +347,47 @@ class Member:
 
     @property
     def member_oriented_stiffness_matrix(self):
-        e, g, l, a, ix, iy, j = self.section.material.E, self.section.material.G, self.length, self.section.A, self.section.Ix, self.section.Iy, self.section.J
-        stiffness = np.zeros((12, 12))
-        stiffness[[0,6],[0,6]], stiffness[6,0] = e*a/l, -e*a/l
-        stiffness[[1,7],[1,7]], stiffness[7,1] = 12*e*ix/l**3, -12*e*ix/l**3
-        stiffness[[2,8],[2,8]], stiffness[8,2] = 12*e*iy/l**3, -12*e*iy/l**3
-        stiffness[[3,9],[3,9]], stiffness[9,3] = g*j/l, -g*j/l
-        stiffness[[4,10],[4,10]] = 4*e*iy/l
-        stiffness[[5,11],[5,11]] = 4*e*ix/l
-        stiffness[[4,10],[2,2]], stiffness[[8,10],[4,8]] = -6*e*iy/l**2, 6*e*iy/l**2
-        stiffness[[5,11],[1,1]], stiffness[[7,11],[5,7]] = 6*e*ix/l**2, -6*e*ix/l**2
-        stiffness[10,4], stiffness[11,5] = 2*e*iy/l, 2*e*ix/l
-        stiffness = stiffness + stiffness.T - np.diag(stiffness.diagonal())
-        merge_releases = np.array(self.node_1_release + self.node_2_release)
-        matrix_release_rows = stiffness[merge_releases,:]
-        matrix_release_rows_known, matrix_release_rows_unknown = matrix_release_rows[:,~merge_releases], matrix_release_rows[:, merge_releases]
-        multiplication = -np.linalg.pinv(matrix_release_rows_unknown)@matrix_release_rows_known
-        matrix_release_columns = stiffness[:, merge_releases]
-        other_matrix_columns = stiffness[:, ~merge_releases]
-        stiffness = (other_matrix_columns + matrix_release_columns @ multiplication)[~merge_releases,:]
-        return stiffness
+        count('member_oriented_stiffness_matrix')
+        merge_releases = np.array(tuple(self.node_1_release) + tuple(self.node_2_release))
+        stiffness = local_stiffness_matrices(*member_properties([self]))
+        stiffness = condense_releases(stiffness, merge_releases, self.length)[0]
+        return stiffness[~merge_releases][:, ~merge_releases]
 
     @property
     def structure_oriented_stiffness_matrix(self):
+        count('structure_oriented_stiffness_matrix')
         return self.member_rotation_matrix.T @ self.member_oriented_stiffness_matrix @ self.member_rotation_matrix
 
+    def _equivalent_joint_loads(self, forces, moments, distributed_loads):
+        """
+        Member oriented equivalent joint loads of a group of member loads
+
+        Parameters
+        ----------
+        forces, moments, distributed_loads: list
+            Actions already placed in the member (see forces, moments and
+            distributed_loads setters)
+
+        Returns
+        -------
+        cumulative_force_1, cumulative_moment_1, cumulative_force_2, cumulative_moment_2
+        """
+        releases = tuple(self.node_1_release) + tuple(self.node_2_release)
+        equivalent_joint_loads = MemberLoadTable.from_member_loads(
+                1, {0: (forces, moments, distributed_loads)}).equivalent_joint_loads([self.length], [releases])[0]
+        cumulative_force_1 = Force(equivalent_joint_loads[:3])
+        cumulative_moment_1 = Moment(equivalent_joint_loads[3:6])
+        cumulative_force_2 = Force(equivalent_joint_loads[6:9])
+        cumulative_moment_2 = Moment(equivalent_joint_loads[9:])
+        return cumulative_force_1, cumulative_moment_1, cumulative_force_2, cumulative_moment_2
+
     @property
     def member_oriented_equivalent_joint_loads(self):
-        cumulative_force_1 = Force((0, 0, 0))
-        cumulative_force_2 = Force((0, 0, 0))
-        cumulative_moment_1 = Moment((0, 0, 0))
-        cumulative_moment_2 = Moment((0, 0, 0))
-        for force in self.forces:
-            # iterate over forces computing their the equivalent joint loads and sum it
-            force_force_1, force_moment_1, force_force_2, force_moment_2 = force.compute_equivalent_joint_loads()
-            cumulative_force_1 = cumulative_force_1 + force_force_1
-            cumulative_force_2 = cumulative_force_2 + force_force_2
-            cumulative_moment_1 = cumulative_moment_1 + force_moment_1
-            cumulative_moment_2 = cumulative_moment_2 + force_moment_2
-        for moment in self.moments:
-            # iterate over moments computing their the equivalent joint loads and sum it
-            moment_force_1, moment_moment_1, moment_force_2, moment_moment_2 = moment.compute_equivalent_joint_loads()
-            cumulative_force_1 = cumulative_force_1 + moment_force_1
-            cumulative_force_2 = cumulative_force_2 + moment_force_2
-            cumulative_moment_1 = cumulative_moment_1 + moment_moment_1
-            cumulative_moment_2 = cumulative_moment_2 + moment_moment_2
-        for distri in self.distributed_loads:
-            # iterate over distributed_forces computing their the equivalent joint loads and sum it
-            distri_force_1, distri_moment_1, distri_force_2, distri_moment_2 = distri.compute_equivalent_joint_loads()
-            cumulative_force_1 = cumulative_force_1 + distri_force_1
-            cumulative_force_2 = cumulative_force_2 + distri_force_2
-            cumulative_moment_1 = cumulative_moment_1 + distri_moment_1
-            cumulative_moment_2 = cumulative_moment_2 + distri_moment_2
+        cumulative_force_1, cumulative_moment_1, cumulative_force_2, cumulative_moment_2 = \
+                self._equivalent_joint_loads(self.forces, self.moments, self.distributed_loads)
         # Internal end actions of the member
-        self.force_left = Force(-cumulative_force_1.components)
-        self.moment_left = Moment(-cumulative_moment_1.components)
-        self.force_right = Force(-cumulative_force_2.components)
-        self.moment_right = Moment(-cumulative_moment_2.components)
+        self._end_action_values = -np.concatenate((cumulative_force_1.components, cumulative_moment_1.components,
+            cumulative_force_2.components, cumulative_moment_2.components))
         return cumulative_force_1, cumulative_moment_1, cumulative_force_2, cumulative_moment_2
 
     @property
@@ -214,19 +408,31 @@ class Member:
         global_actions = -self.structure_oriented_stiffness_matrix @ global_displacements
         return global_actions
 
+    def _place_load(self, location: float, action):
+        """
+        Place a member load (Force, Moment or DistributedForce) at the
+        location of the member, the action is not added to the member
+        """
+        action.position = location
+        action.member_length = self.length
+        action.node_1_releases = self.node_1_release
+        action.node_2_releases = self.node_2_release
+        action.member_section = self.section
+        return action
+
+    def _add_load(self, loads: list, location: float, action):
+        loads.append(self._place_load(location, action))
+        # The changes of the action change the loads of the member
+        action._observe(self)
+        self._notify('loads')
+
     @forces.setter
     def forces(self, location_force: Tuple[float, Force]):
         """
         Force setter method
             * location_force: (location, Force object)
         """
-        force = location_force[1]
-        force.position = location_force[0]
-        force.member_length = self.length
-        force.node_1_releases = self.node_1_release
-        force.node_2_releases = self.node_2_release
-        force.member_section = self.section
-        self._forces.append(force)
+        self._add_load(self._forces, *location_force)
     
     @moments.setter
     def moments(self, location_moment: Tuple[float, Moment]):
@@ -234,13 +440,7 @@ class Member:
         Momebt setter method
             * location_moment: [location, Moment object]
         """
-        moment = location_moment[1]
-        moment.position = location_moment[0]
-        moment.member_length = self.length
-        moment.node_1_releases = self.node_1_release
-        moment.node_2_releases = self.node_2_release
-        moment.member_section = self.section
-        self._moments.append(moment)
+        self._add_load(self._moments, *location_moment)
 
     @distributed_loads.setter
     def distributed_loads(self, location_distri: Tuple[float, DistributedForce]):
@@ -248,165 +448,186 @@ class Member:
         Distributed Load setter method
             * location_force: [location, DistributedLoad object]
         """
-        distri = location_distri[1]
-        distri.position = location_distri[0]
-        distri.member_length = self.length
-        distri.node_1_releases = self.node_1_release
-        distri.node_2_releases = self.node_2_release
-        distri.member_section = self.section
-        self._distributed_loads.append(distri)
-
-    def _end_actions(self):
-        actions = np.concatenate([self.force_left.components, self.moment_left.components, self.force_right.components, self.moment_right.components])
-        actions = actions[~np.array(self.node_1_release + self.node_2_release)]
-        displacements_1 = np.array(self.node_1.displacements)[~np.array(self.node_1_release)]
-        displacements_2 = np.array(self.node_2.displacements)[~np.array(self.node_2_release)]
-        displacements = np.concatenate([displacements_1, displacements_2])
-        fem = (self.member_oriented_stiffness_matrix @ self.member_rotation_matrix) @ displacements + actions
-        left_node_actions = fem[:self.node_1_number_not_released]
-        right_node_actions = fem[self.node_1_number_not_released:]
-        acts_left = []
-        acts_right = []
-        for release in self.node_1_release:
-            if release == False:
-                acts_left.append(left_node_actions[0])
-                left_node_actions = np.delete(left_node_actions, 0)
-            else:
-                acts_left.append(0)
-        for release in self.node_2_release:
-            if release == False:
-                acts_right.append(right_node_actions[0])
-                right_node_actions = np.delete(right_node_actions, 0)
-            else:
-                acts_right.append(0)
-        self.force_left = Force(acts_left[:3])
-        self.moment_left = Moment(acts_left[3:])
-        self.force_right = Force(acts_right[:3])
-        self.moment_right = Moment(acts_right[3:])
+        self._add_load(self._distributed_loads, *location_distri)
+
+    def _end_action(self, start: int, action_type):
+        return action_type(self._end_action_values[start:start + 3])
+
+    def _set_end_action(self, start: int, action):
+        # A new array, the current one can be a row of the end actions of
+        # the structure (see Structure._end_actions)
+        values = np.array(self._end_action_values, dtype=float)
+        values[start:start + 3] = action.components
+        self._end_action_values = values
+
+    @property
+    def force_left(self) -> Force:
+        return self._end_action(0, Force)
+
+    @force_left.setter
+    def force_left(self, force: Force):
+        self._set_end_action(0, force)
+
+    @property
+    def moment_left(self) -> Moment:
+        return self._end_action(3, Moment)
+
+    @moment_left.setter
+    def moment_left(self, moment: Moment):
+        self._set_end_action(3, moment)
+
+    @property
+    def force_right(self) -> Force:
+        return self._end_action(6, Force)
+
+    @force_right.setter
+    def force_right(self, force: Force):
+        self._set_end_action(6, force)
+
+    @property
+    def moment_right(self) -> Moment:
+        return self._end_action(9, Moment)
+
+    @moment_right.setter
+    def moment_right(self, moment: Moment):
+        self._set_end_action(9, moment)
+
+    def _axial_force(self, end_actions, forces, distributed_loads) -> Diagram:
+        """
+        Axial Force Diagram along the member
+        """
+        terms = [(0, [-end_actions[0]])]
+        terms += [(force.position, [-force.components[0]]) for force in forces]
+        for distributed_load in distributed_loads:
+            terms += [(start, -coefficients) for start, coefficients in linear_load_terms(
+                distributed_load.position, distributed_load.length,
+                distributed_load.initial_magnitudes[0], distributed_load.final_magnitudes[0], 1)]
+        return Diagram.from_terms(self.length, terms)
+
+    def _torsion(self, end_actions, moments) -> Diagram:
+        """
+        Torsion Diagram along the member
+        """
+        terms = [(0, [-end_actions[3]])]
+        # The fixed-end actions take +m_x as the torsion jump (kernels.moment_fixed_end_actions)
+        terms += [(moment.position, [moment.components[0]]) for moment in moments]
+        return Diagram.from_terms(self.length, terms)
+
+    def _shear(self, end_actions, forces, distributed_loads) -> Tuple[Diagram, Diagram]:
+        """
+        Shear Diagrams along the member (XY and XZ planes)
+        """
+        terms_xy = [(0, [end_actions[1]])]
+        terms_xz = [(0, [end_actions[2]])]
+        for force in forces:
+            terms_xy.append((force.position, [force.components[1]]))
+            terms_xz.append((force.position, [force.components[2]]))
+        for distributed_load in distributed_loads:
+            for terms, axis in ((terms_xy, 1), (terms_xz, 2)):
+                terms += linear_load_terms(distributed_load.position, distributed_load.length,
+                        distributed_load.initial_magnitudes[axis], distributed_load.final_magnitudes[axis], 1)
+        return Diagram.from_terms(self.length, terms_xy), Diagram.from_terms(self.length, terms_xz)
+
+    def _bending(self, end_actions, forces, moments, distributed_loads) -> Tuple[Diagram, Diagram]:
+        """
+        Bending Moment Diagrams along the member (XY and XZ planes), the
+        derivative of bending_xy is shear_xy and the derivative of
+        bending_xz is -shear_xz
+
+        Notes
+        -----
+        bending_xz does not end at end_actions[10] for point moments with a
+        y component, the fixed-end shears of m_y (kernels.moment_fixed_end_actions)
+        take the sign of the ones of m_z, so no jump of the point moment closes
+        the diagram on both end actions
+        """
+        terms_xy = [(0, [-end_actions[5], end_actions[1]])]
+        terms_xz = [(0, [-end_actions[4], -end_actions[2]])]
+        for moment in moments:
+            terms_xy.append((moment.position, [-moment.components[2]]))
+            terms_xz.append((moment.position, [-moment.components[1]]))
+        for force in forces:
+            terms_xy.append((force.position, [0, force.components[1]]))
+            terms_xz.append((force.position, [0, -force.components[2]]))
+        for distributed_load in distributed_loads:
+            terms_xy += linear_load_terms(distributed_load.position, distributed_load.length,
+                    distributed_load.initial_magnitudes[1], distributed_load.final_magnitudes[1], 2)
+            terms_xz += [(start, -coefficients) for start, coefficients in linear_load_terms(
+                distributed_load.position, distributed_load.length,
+                distributed_load.initial_magnitudes[2], distributed_load.final_magnitudes[2], 2)]
+        return Diagram.from_terms(self.length, terms_xy), Diagram.from_terms(self.length, terms_xz)
 
     @property
+    def end_actions(self):
+        """
+        Member oriented end actions [force_left, moment_left, force_right, moment_right]
+        """
+        return np.array(self._end_action_values, dtype=float)
+
+    def _internal_diagrams(self, end_actions, forces=(), moments=(), distributed_loads=()):
+        """
+        Internal action diagrams for the given end actions and member loads
+        (the diagrams are linear in both)
+
+        Returns
+        -------
+        diagrams: Dict[str, Diagram]
+            axial_force, torsion, shear_xy, shear_xz, bending_xy and
+            bending_xz diagrams
+        """
+        shear_xy, shear_xz = self._shear(end_actions, forces, distributed_loads)
+        bending_xy, bending_xz = self._bending(end_actions, forces, moments, distributed_loads)
+        return {
+                'axial_force': self._axial_force(end_actions, forces, distributed_loads),
+                'torsion': self._torsion(end_actions, moments),
+                'shear_xy': shear_xy,
+                'shear_xz': shear_xz,
+                'bending_xy': bending_xy,
+                'bending_xz': bending_xz}
+
+    @memoized_result
+    def diagrams(self) -> Dict[str, Diagram]:
+        """
+        Exact internal action diagrams of the member (see Diagram), e.g:
+        member.diagrams['bending_xy'].absolute_maximum() or
+        member.diagrams['shear_xy'].roots()
+
+        The diagrams start at the near end actions and end at the far ones,
+        except bending_xz for point moments with a y component (see _bending)
+        """
+        return self._internal_diagrams(self.end_actions, self.forces, self.moments, self.distributed_loads)
+
+    @memoized_result
     def axial_force(self):
         """
         Axial Force Vector along the member
         """
-        initial_axial = -self.force_left.components[0]
-        final_axial = self.force_right.components[0]
-        axial_due_to_force = np.full_like(self.domain, initial_axial)
-        for force in self.forces:
-            temporary_axial_force = np.where(self.domain < force.position, 0, -force.components[0])
-            axial_due_to_force = axial_due_to_force + temporary_axial_force
-        for distributed_load in self.distributed_loads:
-            temporary_axial_force = np.where(self.domain < distributed_load.position, 0, np.where(self.domain < distributed_load.position + distributed_load.length, -((distributed_load.initial_magnitudes[0] + np.interp(self.domain, [distributed_load.position, distributed_load.position + distributed_load.length], [distributed_load.initial_magnitudes[0], distributed_load.final_magnitudes[0]]))/2*(self.domain - distributed_load.position)), -((distributed_load.initial_magnitudes[0] + distributed_load.final_magnitudes[0])/2*distributed_load.length)))
-            axial_due_to_force = axial_due_to_force + temporary_axial_force
-        axial_due_to_force[-1] = final_axial
-        return axial_due_to_force
+        return self._sample(self._axial_force(self.end_actions, self.forces, self.distributed_loads))
 
-    @property
+    @memoized_result
     def torsion(self):
         """
         Torsion along the member
         """
-        inital_torsion = -self.moment_left.components[0]
-        final_torsion = self.moment_right.components[0]
-        torsion_due_to_moment = np.full_like(self.domain, inital_torsion)
-        for moment in self.moments:
-            temporary_torsion = np.where(self.domain < moment.position, 0, -moment.components[0])
-            torsion_due_to_moment = torsion_due_to_moment + temporary_torsion
-        torsion_due_to_moment[-1] = final_torsion
-        return torsion_due_to_moment
+        return self._sample(self._torsion(self.end_actions, self.moments))
 
-    @property
+    @memoized_result
     def shear(self):
         """
         Shear along the member
         """
-        initial_shear_xy = self.force_left.components[1]
-        initial_shear_xz = self.force_left.components[2]
-        final_shear_xy = -self.force_right.components[1]
-        final_shear_xz = -self.force_right.components[2]
-        shear_xy = np.full_like(self.domain, initial_shear_xy)
-        shear_xz = np.full_like(self.domain, initial_shear_xz)
-        for force in self.forces:
-            temporary_shear_xy = np.where(self.domain < force.position, 0, force.components[1])
-            temporary_shear_xz = np.where(self.domain < force.position, 0, force.components[2])
-            shear_xy = shear_xy + temporary_shear_xy
-            shear_xz = shear_xz + temporary_shear_xz
-        for distributed_load in self.distributed_loads:
-            temporary_shear_xy = np.where(
-                    self.domain < distributed_load.position, 
-                    0, 
-                    np.where(
-                        self.domain < distributed_load.position + distributed_load.length,
-                        (distributed_load.initial_magnitudes[1] + np.interp(self.domain, [distributed_load.position, distributed_load.position], [distributed_load.initial_magnitudes[1], distributed_load.final_magnitudes[1]]))/2*(self.domain - distributed_load.position),
-                        (distributed_load.initial_magnitudes[1] + distributed_load.final_magnitudes[1])/2*distributed_load.length
-                        )
-                    )
-            temporary_shear_xz = np.where(
-                    self.domain < distributed_load.position, 
-                    0, 
-                    np.where(
-                        self.domain < distributed_load.position + distributed_load.length,
-                        (distributed_load.initial_magnitudes[2] + np.interp(self.domain, [distributed_load.position, distributed_load.position], [distributed_load.initial_magnitudes[2], distributed_load.final_magnitudes[2]]))/2*(self.domain - distributed_load.position),
-                        (distributed_load.initial_magnitudes[2] + distributed_load.final_magnitudes[2])/2*distributed_load.length
-                        )
-                    )
-            shear_xy = shear_xy + temporary_shear_xy
-            shear_xz = shear_xz + temporary_shear_xz
-        shear_xy[-1] = final_shear_xy
-        shear_xz[-1] = final_shear_xz
-        return shear_xy, shear_xz
+        shear_xy, shear_xz = self._shear(self.end_actions, self.forces, self.distributed_loads)
+        return self._sample(shear_xy), self._sample(shear_xz)
 
-    @property
+    @memoized_result
     def bending(self):
         """
         Bending Moment along the member
         """
-        initial_shear_xy = self.force_left.components[1]
-        initial_shear_xz = self.force_left.components[2]
-        initial_bending_xy = -self.moment_left.components[2]
-        initial_bending_xz = -self.moment_left.components[1]
-        final_bending_xy = self.moment_right.components[2]
-        final_bending_xz = self.moment_right.components[1]
-        bending_xy = np.full_like(self.domain, initial_bending_xy)
-        bending_xz = np.full_like(self.domain, initial_bending_xz)
-        bending_xy = bending_xy + self.domain*initial_shear_xy
-        bending_xz = bending_xz - self.domain*initial_shear_xz
-        for moment in self.moments:
-            temporary_bending_xy = np.where(self.domain < moment.position, 0, -moment.components[2])
-            temporary_bending_xz = np.where(self.domain < moment.position, 0, moment.components[1])
-            bending_xy = bending_xy + temporary_bending_xy
-            bending_xz = bending_xz - temporary_bending_xz
-        for force in self.forces:
-            temporary_bending_xy = np.where(self.domain < force.position, 0, force.components[1]*(self.domain - force.position))
-            temporary_bending_xz = -np.where(self.domain < force.position, 0, force.components[2]*(self.domain - force.position))
-            bending_xy = bending_xy + temporary_bending_xy
-            bending_xz = bending_xz + temporary_bending_xz
-        for distributed_load in self.distributed_loads:
-            temporary_bending_xz = np.where(
-                    self.domain < distributed_load.position, 
-                    0, 
-                    np.where(
-                        self.domain < distributed_load.position + distributed_load.length,
-                        -(distributed_load.initial_magnitudes[2]*(self.domain - distributed_load.position))*(self.domain - distributed_load.position)/2 - ((np.interp(self.domain, [distributed_load.position, distributed_load.position + distributed_load.length], [distributed_load.initial_magnitudes[2], distributed_load.final_magnitudes[2]]) - distributed_load.initial_magnitudes[2])*(self.domain - distributed_load.position))/2*((self.domain - distributed_load.position)/3),
-                        (distributed_load.initial_magnitudes[2]*(distributed_load.length))*(self.domain - (2*distributed_load.position + distributed_load.length)/2) + ((distributed_load.final_magnitudes[2] - distributed_load.initial_magnitudes[2])*(distributed_load.length))*(self.domain - (distributed_load.position + 2*(distributed_load.length)/3))
-                        )
-                    )
-            temporary_bending_xy = np.where(
-                    self.domain < distributed_load.position, 
-                    0, 
-                    np.where(
-                        self.domain < distributed_load.position + distributed_load.length,
-                        (distributed_load.initial_magnitudes[1]*(self.domain - distributed_load.position))*(self.domain - distributed_load.position)/2 + ((np.interp(self.domain, [distributed_load.position, distributed_load.position + distributed_load.length], [distributed_load.initial_magnitudes[1], distributed_load.final_magnitudes[1]]) - distributed_load.initial_magnitudes[1])*(self.domain - distributed_load.position))/2*((self.domain - distributed_load.position)/3),
-                        -(distributed_load.initial_magnitudes[1]*(distributed_load.length))*(self.domain - (2*distributed_load.position + distributed_load.length)/2) - ((distributed_load.final_magnitudes[1] - distributed_load.initial_magnitudes[1])*(distributed_load.length))*(self.domain - (distributed_load.position + 2*(distributed_load.length)/3))
-                        )
-                    )
-            bending_xy = bending_xy + temporary_bending_xy
-            bending_xz = bending_xz + temporary_bending_xz
-        bending_xy[-1] = final_bending_xy
-        bending_xz[-1] = final_bending_xz
-        return bending_xy, bending_xz
+        bending_xy, bending_xz = self._bending(self.end_actions, self.forces, self.moments, self.distributed_loads)
+        return self._sample(bending_xy), self._sample(bending_xz)
 
-    @property
+    @memoized_result
     def local_nodal_displacements(self):
         """
         Local Displacements for the nodes of the member
@@ -417,77 +638,68 @@ class Member:
         local_nodal_displacements[np.concatenate((~np.array(self.node_1_release), ~np.array(self.node_2_release))).tolist()] = slice_local_nodal_displacements
         return local_nodal_displacements
         
-    @property
+    @memoized_result
+    def deformation_diagrams(self) -> Dict[str, Diagram]:
+        """
+        Exact deformations of the member in member coordinates, integrated
+        once from the internal action diagrams
+
+        The rotation of a released left end is not a node displacement, it
+        is taken from the deflection of the right end
+
+        Returns
+        -------
+        diagrams: Dict[str, Diagram]
+            axial_deformation, slope_xy (rotation z), slope_xz (rotation y),
+            deflection_xy and deflection_xz diagrams
+        """
+        displacements = self.local_nodal_displacements
+        releases = tuple(self.node_1_release) + tuple(self.node_2_release)
+        diagrams = self.diagrams
+        e = self.section.material.E
+        axial_deformation = (diagrams['axial_force']/(e*self.section.A)).antiderivative(displacements[0])
+        # v' = rotation z, w' = -rotation y
+        slope_xy = (diagrams['bending_xy']/(e*self.section.Ix)).antiderivative()
+        slope_xz = (diagrams['bending_xz']/(e*self.section.Iy)).antiderivative()
+        if releases[5]:
+            initial_slope_xy = (displacements[7] - displacements[1] - slope_xy.integral())/self.length
+        else:
+            initial_slope_xy = displacements[5]
+        if releases[4]:
+            initial_slope_xz = (displacements[2] - displacements[8] - slope_xz.integral())/self.length
+        else:
+            initial_slope_xz = displacements[4]
+        slope_xy = slope_xy + initial_slope_xy
+        slope_xz = slope_xz + initial_slope_xz
+        return {
+                'axial_deformation': axial_deformation,
+                'slope_xy': slope_xy,
+                'slope_xz': slope_xz,
+                'deflection_xy': slope_xy.antiderivative(displacements[1]),
+                'deflection_xz': (-slope_xz).antiderivative(displacements[2])}
+
+    @memoized_result
     def slope(self):
-        local_node_1_displacements = self.local_nodal_displacements[:6]
-        local_node_2_displacements = self.local_nodal_displacements[6:]
-        initial_slope_xy = local_node_1_displacements[5]
-        initial_slope_xz = local_node_1_displacements[4]
-        final_slope_xy = local_node_2_displacements[5]
-        final_slope_xz = local_node_2_displacements[4]
-        slope_xy = []
-        slope_xz = []
-        bending_xy, bending_xz = self.bending
-        for i, _ in enumerate(self.domain):
-            slope_in_a_point_xy = np.trapz(bending_xy[:i], self.domain[:i]) + initial_slope_xy*self.section.material.E*self.section.Ix
-            slope_in_a_point_xz = np.trapz(bending_xz[:i], self.domain[:i]) + initial_slope_xy*self.section.material.E*self.section.Iy
-            slope_xy.append(slope_in_a_point_xy)
-            slope_xz.append(slope_in_a_point_xz)
-        slope_xy[-1] = final_slope_xy*self.section.material.E*self.section.Ix
-        slope_xz[-1] = final_slope_xz*self.section.material.E*self.section.Iy
-        return np.array(slope_xy)/self.section.material.E/self.section.Ix, np.array(slope_xz)/self.section.material.E/self.section.Iy
+        diagrams = self.deformation_diagrams
+        return self._sample(diagrams['slope_xy']), self._sample(diagrams['slope_xz'])
 
-    @property
+    @memoized_result
     def deflection(self):
-        local_node_1_displacements = self.local_nodal_displacements[:6]
-        local_node_2_displacements = self.local_nodal_displacements[6:]
-        initial_deflection_xy = local_node_1_displacements[1]
-        initial_deflection_xz = local_node_1_displacements[2]
-        final_deflection_xy = local_node_2_displacements[1]
-        final_deflection_xz = local_node_2_displacements[2]
-        deflection_xy = []
-        deflection_xz = []
-        slope_xy, slope_xz = self.slope
-        for i, _ in enumerate(self.domain):
-            deflection_in_a_point_xy = np.trapz(slope_xy[:i], self.domain[:i]) + initial_deflection_xy
-            deflection_in_a_point_xz = np.trapz(slope_xz[:i], self.domain[:i]) + initial_deflection_xy
-            deflection_xy.append(deflection_in_a_point_xy)
-            deflection_xz.append(deflection_in_a_point_xz)
-        deflection_xy[-1] = final_deflection_xy
-        deflection_xz[-1] = final_deflection_xz
-        return np.array(deflection_xy), np.array(deflection_xz)
-        
-    @property
+        diagrams = self.deformation_diagrams
+        return self._sample(diagrams['deflection_xy']), self._sample(diagrams['deflection_xz'])
+
+    @memoized_result
     def axial_deformation(self):
-        local_node_1_displacements = self.local_nodal_displacements[:6]
-        local_node_2_displacements = self.local_nodal_displacements[6:]
-        initial_deformation = local_node_1_displacements[0]
-        final_deformation = local_node_2_displacements[0]
-        deformation = []
-        for i, _ in enumerate(self.domain):
-            deformation_at_a_point = np.trapz(self.axial_force[:i], self.domain[:i]) + initial_deformation*self.section.A*self.section.material.E
-            deformation.append(deformation_at_a_point)
-        deformation[-1] = final_deformation*self.section.A*self.section.material.E
-        return np.array(deformation)/self.section.A/self.section.material.E
+        return self._sample(self.deformation_diagrams['axial_deformation'])
 
-    @property
+    @memoized_result
     def stacked_deformation(self):
         """
         Mix all the deformations of the member in one array and transform it to global coordinates
         """
-        deflection_xy, deflection_xz = self.deflection
-        axial_deformation = self.axial_deformation
-        local_stacked_deflections = np.stack((axial_deformation, deflection_xy, deflection_xz))
-        effective_angle = np.array(self.angle) 
-        cosine_directors = np.cos(effective_angle)
-        c_xz = np.sqrt(cosine_directors[0]**2 + cosine_directors[2]**2)
-        if effective_angle[1] == 0 or effective_angle[1] == abs(np.pi):
-            rotation_matrix = np.array([[0, cosine_directors[1], 0], [-cosine_directors[1], 0, 0], [0, 0, 1]])
-        else:
-            rotation_matrix = np.array([[*cosine_directors], [-cosine_directors[1]*cosine_directors[0]/c_xz, c_xz, -cosine_directors[1]*cosine_directors[2]/c_xz], [-cosine_directors[2]/c_xz, 0, cosine_directors[0]/c_xz]])
-        global_stacked_deflections = np.zeros_like(local_stacked_deflections)
-        global_stacked_deflections = np.apply_along_axis(
-                lambda x: x @ rotation_matrix,
-                0,
-                local_stacked_deflections)
-        return global_stacked_deflections
+        diagrams = self.deformation_diagrams
+        domain = self.domain
+        local_stacked_deflections = np.stack([diagrams[name].evaluate(domain)
+            for name in ('axial_deformation', 'deflection_xy', 'deflection_xz')])
+        rotation_matrix = direction_cosine_matrices(self.angle)[0]
+        return (rotation_matrix.T @ local_stacked_deflections).astype(self.result_dtype, copy=False)
@@ -0,0 +1,188 @@
+"""
+This module defines MemberLoadTable class
+
+A MemberLoadTable stores the member loads (forces, moments and distributed
+forces) of many members as arrays, one row per load with the row of its
+member, so the equivalent joint loads of every load are computed with the
+vectorized expressions of kernels and a single release condensation per
+member, instead of one Action.compute_equivalent_joint_loads call per load.
+
+Notes
+-----
+The fixed-end actions are linear in the loads, so they are summed by member
+before the condensation. The moment components of the equivalent joint
+loads of point moments have the opposite sign convention (see
+Moment.compute_equivalent_joint_loads), so point moments are condensed
+apart.
+"""
+import numpy as np
+from typing import Dict, List, Tuple
+from .kernels import condensation_operators, force_fixed_end_actions, \
+        moment_fixed_end_actions, distributed_fixed_end_actions
+
+
+# Sign of the released point moment actions in the equivalent joint loads
+_MOMENT_SIGNS = np.array([-1, -1, -1, 1, 1, 1, -1, -1, -1, 1, 1, 1])
+
+
+class MemberLoadTable:
+    """
+    Array backed table of member loads
+
+    Attributes
+    ----------
+    number_of_members: int
+        Number of rows of the member arrays
+    force_members, force_positions, force_components: np.ndarray
+        Member row, position and member oriented components of each point
+        force, shapes (forces,), (forces,) and (forces, 3)
+    moment_members, moment_positions, moment_components: np.ndarray
+        Same for the point moments
+    distributed_members, distributed_positions, distributed_lengths: np.ndarray
+        Member row, start and length of each distributed force
+    distributed_initial, distributed_final: np.ndarray
+        Magnitudes at the start and at the end of each distributed force,
+        shape (distributed forces, 3)
+    """
+    def __init__(self, number_of_members: int):
+        self.number_of_members = number_of_members
+        self.force_members = np.empty(0, dtype=int)
+        self.force_positions = np.empty(0)
+        self.force_components = np.empty((0, 3))
+        self.moment_members = np.empty(0, dtype=int)
+        self.moment_positions = np.empty(0)
+        self.moment_components = np.empty((0, 3))
+        self.distributed_members = np.empty(0, dtype=int)
+        self.distributed_positions = np.empty(0)
+        self.distributed_lengths = np.empty(0)
+        self.distributed_initial = np.empty((0, 3))
+        self.distributed_final = np.empty((0, 3))
+
+    @classmethod
+    def from_member_loads(cls, number_of_members: int,
+            member_loads: Dict[int, Tuple[List, List, List]]):
+        """
+        Table of the Force, Moment and DistributedForce objects placed in the
+        members
+
+        Parameters
+        ----------
+        number_of_members: int
+            Number of members
+        member_loads: dict
+            (forces, moments, distributed_loads) by member row
+        """
+        table = cls(number_of_members)
+        forces = [(row, force) for row, (loads, _, _) in member_loads.items() for force in loads]
+        moments = [(row, moment) for row, (_, loads, _) in member_loads.items() for moment in loads]
+        distributed = [(row, load) for row, (_, _, loads) in member_loads.items() for load in loads]
+        if forces:
+            table.add_forces(*zip(*((row, force.position, force.components) for row, force in forces)))
+        if moments:
+            table.add_moments(*zip(*((row, moment.position, moment.components) for row, moment in moments)))
+        if distributed:
+            table.add_distributed_forces(*zip(*((row, load.position, load.length,
+                load.initial_magnitudes, load.final_magnitudes) for row, load in distributed)))
+        return table
+
+    @classmethod
+    def from_members(cls, members: List):
+        """
+        Table of the loads of the members (forces, moments and
+        distributed_loads of each member)
+        """
+        return cls.from_member_loads(len(members), {row: (member.forces, member.moments,
+            member.distributed_loads) for row, member in enumerate(members)})
+
+    def add_forces(self, members, positions, components):
+        """
+        Append point forces
+
+        Parameters
+        ----------
+        members: np.ndarray
+            Member row of each force, shape (forces,)
+        positions: np.ndarray
+            Distance from the left node, shape (forces,)
+        components: np.ndarray
+            Member oriented components, shape (forces, 3)
+        """
+        self.force_members = np.concatenate((self.force_members, np.asarray(members, dtype=int)))
+        self.force_positions = np.concatenate((self.force_positions, np.asarray(positions, dtype=float)))
+        self.force_components = np.concatenate((self.force_components,
+            np.asarray(components, dtype=float).reshape(-1, 3)))
+
+    def add_moments(self, members, positions, components):
+        """
+        Append point moments, see add_forces
+        """
+        self.moment_members = np.concatenate((self.moment_members, np.asarray(members, dtype=int)))
+        self.moment_positions = np.concatenate((self.moment_positions, np.asarray(positions, dtype=float)))
+        self.moment_components = np.concatenate((self.moment_components,
+            np.asarray(components, dtype=float).reshape(-1, 3)))
+
+    def add_distributed_forces(self, members, positions, lengths, initial, final):
+        """
+        Append linearly varying distributed forces
+
+        Parameters
+        ----------
+        members: np.ndarray
+            Member row of each load, shape (loads,)
+        positions: np.ndarray
+            Distance from the left node to the start of the load
+        lengths: np.ndarray
+            Length of the loads
+        initial, final: np.ndarray
+            Member oriented magnitudes at the start and at the end of the
+            loads, shape (loads, 3)
+        """
+        self.distributed_members = np.concatenate((self.distributed_members, np.asarray(members, dtype=int)))
+        self.distributed_positions = np.concatenate((self.distributed_positions, np.asarray(positions, dtype=float)))
+        self.distributed_lengths = np.concatenate((self.distributed_lengths, np.asarray(lengths, dtype=float)))
+        self.distributed_initial = np.concatenate((self.distributed_initial,
+            np.asarray(initial, dtype=float).reshape(-1, 3)))
+        self.distributed_final = np.concatenate((self.distributed_final,
+            np.asarray(final, dtype=float).reshape(-1, 3)))
+
+    def __len__(self):
+        return len(self.force_members) + len(self.moment_members) + len(self.distributed_members)
+
+    def _sum_by_member(self, members: np.ndarray, actions: np.ndarray) -> np.ndarray:
+        summed = np.zeros((self.number_of_members, 12))
+        np.add.at(summed, members, actions)
+        return summed
+
+    def equivalent_joint_loads(self, lengths, releases) -> np.ndarray:
+        """
+        Member oriented equivalent joint loads of every member
+
+        Parameters
+        ----------
+        lengths: np.ndarray
+            Length of each member, shape (members,)
+        releases: np.ndarray
+            True if the degree of the member is released, shape (members, 12)
+
+        Returns
+        -------
+        equivalent_joint_loads: np.ndarray
+            [force_1, moment_1, force_2, moment_2] of each member, zero at the
+            released degrees, shape (members, 12)
+        """
+        lengths = np.asarray(lengths, dtype=float).reshape(-1)
+        forces = self._sum_by_member(self.force_members, force_fixed_end_actions(
+            self.force_positions, lengths[self.force_members], self.force_components))
+        forces += self._sum_by_member(self.distributed_members, distributed_fixed_end_actions(
+            self.distributed_positions, self.distributed_lengths,
+            lengths[self.distributed_members], self.distributed_initial, self.distributed_final))
+        moments = self._sum_by_member(self.moment_members, moment_fixed_end_actions(
+            self.moment_positions, lengths[self.moment_members], self.moment_components))
+        # Only the loaded members are condensed
+        loaded = np.flatnonzero(forces.any(axis=1) | moments.any(axis=1))
+        equivalent_joint_loads = np.zeros((self.number_of_members, 12))
+        if len(loaded):
+            operators = condensation_operators(np.asarray(releases, dtype=bool).reshape(-1, 12)[loaded], lengths[loaded])
+            equivalent_joint_loads[loaded] = -np.einsum('mji,mj->mi', operators, forces[loaded]) \
+                    + _MOMENT_SIGNS*np.einsum('mji,mj->mi', operators, moments[loaded])
+        return equivalent_joint_loads
@@ -0,0 +1,176 @@
+"""
+This module defines ModelArrays class
+
+ModelArrays stores a whole model as arrays (one row per node and one row
+per member) instead of Node and Member objects, it is the storage of the
+structures built with Structure.from_arrays: the numbering, the assembly and
+the solve read the arrays directly and the Node and Member objects are only
+created when they are requested (see Structure.nodes and Structure.members).
+
+Notes
+-----
+The node rows are sorted by node number, the connectivity refers to the
+rows of the coordinates given to the constructor and it is renumbered with
+them, every node must be connected to a member. A node degree is released when every member at the node releases it
+(same as the releases set by Member).
+"""
+import numpy as np
+from typing import List
+from .dof_plan import DofPlan
+from .kernels import node_rotation_matrices
+from .member_loads import MemberLoadTable
+from .section import Section
+
+
+def _rows(values, rows: int, columns: int, dtype) -> np.ndarray:
+    """
+    Array of shape (rows, columns), zeros if values is None
+    """
+    if values is None:
+        return np.zeros((rows, columns), dtype=dtype)
+    return np.asarray(values, dtype=dtype).reshape(rows, columns)
+
+
+class ModelArrays:
+    """
+    Struct of arrays storage of a model
+
+    Attributes
+    ----------
+    node_numbers: np.ndarray
+        Number of each node, sorted, shape (nodes,)
+    coordinates: np.ndarray
+        Coordinates of each node, shape (nodes, 3)
+    node_angles: np.ndarray
+        Rotation vector of each node (see Node.angle), shape (nodes, 3)
+    restrains: np.ndarray
+        Restrained degrees of each node, shape (nodes, 6)
+    elastic_constants: np.ndarray
+        Elastic constants of each node, shape (nodes, 6)
+    node_actions: np.ndarray
+        Structure oriented [forces, moments] applied at each node, shape
+        (nodes, 6)
+    connectivity: np.ndarray
+        Rows of the left and right node of each member, shape (members, 2)
+    sections: list
+        Sections of the model
+    section_ids: np.ndarray
+        Index in sections of the section of each member, shape (members,)
+    release_masks: np.ndarray
+        Releases of each member [node_1 (6), node_2 (6)], shape (members, 12)
+    member_loads: MemberLoadTable
+        Member loads, the rows are the member rows
+    """
+    def __init__(self,
+            coordinates,
+            connectivity,
+            sections: List[Section],
+            section_ids=None,
+            release_masks=None,
+            restraints=None,
+            node_numbers=None,
+            node_angles=None,
+            elastic_constants=None,
+            node_actions=None,
+            member_loads: MemberLoadTable=None):
+        coordinates = np.asarray(coordinates, dtype=float)
+        coordinates = coordinates.reshape(len(coordinates), -1)
+        number_of_nodes = len(coordinates)
+        if node_numbers is None:
+            node_numbers = np.arange(1, number_of_nodes + 1)
+        node_numbers = np.asarray(node_numbers).reshape(number_of_nodes)
+        order = np.argsort(node_numbers, kind='stable')
+        rows = np.empty(number_of_nodes, dtype=int)
+        rows[order] = np.arange(number_of_nodes)
+        self.node_numbers = node_numbers[order]
+        # Coordinates of 1D and 2D models are completed with zeros
+        self.coordinates = np.zeros((number_of_nodes, 3))
+        self.coordinates[:, :coordinates.shape[1]] = coordinates
+        self.coordinates = self.coordinates[order]
+        self.node_angles = _rows(node_angles, number_of_nodes, 3, float)[order]
+        self.restrains = _rows(restraints, number_of_nodes, 6, bool)[order]
+        self.elastic_constants = _rows(elastic_constants, number_of_nodes, 6, float)[order]
+        self.node_actions = _rows(node_actions, number_of_nodes, 6, float)[order]
+        connectivity = np.asarray(connectivity, dtype=int).reshape(-1, 2)
+        if ((connectivity < 0) | (connectivity >= number_of_nodes)).any():
+            raise ValueError(f'The connectivity refers to node rows out of range [0, {number_of_nodes})')
+        # Every node needs a member, the free degrees of a node without
+        # members would make the stiffness matrix singular
+        unconnected = np.setdiff1d(np.arange(number_of_nodes), connectivity)
+        if len(unconnected):
+            raise ValueError(f'The nodes of rows {unconnected.tolist()} are not connected to any member')
+        self.connectivity = rows[connectivity]
+        number_of_members = len(self.connectivity)
+        self.sections = list(sections)
+        if section_ids is None:
+            section_ids = np.zeros(number_of_members, dtype=int)
+        self.section_ids = np.asarray(section_ids, dtype=int).reshape(number_of_members)
+        if ((self.section_ids < 0) | (self.section_ids >= len(self.sections))).any():
+            raise ValueError(f'The section ids must be in range [0, {len(self.sections)})')
+        self.release_masks = _rows(release_masks, number_of_members, 12, bool)
+        self.member_loads = MemberLoadTable(number_of_members) if member_loads is None else member_loads
+
+    @property
+    def number_of_nodes(self) -> int:
+        return len(self.node_numbers)
+
+    @property
+    def number_of_members(self) -> int:
+        return len(self.connectivity)
+
+    @property
+    def node_releases(self) -> np.ndarray:
+        """
+        Released degrees of each node, a degree is released when every member
+        at the node releases it, shape (nodes, 6)
+        """
+        # Every node is connected (see __init__)
+        releases = np.ones((self.number_of_nodes, 6), dtype=bool)
+        np.logical_and.at(releases, self.connectivity[:, 0], self.release_masks[:, :6])
+        np.logical_and.at(releases, self.connectivity[:, 1], self.release_masks[:, 6:])
+        return releases
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """
+        Vector from the left to the right node of each member, shape (members, 3)
+        """
+        return self.coordinates[self.connectivity[:, 1]] - self.coordinates[self.connectivity[:, 0]]
+
+    @property
+    def lengths(self) -> np.ndarray:
+        return np.linalg.norm(self.vectors, axis=1)
+
+    @property
+    def angles(self) -> np.ndarray:
+        """
+        Direction angles of each member (see Member.angle), shape (members, 3)
+        """
+        return np.arccos(self.vectors/self.lengths[:, np.newaxis])
+
+    def member_properties(self):
+        """
+        Section and length arrays of the members (see kernels.member_properties)
+        """
+        section_properties = np.array([(
+            section.material.E,
+            section.material.G,
+            section.A,
+            section.Ix,
+            section.Iy,
+            section.J) for section in self.sections], dtype=float).reshape(-1, 6)
+        return tuple(section_properties[self.section_ids].T) + (self.lengths,)
+
+    def node_rotations(self):
+        """
+        Rotation matrices at the left and right node of each member (see
+        member.member_node_rotations)
+        """
+        angles = self.angles
+        return (node_rotation_matrices(angles, self.node_angles[self.connectivity[:, 0]]),
+                node_rotation_matrices(angles, self.node_angles[self.connectivity[:, 1]]))
+
+    def plan(self, ordering: str=None) -> DofPlan:
+        return DofPlan.from_arrays(self.node_releases, self.restrains,
+                self.elastic_constants, self.connectivity, self.release_masks, ordering,
+                self.node_numbers.tolist())
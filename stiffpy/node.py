@@ -1,26 +1,44 @@
+import itertools
 import numpy as np
 from typing import Tuple
 from .action.actions import Force, Moment
-from scipy.spatial.transform import Rotation as R
+from .tracking import Tracked
+from .kernels import node_rotation_matrices
 
+# Creation order of the nodes, the nodes without id are numbered in it (see
+# NodeRegistry)
+_serial_numbers = itertools.count()
+
+
+class Node(Tracked):
+    __slots__ = ('no', 'dimension', 'r', 'angle', 'release', '_displacements', '_force',
+            '_moment', '_actions', '_restrains', '_elastic_constants', 'default', '_numbered',
+            '_serial_number')
+    # Attributes that change the numbering of the degrees of freedom
+    _numbering_attributes = frozenset(('release', '_restrains', '_elastic_constants'))
+    # Attributes that change the geometry of the members (rotation matrices)
+    _geometry_attributes = frozenset(('r', 'angle'))
+    _tracked_attributes = _numbering_attributes | _geometry_attributes
 
-class Node: 
-    no = 1
     def __init__(self,
             r:Tuple[float,float,float],
             angle:Tuple[float,float,float]=(0, 0, 0),
             no=None):
         """
         Define the node number and the position list
-            * no: Node number e.g: 1, 2, 3, ...
+            * no: Node id e.g: 1, 2, 3, ... (any hashable), the nodes without
+              id are numbered by the structure (see NodeRegistry)
             * r: Position list e.g: [1, 2, 3]
             * angle: Rotation Angle radians
             - release: grades with releases, initial state is not released in any degree
             - restrains: Which degrees are restrained
             - default: if the releases are the default ones
         """
-        self.no = Node.no if no == None else no
-        Node.no += 1
+        self.no = no
+        # Nodes created with the same id are equal, the others are equal
+        # only to themselves
+        self._numbered = no is not None
+        self._serial_number = next(_serial_numbers)
         self.dimension = len(r)
         self.r = np.array(r)
         self.angle = np.array(angle)
@@ -35,12 +53,14 @@ class Node:
 
     def __eq__(self, other):
         if isinstance(other, Node):
-            return self.no == other.no
+            if self._numbered and other._numbered:
+                return self.no == other.no
+            return self is other
         else:
             return False
 
     def __hash__(self):
-        return hash(self.no)
+        return hash(self.no) if self._numbered else object.__hash__(self)
 
     @property
     def r_f(self):
@@ -116,22 +136,4 @@ class Node:
         Rotation matrix for the node
             angle: Array of Cosine angles of the member (radians)
         """
-        effective_angle = np.array(angle)
-        cosine_directors = np.cos(effective_angle)
-        c_xz = np.sqrt(cosine_directors[0]**2 + cosine_directors[2]**2)
-        if effective_angle[1] == 0 or effective_angle[1] == abs(np.pi):
-            rotation_matrix = np.array([
-                [0, cosine_directors[1], 0],
-                [-cosine_directors[1], 0, 0],
-                [0, 0, 1]
-                ])
-        else:
-            rotation_matrix = np.array([
-                [*cosine_directors],
-                [-cosine_directors[1]*cosine_directors[0]/c_xz, c_xz, -cosine_directors[1]*cosine_directors[2]/c_xz],
-                [-cosine_directors[2]/c_xz, 0, cosine_directors[0]/c_xz]
-                ])
-        r_member_angle = R.from_matrix(rotation_matrix)
-        r_node_angle = R.from_rotvec(self.angle)
-        rotation_matrix =  r_member_angle * r_node_angle
-        return rotation_matrix.as_matrix()
+        return node_rotation_matrices(angle, self.angle)[0]
@@ -0,0 +1,101 @@
+"""
+This module defines NodeRegistry class
+
+A NodeRegistry keeps the nodes of a structure and maps the id of each node
+(Node.no, any hashable e.g: 1, 'A1', ('grid', 3)) to a compact row 0, 1, ...
+through a dictionary, the row of the node in the node arrays of the plan
+(see DofPlan) and of the results (see AnalysisResult).
+
+The ids are scoped to the structure: the nodes created without id (Node.no
+is None) get a number of the registry, after the largest integer id of the
+structure and in the order the nodes were created. The numbers are kept by
+the registry only, the Node objects are not modified, so a node shared by
+several structures can have a different number in each one and the
+registries can be built in parallel threads.
+
+The rows follow the order of the ids when they can be sorted (e.g: all
+integers or all strings), otherwise the order of the nodes given.
+
+Notes
+-----
+A node appears once in the registry however many members share it, two
+different Node objects with the same id raise a ValueError (one of them
+would be dropped from the model).
+"""
+import numbers
+from typing import Dict, Hashable, Iterable, Tuple
+
+
+class NodeRegistry:
+    """
+    Nodes of a structure by id, immutable
+
+    Attributes
+    ----------
+    nodes: tuple
+        Nodes in row order
+    ids: tuple
+        Id of each node, Node.no or the number given by the registry
+    rows: Dict[Hashable, int]
+        Row of each id
+    """
+    def __init__(self, nodes: Iterable=()):
+        nodes = list(nodes)
+        by_id: Dict[Hashable, object] = {}
+        for node in nodes:
+            if node.no is not None:
+                other = by_id.setdefault(node.no, node)
+                # Identity, two nodes with the same id are equal (see Node.__eq__)
+                if other is not node:
+                    raise ValueError(f'Two different nodes have the id {node.no!r}')
+        unnumbered = {id(node): node for node in nodes if node.no is None}
+        number = 1 + max((no for no in by_id if _is_integer(no)), default=0)
+        for node in sorted(unnumbered.values(), key=lambda node: node._serial_number):
+            by_id[number] = node
+            number += 1
+        ids = list(by_id)
+        try:
+            ids.sort()
+        except TypeError:
+            # Ids of different types, the order of the nodes given is kept
+            pass
+        self.ids: Tuple = tuple(ids)
+        self.nodes: Tuple = tuple(by_id[no] for no in ids)
+        self.rows: Dict[Hashable, int] = {no: row for row, no in enumerate(ids)}
+        # Row of each node (the nodes without id are hashed by identity)
+        self._node_rows = {node: row for row, node in enumerate(self.nodes)}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, no) -> bool:
+        return no in self.rows
+
+    def __iter__(self):
+        return iter(self.nodes)
+
+    def row(self, no) -> int:
+        """
+        Row of the node with id no
+        """
+        if no not in self.rows:
+            raise KeyError(f'No node with id {no!r}')
+        return self.rows[no]
+
+    def node(self, no):
+        """
+        Node with id no
+        """
+        return self.nodes[self.row(no)]
+
+    def node_id(self, node) -> Hashable:
+        """
+        Id of the node in this registry
+        """
+        if node not in self._node_rows:
+            raise KeyError(f'{node} is not in the registry')
+        return self.ids[self._node_rows[node]]
+
+
+def _is_integer(no) -> bool:
+    return isinstance(no, numbers.Integral) and not isinstance(no, bool)
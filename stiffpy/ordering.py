@@ -0,0 +1,97 @@
+"""
+This module defines the fill reducing orderings of the nodes used by DofPlan
+
+An ordering permutes the nodes of the structure, the degrees of freedom are
+numbered node by node in that order (the free degrees first and the
+restrained degrees last, as without ordering), so the factorization of the
+free degrees block has less fill in and the banded solvers a smaller band.
+The orderings work on the node graph (two nodes are adjacent if a member
+joins them), it is 6 times smaller than the graph of the degrees.
+
+Orderings
+---------
+rcm: reverse Cuthill-McKee (scipy.sparse.csgraph), reduces the bandwidth
+    and the profile
+amd: minimum degree of the node graph, reduces the fill in of the sparse
+    factorizations, it is an approximation of the minimum degree of the
+    degrees of freedom graph (the degrees of a node are eliminated together)
+"""
+import heapq
+import numpy as np
+
+
+def node_graph(number_of_nodes: int, member_nodes: np.ndarray):
+    """
+    Adjacency matrix of the nodes (scipy.sparse.csr_matrix, symmetric)
+
+    Parameters
+    ----------
+    member_nodes: np.ndarray
+        Rows of the left and right node of each member, shape (members, 2)
+    """
+    import scipy.sparse as sp
+    rows = np.concatenate((member_nodes[:, 0], member_nodes[:, 1]))
+    columns = np.concatenate((member_nodes[:, 1], member_nodes[:, 0]))
+    graph = sp.csr_matrix((np.ones(len(rows)), (rows, columns)), shape=(number_of_nodes, number_of_nodes))
+    graph.sum_duplicates()
+    return graph
+
+
+def reverse_cuthill_mckee(number_of_nodes: int, member_nodes: np.ndarray) -> np.ndarray:
+    """
+    Nodes in reverse Cuthill-McKee order
+    """
+    from scipy.sparse.csgraph import reverse_cuthill_mckee as rcm
+    return rcm(node_graph(number_of_nodes, member_nodes), symmetric_mode=True).astype(int)
+
+
+def minimum_degree(number_of_nodes: int, member_nodes: np.ndarray) -> np.ndarray:
+    """
+    Nodes in minimum degree order, the node of least degree of the
+    elimination graph is eliminated first (ties by row) and its neighbours
+    are joined
+    """
+    graph = node_graph(number_of_nodes, member_nodes)
+    adjacency = [set(graph.indices[graph.indptr[i]:graph.indptr[i + 1]]) - {i}
+            for i in range(number_of_nodes)]
+    heap = [(len(neighbours), node) for node, neighbours in enumerate(adjacency)]
+    heapq.heapify(heap)
+    eliminated = np.zeros(number_of_nodes, dtype=bool)
+    order = []
+    while heap:
+        degree, node = heapq.heappop(heap)
+        # Entries of the nodes eliminated or whose degree changed are stale
+        if eliminated[node] or degree != len(adjacency[node]):
+            continue
+        eliminated[node] = True
+        order.append(node)
+        neighbours = adjacency[node]
+        for neighbour in neighbours:
+            adjacency[neighbour].discard(node)
+            adjacency[neighbour].update(neighbours)
+            adjacency[neighbour].discard(neighbour)
+            heapq.heappush(heap, (len(adjacency[neighbour]), neighbour))
+        adjacency[node] = set()
+    return np.array(order, dtype=int)
+
+
+ORDERINGS = {
+        'rcm': reverse_cuthill_mckee,
+        'amd': minimum_degree}
+
+
+def node_ranks(ordering: str, number_of_nodes: int, member_nodes: np.ndarray) -> np.ndarray:
+    """
+    Position of each node in the ordering, shape (nodes,)
+
+    Parameters
+    ----------
+    ordering: str
+        Name of the ordering (see ORDERINGS)
+    """
+    if ordering not in ORDERINGS:
+        raise ValueError(f'Unknown ordering {ordering}, use one of {tuple(ORDERINGS)}')
+    order = ORDERINGS[ordering](number_of_nodes, member_nodes)
+    ranks = np.empty(number_of_nodes, dtype=int)
+    ranks[order] = np.arange(number_of_nodes)
+    return ranks
@@ -4,8 +4,10 @@ from stiffpy.node import Node
 
 
 class PlotterNode:
-    def __init__(self, node: Node) -> None:
+    def __init__(self, node: Node, no=None) -> None:
         self.node = node
+        # Label of the node, its id in the structure (see NodeRegistry)
+        self.no = node.no if no is None else no
 
     def draw_node(self, axs: plt.Axes):
         """
@@ -15,7 +17,7 @@ class PlotterNode:
         axs.scatter(self.node.r[0], self.node.r[1])
         # Draw Node Label
         axs.annotate(
-                text=self.node.no,
+                text=self.no,
                 xy=(self.node.r[0], self.node.r[1]))
 
     def draw_final_node(self, axs: plt.Axes):
@@ -26,5 +28,5 @@ class PlotterNode:
         axs.scatter(self.node.r_f[0], self.node.r_f[1])
         # Draw Node Label
         axs.annotate(
-                text=self.node.no,
+                text=self.no,
                 xy=(self.node.r_f[0], self.node.r_f[1]))
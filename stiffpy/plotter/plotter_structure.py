@@ -12,8 +12,9 @@ class PlotterStructure:
         self.structure = structure
         # Create Plotter Node Objects
         self.nodes: List[PlotterNode] = []
-        for node in self.structure.nodes:
-            self.nodes.append(PlotterNode(node))
+        registry = self.structure.node_registry
+        for node, no in zip(registry.nodes, registry.ids):
+            self.nodes.append(PlotterNode(node, no))
         # Create Plotter Member Objects
         self.members: List[PlotterMember] = []
         for member in self.structure.members:
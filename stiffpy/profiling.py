@@ -0,0 +1,238 @@
+"""
+This module defines Profiler class
+
+A Profiler records the wall time (and optionally the memory allocated, with
+tracemalloc) of the phases of the analysis (load vector, assembly,
+factorization, back substitution, redistribution and end actions, see
+Structure.solve) and counts how many times the expensive properties of the
+members are evaluated, while it is active:
+
+    with structure.profile(memory=True) as profiler:
+        structure.solve()
+    profiler.as_dict()
+    profiler.log()
+    profiler.write_chrome_trace('solve.json')
+
+The Chrome trace can be opened in chrome://tracing or https://ui.perfetto.dev
+as a flame graph.
+
+Notes
+-----
+The instrumented code calls phase(name) and count(name), both do nothing
+(besides a check) when no profiler is active, so the instrumentation can
+stay in the hot paths. Every active profiler records the phases of every
+thread.
+
+The memory of tracemalloc is the one of the whole process and the phases
+reset its peak, so the memory of a phase includes the allocations of the
+other threads meanwhile and the phases of other threads shorten its peak:
+the memory numbers are valid only for a single thread solving. A profiler
+with memory cannot be entered while another profiler is active.
+"""
+import contextlib
+import json
+import logging
+import threading
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+
+# Profilers active (entered and not exited)
+_ACTIVE: List['Profiler'] = []
+_ACTIVE_LOCK = threading.Lock()
+_NULL_CONTEXT = contextlib.nullcontext()
+
+
+def count(name: str, increment: int=1):
+    """
+    Add increment to the counter name of the active profilers
+    """
+    if _ACTIVE:
+        for profiler in _ACTIVE:
+            profiler.count(name, increment)
+
+
+def phase(name: str, calls: int=1, **arguments):
+    """
+    Context manager that records the phase name in the active profilers,
+    arguments are kept with the event (e.g: the member row), calls is the
+    number of calls the phase stands for (e.g: one per member of a phase
+    batched over the members)
+    """
+    if not _ACTIVE:
+        return _NULL_CONTEXT
+    return _Phase(tuple(_ACTIVE), name, calls, arguments)
+
+
+class _Phase:
+    __slots__ = ('profilers', 'name', 'calls', 'arguments', 'frames')
+
+    def __init__(self, profilers, name: str, calls: int, arguments: dict):
+        self.profilers = profilers
+        self.name = name
+        self.calls = calls
+        self.arguments = arguments
+
+    def __enter__(self):
+        self.frames = [profiler._enter() for profiler in self.profilers]
+        return self
+
+    def __exit__(self, *exception):
+        for profiler, frame in zip(self.profilers, self.frames):
+            profiler._exit(self.name, self.calls, self.arguments, frame)
+        return False
+
+
+class Profiler:
+    """
+    Recorder of phases and counters
+
+    Attributes
+    ----------
+    memory: bool
+        If True the memory allocated by every phase is measured with
+        tracemalloc (started by the profiler if it is not tracing), valid
+        only for a single thread solving (see Notes of the module)
+    events: list
+        One dict per phase run: name, calls (more than one for a batched
+        phase, see phase), start and duration (seconds from the start of
+        the profiler), thread, depth, arguments and, if memory,
+        allocated (net bytes) and peak (bytes over the memory at the start)
+    counters: dict
+        Number of evaluations by name
+    callbacks: list
+        Functions called with every event when its phase ends
+    """
+    def __init__(self, memory: bool=False, callbacks: List[Callable[[dict], None]]=()):
+        self.memory = memory
+        self.events: List[dict] = []
+        self.counters: Dict[str, int] = {}
+        self.callbacks = list(callbacks)
+        self._origin = None
+        self._started_tracemalloc = False
+        self._stacks = threading.local()
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        with _ACTIVE_LOCK:
+            if self.memory and _ACTIVE:
+                raise RuntimeError('A profiler with memory cannot run with other profilers, '
+                        'the peak of tracemalloc is global')
+            _ACTIVE.append(self)
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        if self._origin is None:
+            self._origin = time.perf_counter()
+        return self
+
+    def __exit__(self, *exception):
+        with _ACTIVE_LOCK:
+            _ACTIVE.remove(self)
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        return False
+
+    def count(self, name: str, increment: int=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + increment
+
+    def _stack(self) -> list:
+        if not hasattr(self._stacks, 'frames'):
+            self._stacks.frames = []
+        return self._stacks.frames
+
+    def _enter(self) -> dict:
+        stack = self._stack()
+        frame = {'start': time.perf_counter()}
+        if self.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            # The peak of the enclosing phase is kept before it is reset
+            if stack:
+                stack[-1]['peak'] = max(stack[-1]['peak'], peak)
+            tracemalloc.reset_peak()
+            frame['memory'] = current
+            frame['peak'] = current
+        stack.append(frame)
+        return frame
+
+    def _exit(self, name: str, calls: int, arguments: dict, frame: dict):
+        end = time.perf_counter()
+        stack = self._stack()
+        stack.pop()
+        event = {
+                'name': name,
+                'calls': calls,
+                'start': frame['start'] - self._origin,
+                'duration': end - frame['start'],
+                'thread': threading.get_ident(),
+                'depth': len(stack),
+                'arguments': arguments}
+        if self.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            frame['peak'] = max(frame['peak'], peak)
+            if stack:
+                stack[-1]['peak'] = max(stack[-1]['peak'], frame['peak'])
+            event['allocated'] = current - frame['memory']
+            event['peak'] = frame['peak'] - frame['memory']
+        with self._lock:
+            self.events.append(event)
+        for callback in self.callbacks:
+            callback(event)
+
+    def as_dict(self) -> dict:
+        """
+        Phases aggregated by name (calls, time and, if memory, allocated and
+        peak, the largest of the calls) and counters
+        """
+        phases = {}
+        for event in self.events:
+            summary = phases.setdefault(event['name'], {'calls': 0, 'time': 0.})
+            summary['calls'] += event['calls']
+            summary['time'] += event['duration']
+            if 'allocated' in event:
+                summary['allocated'] = summary.get('allocated', 0) + event['allocated']
+                summary['peak'] = max(summary.get('peak', 0), event['peak'])
+        return {'phases': phases, 'counters': dict(self.counters)}
+
+    def log(self, logger: logging.Logger=None, level: int=logging.INFO):
+        """
+        Log one line per phase (see as_dict) and one per counter
+        """
+        logger = logging.getLogger(__name__) if logger is None else logger
+        summary = self.as_dict()
+        for name, values in summary['phases'].items():
+            memory = f", allocated {values['allocated']} B, peak {values['peak']} B" if 'peak' in values else ''
+            logger.log(level, '%s: %d calls, %.6f s%s', name, values['calls'], values['time'], memory)
+        for name, value in summary['counters'].items():
+            logger.log(level, '%s: %d evaluations', name, value)
+
+    def chrome_trace(self) -> dict:
+        """
+        Events in the Chrome trace event format (complete events, times in
+        microseconds) and the counters as a counter event
+        """
+        trace_events = [{
+            'name': event['name'],
+            'ph': 'X',
+            'ts': event['start']*1e6,
+            'dur': event['duration']*1e6,
+            'pid': 0,
+            'tid': event['thread'],
+            'args': {**event['arguments'], 'calls': event['calls'],
+                **{key: event[key] for key in ('allocated', 'peak') if key in event}}}
+            for event in self.events]
+        if self.counters:
+            end = max((event['start'] + event['duration'] for event in self.events), default=0)
+            trace_events.append({'name': 'counters', 'ph': 'C', 'ts': end*1e6, 'pid': 0,
+                'args': dict(self.counters)})
+        return {'traceEvents': trace_events, 'displayTimeUnit': 'ms'}
+
+    def write_chrome_trace(self, path: str):
+        """
+        Write chrome_trace() to a JSON file
+        """
+        with open(path, 'w') as file:
+            json.dump(self.chrome_trace(), file)
@@ -1,9 +1,13 @@
 import numpy as np
 import math
 from .material import Material, A36
+from .tracking import Tracked
 
 
-class Section:
+class Section(Tracked):
+    # Attributes that change the stiffness of the members of the section
+    _tracked_attributes = frozenset(('A', 'Ix', 'Iy', 'J', 'material'))
+
     def __init__(self, A, Ix, Iy=1, J=1, material=A36):
         """
         Custom section class
@@ -19,6 +23,18 @@ class Section:
         self.J = J
         self.material = material
 
+    def _notify(self, name: str):
+        if name == 'material':
+            self.material._observe(self)
+        super()._notify(name)
+
+    def _changed(self, material: Material, name: str):
+        """
+        Called by the material of the section when E, G or v changes
+        """
+        if material is self.material:
+            super()._notify('material')
+
     @property
     def rx(self):
         """
@@ -35,6 +51,8 @@ class Section:
 
 
 class ISection(Section):
+    _tracked_attributes = frozenset(('f1', 'ft1', 'f2', 'ft2', 'w', 'wt', 'material'))
+
     def __init__(self, f1: float, ft1: float, f2: float, ft2: float, w: float, wt: float, material):
         """
         I section define
@@ -141,6 +159,8 @@ class ISection(Section):
 
 
 class TubeSection(Section):
+    _tracked_attributes = frozenset(('f', 'ft', 'w', 'wt', 'material'))
+
     def __init__(self, f: float, ft: float, w: float, wt: float, material):
         """
         Tube Section class
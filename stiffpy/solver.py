@@ -0,0 +1,560 @@
+"""
+This module defines the Solver classes used by Structure to solve the
+system of the free degrees of freedom K_ff d = P_f
+
+A solver factorizes the stiffness matrix once and keeps the factorization,
+so the same solver can be used to solve as many right hand sides as needed
+without factorizing the matrix again.
+
+Notes
+-----
+DenseSolver uses a Cholesky factorization (the stiffness matrix of a stable
+structure is symmetric positive definite), if the matrix is not positive
+definite it falls back to a LU factorization.
+
+SparseSolver uses CHOLMOD (scikit-sparse) if it is installed, otherwise it
+uses the SuperLU factorization of scipy.
+
+BandedSolver stores only the band of the matrix (the chains of Beam and
+Spring models have a half bandwidth of a few degrees), it uses a banded
+Cholesky factorization and falls back to a banded LU factorization.
+
+The direct solvers raise LinAlgError when a pivot is zero (relative to the
+largest entry of the matrix): the structure is unstable (a mechanism).
+
+IterativeSolver does not factorize the matrix, it solves with preconditioned
+conjugate gradients (Jacobi, block Jacobi with one block per node or
+incomplete Cholesky preconditioner), its memory is the matrix and the
+preconditioner. It can start from the previous solution (warm start), which
+saves iterations when a model is solved again after small changes.
+
+The direct solvers accept low rank updates of the factorized matrix (see
+Solver.update), the solves of the updated matrix use the Woodbury identity
+with the stored factorization, so a structure whose stiffness changed in a
+few members is solved again without factorizing.
+
+scipy is imported on the first factorization, not with the module (a short
+lived process that only builds a model does not pay for its import).
+"""
+import sys
+import warnings
+import numpy as np
+from .profiling import count
+
+
+def issparse(matrix) -> bool:
+    """
+    True if the matrix is a scipy.sparse matrix, scipy.sparse is not
+    imported (a sparse matrix cannot exist before it is imported)
+    """
+    sparse = sys.modules.get('scipy.sparse')
+    return sparse is not None and sparse.issparse(matrix)
+
+
+def _check_pivots(pivots: np.ndarray, scale: float):
+    """
+    Raise LinAlgError if a pivot of a factorization is zero relative to
+    scale (the largest entry of the matrix): the matrix is singular, e.g:
+    the stiffness of an unstable structure (a mechanism)
+    """
+    from scipy.linalg import LinAlgError
+    pivots = np.abs(pivots)
+    if len(pivots) and pivots.min() <= len(pivots)*np.finfo(float).eps*scale:
+        raise LinAlgError(f'Singular matrix (unstable structure), zero pivot at row {int(pivots.argmin())}')
+
+
+class Solver:
+    """
+    Generic Solver Class. Due to the abstract nature of this class, it acts
+    like an interface.
+
+    Attributes
+    ----------
+    sparse: bool
+        True if the solver works with scipy.sparse matrices
+    method: str
+        Name of the factorization in use, None if nothing has been factorized
+    blocks: np.ndarray
+        Node of each row of the matrix, set by the structure before the
+        factorization (used by the block preconditioners), None if unknown
+    ordered: bool
+        True if the rows are already in a fill reducing order (see
+        DofPlan.ordering), set by the structure, the sparse factorizations
+        keep that order instead of computing their own
+    statistics: dict
+        Statistics of the last solve (e.g: the iterations of the iterative
+        solvers), empty for the direct solvers
+    direct: bool
+        True if the solver factorizes the matrix, the low rank updates are
+        cheap only for the direct solvers
+    generation: int
+        Number of factorizations and updates, a structure compares it to
+        know if the solver still holds its matrix
+    """
+    sparse = False
+    blocks = None
+    ordered = False
+    direct = True
+
+    def __init__(self):
+        self.method = None
+        self._factorization = None
+        self._size = 0
+        self._update = None
+        self.generation = 0
+        self.statistics = {}
+
+    @property
+    def factorized(self) -> bool:
+        return self.method is not None
+
+    @property
+    def update_rank(self) -> int:
+        """
+        Number of rows changed by the updates since the last factorization
+        """
+        return 0 if self._update is None else len(self._update[0])
+
+    def factorize(self, matrix):
+        """
+        Factorize the matrix and keep the factorization, the previous
+        updates are dropped
+
+        Parameters
+        ----------
+        matrix: np.ndarray or scipy.sparse matrix
+            Square matrix of the system
+        """
+        self._update = None
+        self.generation += 1
+        return self._factorize(matrix)
+
+    def _factorize(self, matrix):
+        raise NotImplementedError
+
+    def update(self, indexes: np.ndarray, delta: np.ndarray):
+        """
+        Add delta to the rows and columns indexes of the factorized matrix
+        without factorizing it again, the updates are accumulated until the
+        next factorize
+
+        The solves of the updated matrix A + E delta E^T (E the columns of
+        the identity at indexes) are the solves of A corrected with the
+        Woodbury identity, it costs one solve of A per updated row
+
+        Parameters
+        ----------
+        indexes: np.ndarray
+            Rows (and columns) of the matrix that change, sorted and unique
+        delta: np.ndarray
+            Change of the submatrix at indexes, shape (rows, rows)
+        """
+        from scipy.linalg import lu_factor
+        if not self.factorized:
+            raise RuntimeError('Factorize a matrix before updating it')
+        indexes = np.asarray(indexes, dtype=int)
+        delta = np.asarray(delta, dtype=float)
+        self.generation += 1
+        if self._size == 0 or len(indexes) == 0:
+            return self
+        if self._update is None:
+            previous_indexes, previous_delta, previous_solutions = np.empty(0, dtype=int), np.zeros((0, 0)), None
+        else:
+            previous_indexes, previous_delta, previous_solutions, _ = self._update
+        merged = np.union1d(previous_indexes, indexes)
+        merged_delta = np.zeros((len(merged), len(merged)))
+        old, new = np.searchsorted(merged, previous_indexes), np.searchsorted(merged, indexes)
+        merged_delta[np.ix_(old, old)] += previous_delta
+        merged_delta[np.ix_(new, new)] += delta
+        # Z = A^-1 E, only the columns of the rows not updated before are solved
+        solutions = np.zeros((self._size, len(merged)))
+        if previous_solutions is not None:
+            solutions[:, old] = previous_solutions
+        missing = np.setdiff1d(np.arange(len(merged)), old)
+        if len(missing):
+            columns = np.zeros((self._size, len(missing)))
+            columns[merged[missing], np.arange(len(missing))] = 1
+            solutions[:, missing] = self._solve(columns).reshape(self._size, -1)
+        # Capacitance matrix I + delta Z[indexes]
+        capacitance = np.eye(len(merged)) + merged_delta @ solutions[merged]
+        self._update = (merged, merged_delta, solutions, lu_factor(capacitance, check_finite=False))
+        count('solver_updates')
+        return self
+
+    def _solve(self, rhs: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+    def solve(self, rhs: np.ndarray) -> np.ndarray:
+        """
+        Solve the system for one (vector) or many (matrix with one column
+        per right hand side) right hand sides using the stored factorization
+        (and its updates)
+        """
+        if not self.factorized:
+            raise RuntimeError('Factorize a matrix before solving')
+        rhs = np.asarray(rhs, dtype=float)
+        if self._size == 0:
+            return np.zeros_like(rhs)
+        solution = self._solve(rhs)
+        if self._update is not None:
+            from scipy.linalg import lu_solve
+            indexes, delta, solutions, capacitance = self._update
+            solution = solution - solutions @ lu_solve(capacitance, delta @ solution[indexes], check_finite=False)
+        return solution
+
+
+class DenseSolver(Solver):
+    """
+    Cholesky solver (scipy.linalg.cho_factor) for dense matrices
+    """
+    def _factorize(self, matrix):
+        from scipy.linalg import cho_factor, lu_factor, LinAlgError
+        matrix = matrix.toarray() if issparse(matrix) else np.asarray(matrix, dtype=float)
+        self._size = matrix.shape[0]
+        if self._size == 0:
+            self.method, self._factorization = 'empty', None
+            return self
+        scale = np.abs(matrix).max()
+        try:
+            self._factorization = cho_factor(matrix, check_finite=False)
+            self.method = 'cholesky'
+            # The pivots are the squares of the diagonal of the factor
+            _check_pivots(np.diag(self._factorization[0])**2, scale)
+        except LinAlgError:
+            # Not positive definite (e.g. negative elastic constants)
+            self._factorization = lu_factor(matrix, check_finite=False)
+            self.method = 'lu'
+            _check_pivots(np.diag(self._factorization[0]), scale)
+        return self
+
+    def _solve(self, rhs):
+        from scipy.linalg import cho_solve, lu_solve
+        if self.method == 'cholesky':
+            return cho_solve(self._factorization, rhs, check_finite=False)
+        return lu_solve(self._factorization, rhs, check_finite=False)
+
+
+class SparseSolver(Solver):
+    """
+    Sparse direct solver, CHOLMOD if scikit-sparse is installed otherwise
+    SuperLU (scipy.sparse.linalg.splu), with their fill reducing ordering
+    (AMD, COLAMD) unless the matrix is ordered
+    """
+    sparse = True
+
+    def _factorize(self, matrix):
+        import scipy.sparse as sp
+        from scipy.sparse.linalg import splu
+        matrix = sp.csc_matrix(matrix, dtype=float)
+        self._size = matrix.shape[0]
+        if self._size == 0:
+            self.method, self._factorization = 'empty', None
+            return self
+        try:
+            from sksparse.cholmod import cholesky, CholmodNotPositiveDefiniteError
+        except ImportError:
+            cholesky = None
+        if cholesky is not None:
+            try:
+                self._factorization = cholesky(matrix, ordering_method='natural' if self.ordered else 'default')
+                self.method = 'cholmod'
+                return self
+            except CholmodNotPositiveDefiniteError:
+                pass
+        try:
+            self._factorization = splu(matrix, permc_spec='NATURAL' if self.ordered else 'COLAMD')
+        except RuntimeError as error:
+            # Exactly singular
+            from scipy.linalg import LinAlgError
+            raise LinAlgError(f'Singular matrix (unstable structure), {error}') from error
+        self.method = 'splu'
+        _check_pivots(self._factorization.U.diagonal(), abs(matrix).max())
+        return self
+
+    def _solve(self, rhs):
+        if self.method == 'cholmod':
+            return self._factorization(rhs)
+        return self._factorization.solve(rhs)
+
+
+class BandedSolver(Solver):
+    """
+    Banded Cholesky solver (scipy.linalg.cholesky_banded), O(n b^2) time and
+    O(n b) memory for a half bandwidth b
+
+    Attributes
+    ----------
+    bandwidth: int
+        Half bandwidth of the factorized matrix
+    """
+    sparse = True
+
+    def _factorize(self, matrix):
+        import scipy.sparse as sp
+        from scipy.linalg import cholesky_banded, LinAlgError
+        from scipy.linalg.lapack import dgbtrf
+        matrix = sp.coo_matrix(matrix, dtype=float)
+        self._size = matrix.shape[0]
+        if self._size == 0:
+            self.method, self._factorization = 'empty', None
+            return self
+        rows, columns, values = matrix.row, matrix.col, matrix.data
+        upper = rows <= columns
+        self.bandwidth = int((columns - rows).max(initial=0))
+        # Upper form: bands[bandwidth + i - j, j] = matrix[i, j]
+        bands = np.zeros((self.bandwidth + 1, self._size))
+        np.add.at(bands, (self.bandwidth + rows[upper] - columns[upper], columns[upper]), values[upper])
+        scale = np.abs(values).max(initial=0)
+        try:
+            self._factorization = cholesky_banded(bands, check_finite=False)
+            self.method = 'cholesky_banded'
+            # The pivots are the squares of the diagonal of the factor
+            _check_pivots(self._factorization[-1]**2, scale)
+        except LinAlgError:
+            # Not positive definite, LU of the general band (both triangles,
+            # plus lower rows for the fill of the pivoting, see LAPACK dgbtrf)
+            lower = int((rows - columns).max(initial=0))
+            bands = np.zeros((2*lower + self.bandwidth + 1, self._size))
+            np.add.at(bands, (lower + self.bandwidth + rows - columns, columns), values)
+            lu, pivots, info = dgbtrf(bands, lower, self.bandwidth)
+            if info < 0:
+                raise ValueError(f'Illegal argument {-info} of dgbtrf')
+            self._factorization = (lower, lu, pivots)
+            self.method = 'banded_lu'
+            # Diagonal of U (info > 0 for an exactly zero pivot)
+            _check_pivots(lu[lower + self.bandwidth], scale)
+        return self
+
+    def _solve(self, rhs):
+        from scipy.linalg import cho_solve_banded
+        from scipy.linalg.lapack import dgbtrs
+        if self.method == 'cholesky_banded':
+            return cho_solve_banded((self._factorization, False), rhs, check_finite=False)
+        lower, lu, pivots = self._factorization
+        solution, info = dgbtrs(lu, lower, self.bandwidth, rhs, pivots)
+        return solution
+
+
+def _block_inverses(matrix, blocks: np.ndarray):
+    """
+    Inverses of the diagonal blocks of the matrix, the rows of a block are
+    the rows with the same value in blocks
+
+    Returns
+    -------
+    inverses: np.ndarray
+        Inverse of each block padded with the identity, shape (blocks, size, size)
+    block_rows, positions: np.ndarray
+        Block of each row and position of the row in its block
+    """
+    import scipy.sparse as sp
+    matrix = sp.coo_matrix(matrix)
+    _, block_rows = np.unique(blocks, return_inverse=True)
+    counts = np.bincount(block_rows)
+    order = np.argsort(block_rows, kind='stable')
+    positions = np.empty(len(block_rows), dtype=int)
+    positions[order] = np.arange(len(block_rows)) - np.repeat(np.cumsum(counts) - counts, counts)
+    size = int(counts.max())
+    block_matrices = np.zeros((len(counts), size, size))
+    rows, columns = matrix.row, matrix.col
+    same = block_rows[rows] == block_rows[columns]
+    np.add.at(block_matrices, (block_rows[rows[same]], positions[rows[same]], positions[columns[same]]),
+            matrix.data[same])
+    padding, padded = np.nonzero(np.arange(size) >= counts[:, np.newaxis])
+    block_matrices[padding, padded, padded] = 1
+    return np.linalg.inv(block_matrices), block_rows, positions
+
+
+class IterativeSolver(Solver):
+    """
+    Preconditioned conjugate gradient solver, nothing is factorized (the
+    preconditioner is built by factorize) so it fits the models whose
+    factorization does not fit in memory
+
+    Attributes
+    ----------
+    preconditioner: str
+        'jacobi' (inverse of the diagonal), 'block_jacobi' (inverse of the
+        block of each node, see Solver.blocks, blocks of 6 rows if they are
+        unknown), 'incomplete_cholesky' (L L^T from the incomplete LU of
+        the matrix without pivoting) or None
+    rtol, atol: float
+        The iterations stop when the norm of the residual is below
+        max(rtol |rhs|, atol)
+    maxiter: int
+        Maximum number of iterations per right hand side, 10 times the size
+        of the matrix if None
+    warm_start: bool
+        If True every solve starts from the solution of the previous solve
+        with the same shape (e.g: the same model with small changes)
+    drop_tol, fill_factor: float
+        Options of the incomplete Cholesky preconditioner (see
+        scipy.sparse.linalg.spilu), the matrix is scaled to a unit diagonal
+    statistics: dict
+        iterations and residuals (relative to the norm of the right hand
+        side) of each right hand side of the last solve and converged
+    """
+    sparse = True
+    direct = False
+    PRECONDITIONERS = ('jacobi', 'block_jacobi', 'incomplete_cholesky', None)
+
+    def __init__(self,
+            preconditioner: str='jacobi',
+            rtol: float=1e-10,
+            atol: float=0.,
+            maxiter: int=None,
+            warm_start: bool=False,
+            drop_tol: float=1e-3,
+            fill_factor: float=10):
+        super().__init__()
+        if preconditioner not in self.PRECONDITIONERS:
+            raise ValueError(f'Unknown preconditioner {preconditioner}')
+        self.preconditioner = preconditioner
+        self.rtol = rtol
+        self.atol = atol
+        self.maxiter = maxiter
+        self.warm_start = warm_start
+        self.drop_tol = drop_tol
+        self.fill_factor = fill_factor
+        self._matrix = None
+        self._previous = None
+
+    def _factorize(self, matrix):
+        import scipy.sparse as sp
+        self._matrix = sp.csr_matrix(matrix, dtype=float) if issparse(matrix) else np.asarray(matrix, dtype=float)
+        self._size = self._matrix.shape[0]
+        self.method = f'pcg_{self.preconditioner}' if self.preconditioner else 'cg'
+        if self._size == 0 or self.preconditioner is None:
+            self._factorization = None
+        elif self.preconditioner == 'jacobi':
+            diagonal = np.asarray(self._matrix.diagonal(), dtype=float)
+            self._factorization = 1/np.where(diagonal == 0, 1, diagonal)
+        elif self.preconditioner == 'block_jacobi':
+            blocks = np.arange(self._size)//6 if self.blocks is None or len(self.blocks) != self._size else self.blocks
+            self._factorization = _block_inverses(self._matrix, blocks)
+        else:
+            self._factorization = self._incomplete_cholesky()
+        return self
+
+    def _incomplete_cholesky(self):
+        """
+        Incomplete Cholesky factor of the matrix scaled to a unit diagonal
+
+        Returns
+        -------
+        scale: np.ndarray
+            Inverse of the square root of the diagonal
+        factor: scipy.sparse.linalg.SuperLU
+            Triangular factor L (L L^T is the scaled matrix approximately)
+        """
+        import scipy.sparse as sp
+        from scipy.sparse.linalg import spilu, splu
+        diagonal = np.asarray(self._matrix.diagonal(), dtype=float)
+        scale = 1/np.sqrt(np.where(diagonal > 0, diagonal, 1))
+        scaled = sp.csc_matrix(sp.diags(scale) @ self._matrix @ sp.diags(scale))
+        # Without pivoting the incomplete LU of a symmetric matrix is L (D L^T),
+        # only L and D are kept (the dropped entries of U and L differ and
+        # the conjugate gradient needs a symmetric preconditioner)
+        options = dict(permc_spec='NATURAL', diag_pivot_thresh=0, options={'SymmetricMode': True})
+        incomplete = spilu(scaled, drop_tol=self.drop_tol, fill_factor=self.fill_factor, **options)
+        pivots = np.abs(incomplete.U.diagonal())
+        factor = sp.csc_matrix(incomplete.L @ sp.diags(np.sqrt(np.where(pivots > 0, pivots, 1))))
+        # SuperLU of a triangular matrix, its solves are the triangular solves
+        return scale, splu(factor, **options)
+
+    def _precondition(self, residual: np.ndarray) -> np.ndarray:
+        if self._factorization is None:
+            return residual
+        if self.preconditioner == 'jacobi':
+            return self._factorization*residual
+        if self.preconditioner == 'block_jacobi':
+            inverses, block_rows, positions = self._factorization
+            blocks = np.zeros(inverses.shape[:2])
+            blocks[block_rows, positions] = residual
+            return np.einsum('bij,bj->bi', inverses, blocks)[block_rows, positions]
+        scale, factor = self._factorization
+        return scale*factor.solve(factor.solve(scale*residual), trans='T')
+
+    def _conjugate_gradient(self, rhs: np.ndarray, start: np.ndarray):
+        """
+        Solve a right hand side (vector) from start
+
+        Returns
+        -------
+        solution: np.ndarray
+        iterations: int
+        residual: float
+            Norm of the residual relative to the norm of rhs
+        converged: bool
+        """
+        rhs_norm = np.linalg.norm(rhs)
+        tolerance = max(self.rtol*rhs_norm, self.atol)
+        maxiter = 10*self._size if self.maxiter is None else self.maxiter
+        solution = np.zeros(self._size) if start is None else np.array(start, dtype=float)
+        residual = rhs - self._matrix @ solution
+        residual_norm = np.linalg.norm(residual)
+        iterations = 0
+        if residual_norm > tolerance:
+            preconditioned = self._precondition(residual)
+            direction = preconditioned.copy()
+            product = residual @ preconditioned
+            while iterations < maxiter:
+                iterations += 1
+                matrix_direction = self._matrix @ direction
+                step = product/(direction @ matrix_direction)
+                solution += step*direction
+                residual -= step*matrix_direction
+                residual_norm = np.linalg.norm(residual)
+                if residual_norm <= tolerance:
+                    break
+                preconditioned = self._precondition(residual)
+                new_product = residual @ preconditioned
+                direction = preconditioned + new_product/product*direction
+                product = new_product
+        return solution, iterations, residual_norm/(rhs_norm if rhs_norm > 0 else 1), residual_norm <= tolerance
+
+    def _solve(self, rhs):
+        starts = self._previous if self.warm_start and self._previous is not None \
+                and self._previous.shape == rhs.shape else None
+        columns = rhs.reshape(self._size, -1)
+        starts = None if starts is None else starts.reshape(self._size, -1)
+        solutions = np.zeros_like(columns)
+        iterations, residuals, converged = [], [], []
+        for column in range(columns.shape[1]):
+            solutions[:, column], *column_statistics = self._conjugate_gradient(
+                    columns[:, column], None if starts is None else starts[:, column])
+            iterations.append(column_statistics[0])
+            residuals.append(column_statistics[1])
+            converged.append(column_statistics[2])
+        count('pcg_iterations', sum(iterations))
+        self.statistics = {'iterations': iterations, 'residuals': residuals, 'converged': all(converged)}
+        if not self.statistics['converged']:
+            warnings.warn(f'Conjugate gradient did not converge, relative residual {max(residuals):.3g}',
+                    RuntimeWarning)
+        solution = solutions.reshape(rhs.shape)
+        self._previous = solution.copy()
+        return solution
+
+
+def default_solver(sparse: bool=False) -> Solver:
+    """
+    Solver used by the structure when no solver is given
+    """
+    return SparseSolver() if sparse else DenseSolver()
+
+
+def chain_solver(half_bandwidth: int, size: int, sparse: bool=False) -> Solver:
+    """
+    Solver of a chain (e.g: continuous beams and spring chains), BandedSolver
+    if the band is at most half of the matrix, otherwise default_solver
+
+    Parameters
+    ----------
+    half_bandwidth: int
+        Half bandwidth of the matrix (see DofPlan.half_bandwidth)
+    size: int
+        Number of rows of the matrix
+    """
+    if 2*(half_bandwidth + 1) <= size:
+        return BandedSolver()
+    return default_solver(sparse)
@@ -4,6 +4,8 @@ from ..node import Node as Node1
 
 
 class Node(Node1):
+    __slots__ = ()
+
     def __init__(self, r:float, no=None):
         super().__init__((r, 0, 0), (0, 0, 0), no)
 
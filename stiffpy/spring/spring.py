@@ -1,6 +1,11 @@
 from ..structure import Structure
+from ..solver import chain_solver
 
 
 class Spring(Structure):
     def draw_deformations(self, factor=1):
         super().draw_deformations('2d', factor)
+
+    def _default_solver(self):
+        # Spring chains, banded solver if the bandwidth is small
+        return chain_solver(self.plan.half_bandwidth, self.number_of_degrees_of_freedom, self.sparse)
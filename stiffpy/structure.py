@@ -1,137 +1,706 @@
-import matplotlib.pyplot as plt
+import contextlib
+import copy
+import itertools
+import threading
 import numpy as np
-from typing import List, TypeVar
+from typing import Dict, List
 from .action.actions import Force, Moment
-from .member import Member
+from .action.distributed_force import DistributedForce
+from .analysis_result import AnalysisResult
+from .cache import deep_sizeof
+from .dof_plan import DofPlan
+from .kernels import member_properties, local_stiffness_matrices, \
+        condense_releases, transformation_matrices, global_stiffness_matrices
+from .load_case import LoadCase, LoadCaseResult
+from .member import MEMBER_RESULTS_CACHE, Member, member_node_rotations
+from .member_loads import MemberLoadTable
+from .model_arrays import ModelArrays
 from .node import Node
+from .node_registry import NodeRegistry
+from .profiling import Profiler, count, phase
+from .solver import Solver, default_solver, issparse
+
+
+# Generations of the solves of every structure (see Structure.solve)
+_solve_generations = itertools.count(1)
+# Arrays kept by Structure.solve (see Structure.memory_usage)
+_SOLVE_ATTRIBUTES = ('_reorder_stiffness', 'stiffness_ff', 'stiffness_rf', 'stiffness_rr',
+        'action_combined', 'reorder_action_combined',
+        'displacements', 'reactions', 'elastic_reactions', 'node_displacements',
+        'node_reactions', 'member_end_actions', '_fixed_end_actions', '_member_stiffness',
+        '_member_kt', '_member_transformations', '_member_lengths', '_member_loads')
+
+
+def _replace_rows(values: np.ndarray, rows: np.ndarray, new_values: np.ndarray) -> np.ndarray:
+    """
+    Copy of values with new_values at rows
+    """
+    values = values.copy()
+    values[rows] = new_values
+    return values
+
+
+def _matrix_nbytes(matrix) -> int:
+    """
+    Memory of a dense or sparse matrix or of a factorization in bytes
+    """
+    if issparse(matrix):
+        return sum(getattr(matrix, name).nbytes for name in ('data', 'indices', 'indptr', 'row', 'col')
+                if hasattr(matrix, name))
+    if hasattr(matrix, 'L') and hasattr(matrix, 'U'):
+        # Sparse LU factorization (scipy.sparse.linalg.splu)
+        return _matrix_nbytes(matrix.L) + _matrix_nbytes(matrix.U)
+    if isinstance(matrix, tuple):
+        # Preconditioners (see IterativeSolver)
+        return sum(_matrix_nbytes(part) for part in matrix)
+    return deep_sizeof(matrix)
+
+
+class _SolveState:
+    """
+    What a solve reads from a structure: the plan, the solver, the
+    restrained-free block and the arrays of the members (see
+    Structure._solve_state)
+    """
+    __slots__ = ('plan', 'solver', 'stiffness_rf', 'member_rows', 'member_kt',
+            'member_transformations', 'member_lengths', 'member_release_masks')
+
+    def __init__(self, structure: 'Structure'):
+        self.plan = structure.plan
+        # The factorizations and updates replace the factors of a solver,
+        # a copy keeps the ones of this state (IterativeSolver keeps the
+        # start of the next solve, it is not copied)
+        solver = structure.solver
+        self.solver = copy.copy(solver) if solver is not None and solver.direct else solver
+        self.stiffness_rf = getattr(structure, 'stiffness_rf', None)
+        self.member_rows = structure._member_rows
+        self.member_kt = structure._member_kt
+        self.member_transformations = structure._member_transformations
+        self.member_lengths = structure._member_lengths
+        self.member_release_masks = structure._member_release_masks
 
 
 class Structure:
-    def __init__(self):
-        self._nodes = set()
-        self._members: List[Member]
+    # Largest number of rows of the free-free block changed by low rank
+    # updates of the factorization (see _update_stiffness), beyond it the
+    # block is factorized again
+    low_rank_limit = 96
+
+    def __init__(self, sparse: bool=False, solver: Solver=None, ordering: str=None,
+            partitioned: bool=True):
+        """
+        Structure class
+
+        Parameters
+        ----------
+        sparse: bool, False
+            If True the global stiffness matrix is assembled and solved as a
+            scipy.sparse matrix, otherwise a dense array is used (recommended
+            only for small models)
+        solver: Solver, None
+            Solver of the free degrees system, it keeps the factorization of
+            the last solve so it can be reused with other right hand sides,
+            default DenseSolver (SparseSolver if sparse is True), use
+            IterativeSolver for the models whose factorization does not fit
+            in memory
+        ordering: str, None
+            Fill reducing ordering of the nodes applied to the numbering of
+            the degrees of freedom, 'rcm' (reverse Cuthill-McKee) or 'amd'
+            (minimum degree), see ordering.py and DofPlan.ordering_statistics
+        partitioned: bool, True
+            If True the member stiffness matrices are scattered straight
+            into the free-free, restrained-free and restrained-restrained
+            blocks of the reordered stiffness matrix (see
+            partitioned_stiffness), otherwise the whole matrix is assembled
+            and reordered (reorder_stiffness is kept)
+        """
+        self._registry = NodeRegistry()
+        self._members: List[Member] = []
+        self._plan: DofPlan = None
+        self._ordering = ordering
+        self.sparse = sparse
+        self.partitioned = partitioned
+        self._reorder_stiffness = None
+        self.solver = solver
+        self._load_cases: List[LoadCase] = []
+        self.load_case_results: Dict[str, LoadCaseResult] = {}
+        # Array storage of the models built with from_arrays, None once the
+        # Node and Member objects are created
+        self._model: ModelArrays = None
+        # Generation of the last solve, the cached results of the members
+        # are keyed by it
+        self.solve_generation = 0
+        # Statistics of the solver in the last solve (e.g: iterations and
+        # residuals of IterativeSolver)
+        self.solver_statistics: dict = {}
+        # Arrays of the members (see _refresh_members), the plan they were
+        # computed for, the members whose stiffness or loads changed since
+        # then and the stiffness changes not assembled yet
+        self._members_plan: DofPlan = None
+        self._member_rows = {}
+        self._dirty_stiffness = set()
+        self._dirty_loads = set()
+        self._stiffness_updates = []
+        # What the blocks and the solver hold (see _assemble and _factorize)
+        self._assembly_key = None
+        self._factorization_key = None
+        # Applied and written actions and displacements of the nodes (see
+        # _write_node_results)
+        self._written_node_results = []
+        # Result of the last solve of the loads of the model (see solve)
+        self.result: AnalysisResult = None
+        # Held while the model, the member arrays or the factorization are
+        # modified, the solves of load cases run in parallel out of it
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_arrays(cls,
+            coordinates,
+            connectivity,
+            sections,
+            section_ids=None,
+            release_masks=None,
+            restraints=None,
+            sparse: bool=False,
+            solver: Solver=None,
+            ordering: str=None,
+            **arrays):
+        """
+        Structure stored as arrays (see ModelArrays), the numbering, the
+        assembly and the solve use the arrays directly, the Node and Member
+        objects are only created when nodes or members are requested
+
+        Parameters
+        ----------
+        coordinates: np.ndarray
+            Coordinates of each node, shape (nodes, 3) (or (nodes, 2) for
+            plane models)
+        connectivity: np.ndarray
+            Rows of coordinates of the left and right node of each member,
+            shape (members, 2)
+        sections: list
+            Sections of the model
+        section_ids: np.ndarray, None
+            Index in sections of the section of each member, default the
+            first section
+        release_masks: np.ndarray, None
+            Releases of each member [node_1 (6), node_2 (6)], shape
+            (members, 12), default not released
+        restraints: np.ndarray, None
+            Restrained degrees of each node, shape (nodes, 6), default not
+            restrained
+        sparse, solver, ordering:
+            See Structure
+        arrays:
+            node_numbers, node_angles, elastic_constants, node_actions and
+            member_loads (MemberLoadTable), see ModelArrays
+
+        Example
+        -------
+        structure = Structure.from_arrays(
+            [(0, 0, 0), (4, 0, 0), (4, 3, 0)], [(0, 1), (1, 2)], [section],
+            restraints=[[True]*6, [False]*6, [True]*6],
+            node_actions=[[0]*6, [0, -10, 0, 0, 0, 0], [0]*6])
+        structure.solve()
+        structure.node_displacements
+        """
+        structure = cls(sparse=sparse, solver=solver, ordering=ordering)
+        structure._model = ModelArrays(coordinates, connectivity, sections, section_ids,
+                release_masks, restraints, **arrays)
+        return structure
+
+    def _materialize(self):
+        """
+        Create the Node and Member objects of a structure built with
+        from_arrays (with the results of the last solve), from now on the
+        objects are the model
+        """
+        model = self._model
+        if model is None:
+            return
+        nodes = [Node(tuple(r), tuple(angle), no=no) for r, angle, no in
+                zip(model.coordinates, model.node_angles, model.node_numbers.tolist())]
+        for node, restrains, elastic_constants, actions in zip(nodes, model.restrains,
+                model.elastic_constants, model.node_actions):
+            node.restrains = restrains
+            node.elastic_constants = elastic_constants
+            node.force = Force(actions[:3])
+            node.moment = Moment(actions[3:])
+        self._written_node_results = []
+        members = [Member(nodes[node_1], nodes[node_2], model.sections[section_id],
+            tuple(bool(release) for release in releases[:6]),
+            tuple(bool(release) for release in releases[6:]))
+            for (node_1, node_2), section_id, releases in
+            zip(model.connectivity, model.section_ids, model.release_masks)]
+        loads = model.member_loads
+        for row, position, components in zip(loads.force_members, loads.force_positions, loads.force_components):
+            members[row].forces = (position, Force(components))
+        for row, position, components in zip(loads.moment_members, loads.moment_positions, loads.moment_components):
+            members[row].moments = (position, Moment(components))
+        for row, position, length, initial, final in zip(loads.distributed_members, loads.distributed_positions,
+                loads.distributed_lengths, loads.distributed_initial, loads.distributed_final):
+            members[row].distributed_loads = (position, DistributedForce(initial, final, length))
+        if self.solve_generation:
+            self._write_node_results(nodes, self.node_displacements, self.node_reactions)
+            for member, end_actions in zip(members, self.member_end_actions):
+                member._end_action_values = end_actions
+                member._solve_generation = self.solve_generation
+        self.members = members
+
+    def memory_usage(self) -> Dict[str, int]:
+        """
+        Approximate memory of the structure in bytes (see cache.deep_sizeof),
+        the objects shared by several parts (e.g: the nodes of the members)
+        are counted once
+
+        Returns
+        -------
+        usage: dict
+            nodes, members (with their loads and end actions), model (arrays
+            of the structures built with from_arrays), plan, results (member
+            results in MEMBER_RESULTS_CACHE), solve (stiffness matrix,
+            factorization and result vectors) and total
+        """
+        seen = set()
+        usage = {
+            'nodes': deep_sizeof(list(self._registry.nodes), seen),
+            'members': deep_sizeof(self._members, seen),
+            'model': 0 if self._model is None else deep_sizeof(vars(self._model), seen)
+                + deep_sizeof(vars(self._model.member_loads), seen),
+            'plan': 0 if self._plan is None else deep_sizeof(vars(self._plan), seen)}
+        serial_numbers = {member._serial_number for member in self._members}
+        usage['results'] = sum(size for (key, _), size in MEMBER_RESULTS_CACHE.sizes().items()
+                if key[0] in serial_numbers)
+        usage['solve'] = sum(_matrix_nbytes(getattr(self, name)) for name in _SOLVE_ATTRIBUTES
+                if hasattr(self, name))
+        if self.solver is not None:
+            usage['solve'] += _matrix_nbytes(self.solver._factorization)
+            # Matrix kept by IterativeSolver
+            usage['solve'] += _matrix_nbytes(getattr(self.solver, '_matrix', None))
+        usage['total'] = sum(usage.values())
+        return usage
 
     @property
     def nodes(self):
-        return list(self._nodes)
+        self._materialize()
+        return list(self._registry.nodes)
+
+    @property
+    def node_registry(self) -> NodeRegistry:
+        """
+        Nodes of the structure by id (see NodeRegistry)
+        """
+        self._materialize()
+        return self._registry
 
     @property
     def members(self) -> List[Member]:
+        self._materialize()
         return self._members
 
+    @property
+    def plan(self) -> DofPlan:
+        return self.compile()
+
+    def compile(self) -> DofPlan:
+        """
+        Build the numbering of the degrees of freedom (DofPlan) if it is not
+        already built, the plan is dropped automatically when the members,
+        or the releases or restrains of the nodes and members change
+        """
+        if self._plan is None:
+            if self._model is not None:
+                self._plan = self._model.plan(self._ordering)
+            else:
+                self._plan = DofPlan(self._registry.nodes, self._members, self._ordering, self._registry.ids)
+        return self._plan
+
+    @property
+    def ordering(self) -> str:
+        return self._ordering
+
+    @ordering.setter
+    def ordering(self, ordering: str):
+        self._ordering = ordering
+        self._plan = None
+
+    def _changed(self, tracked, name: str):
+        """
+        Called by the nodes and members of the structure when a tracked
+        attribute changes, the changes of the numbering drop the plan, the
+        changes of the geometry, the sections and the loads of the members
+        mark them to be computed again (see _refresh_members)
+        """
+        if isinstance(tracked, Member):
+            if name == 'loads':
+                self._dirty_loads.add(tracked)
+                return
+            if name == 'section':
+                self._dirty_stiffness.add(tracked)
+                return
+            if name == 'geometry':
+                # The equivalent joint loads depend on the length
+                self._dirty_stiffness.add(tracked)
+                self._dirty_loads.add(tracked)
+                return
+        elif name in Node._geometry_attributes:
+            # The numbering does not depend on the coordinates, the members
+            # of the node notify the change
+            return
+        self._plan = None
+
     @property
     def indexes_grouped_by_node(self):
         """
-        Nested List elements for each node e.g [[0,1,2],[3,4],[5..]
+        Nested List elements for each node (in row order, see NodeRegistry) e.g [[0,1,2],[3,4],[5..]
         """
-        degrees_of_nodes: List[int] = [0]*len(self._nodes)
-        sorted_node_list = sorted(self.nodes, key=lambda node: node.no)
-        count = 0
-        for node in sorted_node_list:
-            no = node.no
-            degrees_of_nodes[no-1] = [count + i for i in range(node.number_not_released)]
-            count = degrees_of_nodes[no-1][-1] + 1
-        return degrees_of_nodes
+        return [degrees[degrees >= 0].tolist() for degrees in self.plan.node_degrees]
 
     @property
     def indexes(self):
         """
         Indexes of the whole structure
         """
-        total_number_of_indexes = sum([node.number_not_released for node in self._nodes])
-        return np.array([i for i in range(total_number_of_indexes)])
+        return np.arange(self.plan.number_of_degrees)
+
+    @property
+    def load_cases(self) -> List[LoadCase]:
+        return self._load_cases
+
+    @load_cases.setter
+    def load_cases(self, load_cases: List[LoadCase]):
+        self._load_cases = list(load_cases)
 
     @members.setter
     def members(self, members: List[Member]):
+        self._model = None
         for member in members:
-            node_1, node_2 = member.node_1, member.node_2
-            self._nodes.add(node_1)
-            self._nodes.add(node_2)
+            member.node_1._observe(self)
+            member.node_2._observe(self)
+            member._observe(self)
+        self._registry = NodeRegistry(node for member in members for node in (member.node_1, member.node_2))
         self._members = members
+        self._plan = None
+
+    @property
+    def member_stiffness_matrices(self):
+        """
+        Structure oriented stiffness matrices of every member computed in a
+        single batch, the released degrees are zero rows and columns
+
+        Returns
+        -------
+        stiffness: np.ndarray
+            Shape (members, 12, 12), same degrees order as plan.member_degrees
+        """
+        return self._member_arrays()[0]
+
+    def _member_arrays(self, rows: np.ndarray=None):
+        """
+        Structure oriented stiffness matrices T^T K T, member oriented
+        stiffness matrices times the transformation matrices K T (end
+        actions) and transformation matrices T of the members in rows (every
+        member if None), shape (members, 12, 12) each, and their lengths,
+        shape (members,)
+        """
+        properties = self._member_properties(rows)
+        stiffness = condense_releases(local_stiffness_matrices(*properties), self._member_releases(rows), properties[-1])
+        transformation = transformation_matrices(*self._member_rotations(rows))
+        return global_stiffness_matrices(stiffness, transformation), stiffness @ transformation, transformation, \
+                properties[-1]
+
+    def _selected_members(self, rows: np.ndarray=None) -> List[Member]:
+        return self._members if rows is None else [self._members[row] for row in rows]
+
+    def _member_properties(self, rows: np.ndarray=None):
+        """
+        Section and length arrays of the members in rows, every member if
+        None (see kernels.member_properties)
+        """
+        if self._model is not None:
+            properties = self._model.member_properties()
+            return properties if rows is None else tuple(values[rows] for values in properties)
+        return member_properties(self._selected_members(rows))
+
+    def _member_rotations(self, rows: np.ndarray=None):
+        """
+        Rotation matrices at the left and right node of the members in rows
+        (every member if None), shape (members, 3, 3) each
+        """
+        if self._model is not None:
+            rotations = self._model.node_rotations()
+            return rotations if rows is None else tuple(values[rows] for values in rotations)
+        return member_node_rotations(self._selected_members(rows))
+
+    def _member_releases(self, rows: np.ndarray=None) -> np.ndarray:
+        """
+        Releases of the members in rows (every member if None) [node_1 (6),
+        node_2 (6)], shape (members, 12)
+        """
+        if self._model is not None:
+            return self._model.release_masks if rows is None else self._model.release_masks[rows]
+        return np.array([tuple(member.node_1_release) + tuple(member.node_2_release)
+            for member in self._selected_members(rows)], dtype=bool).reshape(-1, 12)
+
+    def _member_load_arrays(self, rows: np.ndarray=None) -> np.ndarray:
+        """
+        Member oriented equivalent joint loads of the members in rows (every
+        member if None), shape (members, 12)
+        """
+        if self._model is not None:
+            equivalent_joint_loads = self._model.member_loads.equivalent_joint_loads(
+                    self._member_properties()[-1], self._member_releases())
+            return equivalent_joint_loads if rows is None else equivalent_joint_loads[rows]
+        return MemberLoadTable.from_members(self._selected_members(rows)).equivalent_joint_loads(
+                self._member_properties(rows)[-1], self._member_releases(rows))
+
+    def _refresh_members(self):
+        """
+        Compute the arrays of the members kept by the structure (stiffness
+        matrices, K T, transformation matrices, lengths, releases and
+        equivalent joint loads), only for the members whose geometry, section or loads
+        changed since the last call, for every member if the plan changed or
+        if the structure is stored as arrays (its arrays are not tracked)
+
+        The changes of the stiffness matrices are kept in
+        _stiffness_updates until they are assembled (see _factorize), the
+        arrays changed are replaced, never modified in place
+        """
+        plan = self.plan
+        if self._model is not None or self._members_plan is not plan:
+            count('member_arrays', len(plan.member_nodes))
+            self._member_stiffness, self._member_kt, self._member_transformations, self._member_lengths = \
+                    self._member_arrays()
+            self._member_release_masks = self._member_releases()
+            self._member_loads = self._member_load_arrays()
+            self._member_rows = {} if self._model is not None else \
+                    {member: row for row, member in enumerate(self._members)}
+            self._members_plan = plan
+            self._dirty_stiffness.clear()
+            self._dirty_loads.clear()
+            self._stiffness_updates = []
+            return
+        if self._dirty_stiffness:
+            rows = self._dirty_rows(self._dirty_stiffness)
+            count('member_arrays', len(rows))
+            stiffness, kt, transformations, lengths = self._member_arrays(rows)
+            self._stiffness_updates.append((rows, stiffness - self._member_stiffness[rows]))
+            # New arrays, the ones of a solve in progress are kept (see _solve_state)
+            self._member_stiffness = _replace_rows(self._member_stiffness, rows, stiffness)
+            self._member_kt = _replace_rows(self._member_kt, rows, kt)
+            self._member_transformations = _replace_rows(self._member_transformations, rows, transformations)
+            self._member_lengths = _replace_rows(self._member_lengths, rows, lengths)
+        if self._dirty_loads:
+            rows = self._dirty_rows(self._dirty_loads)
+            count('member_load_arrays', len(rows))
+            self._member_loads[rows] = self._member_load_arrays(rows)
+
+    def _dirty_rows(self, members: set) -> np.ndarray:
+        """
+        Sorted rows of the members of the structure in members, members is
+        cleared
+        """
+        rows = np.array(sorted(self._member_rows[member] for member in members if member in self._member_rows),
+                dtype=int)
+        members.clear()
+        return rows
+
+    def _member_equivalent_joint_loads(self, table: MemberLoadTable, state: _SolveState=None):
+        """
+        Equivalent joint loads of a table of member loads, the arrays of the
+        members must be up to date (see _refresh_members), or the ones of
+        state
+
+        Returns
+        -------
+        member_oriented: np.ndarray
+            Member oriented equivalent joint loads, shape (members, 12)
+        structure_action: np.ndarray
+            Structure oriented equivalent joint loads scattered to the
+            structure indexes, shape (number of degrees,)
+        """
+        state = state or self._solve_state()
+        member_oriented = table.equivalent_joint_loads(state.member_lengths, state.member_release_masks)
+        return member_oriented, self._structure_member_actions(member_oriented, state)
+
+    def _structure_member_actions(self, member_oriented: np.ndarray, state: _SolveState=None) -> np.ndarray:
+        """
+        Member oriented actions at the ends of every member (shape (members,
+        12)) moved to the structure indexes, shape (number of degrees,)
+        """
+        state = state or self._solve_state()
+        plan = state.plan
+        # T^T f, the released degrees are zero
+        structure_oriented = np.einsum('mji,mj->mi', state.member_transformations, member_oriented)
+        kept = plan.member_degrees >= 0
+        return np.bincount(plan.member_degrees[kept], structure_oriented[kept], minlength=plan.number_of_degrees)
+
+    def _stiffness_triplets(self):
+        """
+        COO triplets (rows, columns, values) of the member stiffness matrices
+        """
+        self._refresh_members()
+        return self._degree_triplets(self.plan.member_degrees, self._member_stiffness)
+
+    @staticmethod
+    def _degree_triplets(member_degrees: np.ndarray, matrices: np.ndarray):
+        """
+        COO triplets (rows, columns, values) of matrices by member, shape
+        (members, 12, 12), in the structure degrees member_degrees (the
+        released degrees are dropped)
+        """
+        rows = np.broadcast_to(member_degrees[:, :, np.newaxis], matrices.shape)
+        columns = np.broadcast_to(member_degrees[:, np.newaxis, :], matrices.shape)
+        used = (rows >= 0) & (columns >= 0)
+        return rows[used], columns[used], matrices[used]
 
     @property
     def structure_stiffness(self):
         """
         The nodal and member releases could be different
         """
-        indexes_grouped_by_node = self.indexes_grouped_by_node
-        n = sum([node.number_not_released for node in self.nodes]) # Number of not released degrees of the entire structure
-        stiffness = np.zeros((n, n))
-        for member in self._members:
-            pseudo_stiffness = np.zeros((n, n))
-            Kuu = member.structure_oriented_stiffness_matrix[:member.node_1_number_not_released,:member.node_1_number_not_released]
-            Kru = member.structure_oriented_stiffness_matrix[:member.node_1_number_not_released,member.node_1_number_not_released:]
-            Kur = member.structure_oriented_stiffness_matrix[member.node_1_number_not_released:,:member.node_1_number_not_released]
-            Krr = member.structure_oriented_stiffness_matrix[member.node_1_number_not_released:,member.node_1_number_not_released:]
-            no_1, no_2 = member.node_1.no, member.node_2.no
-            node_1_indexes = indexes_grouped_by_node[no_1-1] # Indexes corresponding to the node 1
-            node_2_indexes = indexes_grouped_by_node[no_2-1] # Indexes corresponding to the node 2
-            # selecting what indexes use
-            node_1_not_released_indexes = [i for i, release in enumerate(member.node_1.release) if release == False]
-            node_2_not_released_indexes = [i for i, release in enumerate(member.node_2.release) if release == False]
-            node_1_bool_not_released = np.array(member.node_1.release)[node_1_not_released_indexes]
-            node_2_bool_not_released = np.array(member.node_2.release)[node_2_not_released_indexes]
-            member_node_1_bool_not_released = np.array(member.node_1_release)[node_1_not_released_indexes]
-            member_node_2_bool_not_released = np.array(member.node_2_release)[node_2_not_released_indexes]
-            node_1_bool = np.array([member_bool or nodal_bool for member_bool, nodal_bool in zip(member_node_1_bool_not_released, node_1_bool_not_released)])
-            node_2_bool = np.array([member_bool or nodal_bool for member_bool, nodal_bool in zip(member_node_2_bool_not_released, node_2_bool_not_released)])
-            node_1_indexes = np.array(node_1_indexes)[~node_1_bool]
-            node_2_indexes = np.array(node_2_indexes)[~node_2_bool]
-            pseudo_stiffness[np.stack(Kuu.shape[1]*[node_1_indexes],axis=1), np.stack(Kuu.shape[0]*[node_1_indexes],axis=0)] = Kuu
-            pseudo_stiffness[np.stack(Kru.shape[1]*[node_1_indexes],axis=1), np.stack(Kru.shape[0]*[node_2_indexes],axis=0)] = Kru
-            pseudo_stiffness[np.stack(Kur.shape[1]*[node_2_indexes],axis=1), np.stack(Kur.shape[0]*[node_1_indexes],axis=0)] = Kur
-            pseudo_stiffness[np.stack(Krr.shape[1]*[node_2_indexes],axis=1), np.stack(Krr.shape[0]*[node_2_indexes],axis=0)] = Krr
-            stiffness = stiffness + pseudo_stiffness
-        return stiffness
+        count('structure_stiffness')
+        n = self.plan.number_of_degrees # Number of not released degrees of the entire structure
+        rows, columns, values = self._stiffness_triplets()
+        return np.bincount(rows*n + columns, weights=values, minlength=n*n).reshape(n, n)
+
+    @property
+    def sparse_structure_stiffness(self):
+        """
+        Same as structure_stiffness but assembled from COO triplets (row,
+        column, value) of every member block, the duplicated entries are
+        summed when the matrix is converted to CSR format
+
+        Returns
+        -------
+        stiffness: scipy.sparse.csr_matrix
+        """
+        import scipy.sparse as sp
+        count('sparse_structure_stiffness')
+        n = self.plan.number_of_degrees
+        rows, columns, values = self._stiffness_triplets()
+        return sp.coo_matrix((values, (rows, columns)), shape=(n, n)).tocsr()
+
+    def partitioned_stiffness(self, sparse: bool=False):
+        """
+        Blocks of the reordered stiffness matrix (elastic supports included)
+        assembled straight from the triplets of the member stiffness
+        matrices, the whole matrix is never built
+
+        Parameters
+        ----------
+        sparse: bool
+            If True the blocks are scipy.sparse matrices (free-free block in
+            CSC format, the others in CSR format)
+
+        Returns
+        -------
+        stiffness_ff, stiffness_rf, stiffness_rr:
+            Free-free, restrained-free and restrained-restrained blocks
+        """
+        count('partitioned_stiffness')
+        plan = self.plan
+        rows, columns, values = self._stiffness_triplets()
+        # Elastic Support Effects
+        diagonal = np.arange(plan.number_of_degrees)
+        blocks = []
+        for block_rows, block_columns, block_values, shape, format in self._block_triplets(
+                np.concatenate((rows, diagonal)), np.concatenate((columns, diagonal)),
+                np.concatenate((values, plan.elastic_constants))):
+            if sparse:
+                import scipy.sparse as sp
+                blocks.append(sp.coo_matrix((block_values, (block_rows, block_columns)), shape=shape).asformat(format))
+            else:
+                blocks.append(np.bincount(block_rows*shape[1] + block_columns, weights=block_values,
+                    minlength=shape[0]*shape[1]).reshape(shape))
+        return tuple(blocks)
+
+    def _block_triplets(self, rows: np.ndarray, columns: np.ndarray, values: np.ndarray):
+        """
+        Split COO triplets of the structure degrees into the free-free,
+        restrained-free and restrained-restrained blocks of the reordered
+        matrix
+
+        Returns
+        -------
+        blocks: list
+            (rows, columns, values, shape, sparse format) of each block
+        """
+        plan = self.plan
+        free = plan.number_of_degrees_of_freedom
+        restrained = plan.number_of_degrees - free
+        # Positions in the reordered matrix
+        rows, columns = plan.inverse_reorder_indexes[rows], plan.inverse_reorder_indexes[columns]
+        row_free, column_free = rows < free, columns < free
+        return [(rows[used] - offsets[0], columns[used] - offsets[1], values[used], shape, format)
+                for used, offsets, shape, format in (
+                    (row_free & column_free, (0, 0), (free, free), 'csc'),
+                    (~row_free & column_free, (free, 0), (restrained, free), 'csr'),
+                    (~row_free & ~column_free, (free, free), (restrained, restrained), 'csr'))]
+
+    @property
+    def reorder_stiffness(self):
+        """
+        Reordered stiffness matrix of the last solve [[K_ff, K_fr], [K_rf,
+        K_rr]], in the partitioned assembly it is built from the blocks
+        when it is requested
+        """
+        if self._reorder_stiffness is not None:
+            return self._reorder_stiffness
+        if issparse(self.stiffness_ff):
+            import scipy.sparse as sp
+            return sp.bmat([[self.stiffness_ff, self.stiffness_rf.T], [self.stiffness_rf, self.stiffness_rr]], format='csc')
+        return np.block([[self.stiffness_ff, self.stiffness_rf.T], [self.stiffness_rf, self.stiffness_rr]])
 
     @property
     def elastic_constants(self):
-        sorted_nodes = sorted(self._nodes, key=lambda node: node.no)
-        return np.concatenate([node.elastic_constants[~np.array(node.release)] for node in sorted_nodes])
+        return np.array(self.plan.elastic_constants)
 
     @property
     def restrains(self):
-        sorted_nodes = sorted(self._nodes, key=lambda node: node.no)
-        return np.concatenate([node.restrains[~np.array(node.release)] for node in sorted_nodes])
+        return np.array(self.plan.restrains)
     
     @property
     def nodal_actions(self):
         """
         Move from forces in a single member to forces in the whole structure
             - node_action: Action Vecto of the whole structure
-            - no_list: 
         """
-        n = sum([node.number_not_released for node in self.nodes])
-        node_action = np.zeros(n)
-        sorted_nodes = sorted(self.nodes, key=lambda node: node.no)
-        for node in sorted_nodes:
-            node_indexes = self.indexes_grouped_by_node[node.no-1]
-            node_action[node_indexes] = node_action[node_indexes] + node.action[~np.array(node.release)]
-        return node_action
+        plan = self.plan
+        if self._model is not None:
+            node_actions = self._model.node_actions
+        else:
+            node_actions = np.hstack((
+                np.array([node.force.components for node in plan.nodes], dtype=float).reshape(-1, 3),
+                np.array([node.moment.components for node in plan.nodes], dtype=float).reshape(-1, 3)))
+        # Kept for the result (see _result)
+        self._node_actions = node_actions
+        return self._scatter_node_actions(node_actions)
+
+    def _scatter_node_actions(self, node_actions: np.ndarray, plan: DofPlan=None) -> np.ndarray:
+        """
+        Actions of every node (shape (nodes, 6)) moved to the structure
+        indexes of plan (the plan of the structure by default), shape
+        (number of degrees,)
+        """
+        plan = plan or self.plan
+        not_released = plan.node_degrees >= 0
+        return np.bincount(plan.node_degrees[not_released], node_actions[not_released],
+                minlength=plan.number_of_degrees)
 
     @property
     def member_load_actions(self):
-        n = sum([node.number_not_released for node in self.nodes])
-        member_load_action = np.zeros(n)
-        for member in self.members:
-            equivalent_joint_loads = member.structure_oriented_equivalent_joint_loads
-            node_1_equivalent_joint_loads = equivalent_joint_loads[:member.node_1_number_not_released]
-            node_2_equivalent_joint_loads = equivalent_joint_loads[member.node_1_number_not_released:]
-            no_1, no_2 = member.node_1.no, member.node_2.no
-            node_1_indexes = self.indexes_grouped_by_node[no_1-1]
-            node_2_indexes = self.indexes_grouped_by_node[no_2-1]
-            node_1_not_released_indexes = [i for i, release in enumerate(member.node_1.release) if release == False]
-            node_2_not_released_indexes = [i for i, release in enumerate(member.node_2.release) if release == False]
-            node_1_bool_not_released = np.array(member.node_1.release)[node_1_not_released_indexes]
-            node_2_bool_not_released = np.array(member.node_2.release)[node_2_not_released_indexes]
-            member_node_1_bool_not_released = np.array(member.node_1_release)[node_1_not_released_indexes]
-            member_node_2_bool_not_released = np.array(member.node_2_release)[node_2_not_released_indexes]
-            node_1_bool = np.array([member_bool or nodal_bool for member_bool, nodal_bool in zip(member_node_1_bool_not_released, node_1_bool_not_released)])
-            node_2_bool = np.array([member_bool or nodal_bool for member_bool, nodal_bool in zip(member_node_2_bool_not_released, node_2_bool_not_released)])
-            node_1_indexes = np.array(node_1_indexes)[~node_1_bool]
-            node_2_indexes = np.array(node_2_indexes)[~node_2_bool]
-            member_load_action[node_1_indexes] = member_load_action[node_1_indexes] + node_1_equivalent_joint_loads
-            member_load_action[node_2_indexes] = member_load_action[node_2_indexes] + node_2_equivalent_joint_loads
+        """
+        Equivalent joint loads of the member loads, the fixed-end actions are
+        kept (in the members) for their end actions
+        """
+        self._refresh_members()
+        self._fixed_end_actions = -self._member_loads
+        member_load_action = self._structure_member_actions(self._member_loads)
+        if self._model is None:
+            for member, fixed_end_actions in zip(self._members, self._fixed_end_actions):
+                # Internal end actions of the member
+                member._end_action_values = fixed_end_actions
         return member_load_action
 
     @property
@@ -144,144 +713,501 @@ class Structure:
         Only works for displacements imposed at the supports, (does not work on
         unrestrained degrees).
         """
-        n = sum([node.number_not_released for node in self.nodes])
-        node_action = np.zeros(n)
-        for member in self.members:
-            equivalent_joint_loads = member.displacements_equivalent_joint_loads
-            node_1_equivalent_joint_loads = \
-                    equivalent_joint_loads[:member.node_1_number_not_released]
-            node_2_equivalent_joint_loads = \
-                    equivalent_joint_loads[member.node_1_number_not_released:]
-            no_1, no_2 = member.node_1.no, member.node_2.no
-            node_1_indexes = self.indexes_grouped_by_node[no_1-1]
-            node_2_indexes = self.indexes_grouped_by_node[no_2-1]
-            node_1_not_released_indexes = [i for i, release in 
-                    enumerate(member.node_1.release) if release == False]
-            node_2_not_released_indexes = [i for i, release in 
-                    enumerate(member.node_2.release) if release == False]
-            node_1_bool_not_released = np.array(member.node_1.release)\
-                    [node_1_not_released_indexes]
-            node_2_bool_not_released = np.array(member.node_2.release)\
-                    [node_2_not_released_indexes]
-            member_node_1_bool_not_released = np.array(member.node_1_release)\
-                    [node_1_not_released_indexes]
-            member_node_2_bool_not_released = np.array(member.node_2_release)\
-                    [node_2_not_released_indexes]
-            node_1_bool = np.array([member_bool or nodal_bool for member_bool,
-                nodal_bool in zip(member_node_1_bool_not_released, 
-                    node_1_bool_not_released)])
-            node_2_bool = np.array([member_bool or nodal_bool for member_bool,
-                nodal_bool in zip(member_node_2_bool_not_released, 
-                    node_2_bool_not_released)])
-            node_1_indexes = np.array(node_1_indexes)[~node_1_bool]
-            node_2_indexes = np.array(node_2_indexes)[~node_2_bool]
-            node_action[node_1_indexes] = node_action[node_1_indexes] + \
-                    node_1_equivalent_joint_loads
-            node_action[node_2_indexes] = node_action[node_2_indexes] + \
-                    node_2_equivalent_joint_loads
-        return node_action
+        plan = self.plan
+        node_action = np.zeros(plan.number_of_degrees)
+        if self._model is not None:
+            # The array models have no imposed displacements
+            self._imposed_displacements = np.zeros(plan.node_degrees.shape)
+            return node_action
+        node_displacements = np.array([node.displacements for node in plan.nodes], dtype=float).reshape(-1, 6)
+        # Kept for the end actions (see _end_actions)
+        self._imposed_displacements = node_displacements
+        if not node_displacements.any():
+            return node_action
+        # -K d of the members with displaced nodes (see
+        # Member.displacements_equivalent_joint_loads)
+        self._refresh_members()
+        displacements = np.where(self._member_release_masks, 0, node_displacements[plan.member_nodes].reshape(-1, 12))
+        displaced = np.flatnonzero(displacements.any(axis=1))
+        actions = -np.einsum('mij,mj->mi', self._member_stiffness[displaced], displacements[displaced])
+        member_degrees = plan.member_degrees[displaced]
+        kept = member_degrees >= 0
+        return np.bincount(member_degrees[kept], actions[kept], minlength=plan.number_of_degrees)
 
     @property
     def number_of_degrees_of_freedom(self):
         """
         Number of degrees that has not been restrained
         """
-        free_degrees = self.indexes[~self.restrains]
-        return len(free_degrees)
+        return self.plan.number_of_degrees_of_freedom
 
     @property
     def reorder_indexes(self):
         """
         Free Degrees first and restrained degrees last
         """
-        free_degrees = self.indexes[~self.restrains]
-        restrained_degrees = self.indexes[self.restrains]
-        return np.concatenate((free_degrees, restrained_degrees))
+        return self.plan.reorder_indexes
 
     @property
     def inverse_reorder_indexes(self):
         """
         Order of indexes to reverse the reorder_indexes
         """
-        inverse_reorder_indexes = []
-        for index in range(len(self.reorder_indexes)):
-            for j, i in enumerate(self.reorder_indexes):
-                if index == i:
-                    inverse_reorder_indexes.append(j)
-                    break
-        return inverse_reorder_indexes
+        return self.plan.inverse_reorder_indexes
+
+    def _node_results(self, displacements, reactions, elastic_reactions, plan: DofPlan=None):
+        """
+        Move the results of the free and restrained degrees to arrays by node
+        (of plan, the plan of the structure by default)
+
+        Parameters
+        ----------
+        displacements, elastic_reactions: np.ndarray
+            Results of the free degrees, shape (free,) or (free, k)
+        reactions: np.ndarray
+            Results of the restrained degrees, shape (restrained,) or (restrained, k)
+
+        Returns
+        -------
+        node_displacements, node_reactions: np.ndarray
+            Structure oriented displacements and reactions (supports and
+            elastic supports) of the nodes sorted by number, shape (nodes, 6)
+            or (nodes, 6, k)
+        """
+        plan = plan or self.plan
+        displacements = np.asarray(displacements)
+        # Back to the structure order: the free degrees are the first in
+        # reorder_indexes, so the inverse permutation gives their position
+        reorder_displacements = np.concatenate((displacements, np.zeros((len(reactions),) + displacements.shape[1:])))
+        reorder_reactions = np.concatenate((elastic_reactions, reactions))
+        full_displacements = reorder_displacements[plan.inverse_reorder_indexes]
+        full_reactions = reorder_reactions[plan.inverse_reorder_indexes]
+        not_released = plan.node_degrees >= 0
+        node_displacements = np.zeros(not_released.shape + displacements.shape[1:])
+        node_reactions = np.zeros(not_released.shape + displacements.shape[1:])
+        node_displacements[not_released] = full_displacements[plan.node_degrees[not_released]]
+        node_reactions[not_released] = full_reactions[plan.node_degrees[not_released]]
+        return node_displacements, node_reactions
 
     def _redistribution(self):
         """
         Redistribute the displacements and the actions to their respective 
         node object
         """
-        displacements_reorder_indexes = self.reorder_indexes[:self.number_of_degrees_of_freedom]
-        actions_reorder_indexes = self.reorder_indexes[self.number_of_degrees_of_freedom:]
-        for node in self._nodes:
-            actions = []
-            displacements = []
-            elastic_actions = []
-            new_actions = []
-            new_displacements = []
-            new_elastic_actions = []
-            count = 0
-            for index in displacements_reorder_indexes:
-                # check if index correspond to the displacements index 
-                if index in self.indexes_grouped_by_node[node.no-1]:
-                    displacements.append(self.displacements[count])
-                    elastic_actions.append(self.elastic_reactions[count])
-                count = count + 1
-            count = 0
-            for index in actions_reorder_indexes:
-                # check if index correspond to the displacements index 
-                if index in self.indexes_grouped_by_node[node.no-1]:
-                    actions.append(self.reactions[count])
-                count = count + 1
-            for restrain, release in zip(node.restrains, node.release):
-                if restrain == False and release == False:
-                    # if its a degree of freedom
-                    new_actions.append(0)
-                    new_displacements.append(displacements[0])
-                    new_elastic_actions.append(elastic_actions[0])
-                    displacements.pop(0)
-                    elastic_actions.pop(0)
-                elif restrain == False and release == True:
-                    new_actions.append(0)
-                    new_displacements.append(0)
-                    new_elastic_actions.append(0)
-                elif restrain == True and release == False:
-                    new_actions.append(actions[0])
-                    new_displacements.append(0)
-                    new_elastic_actions.append(0)
-                    actions.pop(0)
-                elif restrain == True and release == True:
-                    new_actions.append(0)
-                    new_displacements.append(0)
-                    new_elastic_actions.append(0)
-            node.force = node.force + Force(new_actions[:3]) + Force(new_elastic_actions[:3])
-            node.moment = node.moment + Moment(new_actions[3:]) + Moment(new_elastic_actions[3:])
-            node._displacements = node._displacements + np.array(new_displacements)
+        node_displacements, node_reactions = self._node_results(
+                self.displacements, self.reactions, self.elastic_reactions)
+        # Results of the last solve by node (sorted by number), shape (nodes, 6)
+        self.node_displacements = node_displacements
+        self.node_reactions = node_reactions
+        self._write_node_results(self.plan.nodes, node_displacements, node_reactions)
+
+    def _write_node_results(self, nodes, node_displacements: np.ndarray, node_reactions: np.ndarray):
+        """
+        Add the reactions to the force and moment of the nodes and the
+        displacements to their imposed displacements, the applied values
+        are kept so the next solve starts from them (see
+        _restore_node_actions)
+        """
+        written = []
+        for node, displacements, reactions in zip(nodes, node_displacements, node_reactions):
+            force, moment, imposed = node._force, node._moment, node._displacements
+            node._force = Force(force.components + reactions[:3])
+            node._moment = Moment(moment.components + reactions[3:])
+            node._displacements = imposed + displacements
+            written.append((node, force, moment, imposed, node._force, node._moment, node._displacements))
+        self._written_node_results = written
+
+    def _restore_node_actions(self):
+        """
+        Remove the results written in the nodes by the last solve (a solve
+        again gives the same results), the actions and displacements
+        assigned after that solve are kept
+        """
+        for node, force, moment, imposed, written_force, written_moment, written_displacements \
+                in self._written_node_results:
+            if node._force is written_force:
+                node._force = force
+            if node._moment is written_moment:
+                node._moment = moment
+            if node._displacements is written_displacements:
+                node._displacements = imposed
+        self._written_node_results = []
+
+    def _default_solver(self) -> Solver:
+        """
+        Solver used when none is given (see solver.default_solver)
+        """
+        return default_solver(self.sparse)
+
+    def _factorization_state(self) -> tuple:
+        sparse = self.sparse or self.solver.sparse
+        return (self.plan, self.solver, self.solver.generation, sparse, self.partitioned)
+
+    def _assembly_state(self) -> tuple:
+        sparse = self.sparse or self.solver.sparse
+        return (self.plan, sparse, self.partitioned)
+
+    def _factorize(self):
+        """
+        Assemble the blocks of the reordered stiffness matrix (elastic
+        supports included) and factorize the free-free block with the solver
+
+        Nothing is assembled nor factorized if the solver still holds the
+        factorization of the stiffness (e.g: only the loads changed), the
+        stiffness changes of a few members are added to the blocks and to
+        the factorization (see _update_stiffness)
+        """
+        if self.solver is None:
+            self.solver = self._default_solver()
+        self._refresh_members()
+        if self._model is None and self._factorization_key == self._factorization_state():
+            if not self._stiffness_updates:
+                count('factorization_reused')
+                return
+            if self.partitioned:
+                self._update_stiffness()
+                return
+        self._assemble()
+        submatrix_to_solve = self.stiffness_ff
+        # Node of each free degree (block preconditioners)
+        self.solver.blocks = self.plan.degree_nodes[self.reorder_indexes[:self.number_of_degrees_of_freedom]]
+        self.solver.ordered = self.plan.ordering is not None
+        with phase('factorization', method=type(self.solver).__name__):
+            self.solver.factorize(submatrix_to_solve)
+        self._factorization_key = self._factorization_state()
+
+    def _assemble(self):
+        """
+        Assemble the blocks of the reordered stiffness matrix (elastic
+        supports included), nothing is assembled if the blocks are still
+        the ones of the stiffness (e.g: assembled before the first solve)
+        """
+        if self.solver is None:
+            self.solver = self._default_solver()
+        self._refresh_members()
+        if self._model is None and not self._stiffness_updates and \
+                self._assembly_key == self._assembly_state():
+            return
+        self._stiffness_updates = []
+        free = self.number_of_degrees_of_freedom
+        with phase('assembly', partitioned=self.partitioned):
+            # Sparse assembly for the sparse and banded solvers too
+            sparse = self.sparse or self.solver.sparse
+            if self.partitioned:
+                self._reorder_stiffness = None
+                self.stiffness_ff, self.stiffness_rf, self.stiffness_rr = self.partitioned_stiffness(sparse)
+            else:
+                if sparse:
+                    import scipy.sparse as sp
+                    # Elastic Support Effects
+                    new_structure_stiffness = self.sparse_structure_stiffness + sp.diags(self.elastic_constants.astype(float), format='csr')
+                    self._reorder_stiffness = new_structure_stiffness[self.reorder_indexes, :].tocsc()[:, self.reorder_indexes]
+                else:
+                    new_structure_stiffness = self.structure_stiffness + np.diag(self.elastic_constants) # Elastic Support Effects
+                    self._reorder_stiffness = new_structure_stiffness[:, self.reorder_indexes][self.reorder_indexes, :]
+                self.stiffness_ff = self._reorder_stiffness[:free, :free]
+                self.stiffness_rf = self._reorder_stiffness[free:, :free]
+                self.stiffness_rr = self._reorder_stiffness[free:, free:]
+        self._assembly_key = self._assembly_state()
+
+    def _update_stiffness(self):
+        """
+        Add the stiffness changes of the members (see _refresh_members) to
+        the blocks of the reordered stiffness matrix and to the
+        factorization, as a low rank update of a direct solver (see
+        Solver.update) while the rows of the free-free block changed since
+        its factorization are at most low_rank_limit, otherwise the block is
+        factorized again
+        """
+        rows = np.concatenate([rows for rows, _ in self._stiffness_updates])
+        deltas = np.concatenate([delta for _, delta in self._stiffness_updates])
+        self._stiffness_updates = []
+        with phase('assembly', partitioned=True, members=len(rows)):
+            blocks = self._block_triplets(*self._degree_triplets(self.plan.member_degrees[rows], deltas))
+            for name, (block_rows, block_columns, values, shape, format) in zip(
+                    ('stiffness_ff', 'stiffness_rf', 'stiffness_rr'), blocks):
+                block = getattr(self, name)
+                if issparse(block):
+                    import scipy.sparse as sp
+                    setattr(self, name, (block + sp.coo_matrix((values, (block_rows, block_columns)),
+                        shape=shape)).asformat(format))
+                else:
+                    # A new block, the one of a solve in progress is kept (see _solve_state)
+                    block = block.copy()
+                    np.add.at(block, (block_rows, block_columns), values)
+                    setattr(self, name, block)
+        block_rows, block_columns, values = blocks[0][:3]
+        changed = values != 0
+        block_rows, block_columns, values = block_rows[changed], block_columns[changed], values[changed]
+        indexes = np.unique(np.concatenate((block_rows, block_columns)))
+        with phase('factorization', method=type(self.solver).__name__, update=len(indexes)):
+            if self.solver.direct and self.solver.update_rank + len(indexes) <= self.low_rank_limit:
+                delta = np.zeros((len(indexes), len(indexes)))
+                np.add.at(delta, (np.searchsorted(indexes, block_rows), np.searchsorted(indexes, block_columns)), values)
+                self.solver.update(indexes, delta)
+            else:
+                self.solver.factorize(self.stiffness_ff)
+        self._factorization_key = self._factorization_state()
 
     def _solve(self):
-        self.action_combined = self.nodal_actions + self.member_load_actions + \
-                self.displacements_effects
+        # The results written in the nodes by the last solve are removed
+        self._restore_node_actions()
+        with phase('load_vector'):
+            with phase('nodal_actions'):
+                nodal_actions = self.nodal_actions
+            with phase('member_load_actions'):
+                member_load_actions = self.member_load_actions
+            with phase('displacements_effects'):
+                displacements_effects = self.displacements_effects
+            self.action_combined = nodal_actions + member_load_actions + displacements_effects
         # Action Vector
         self.reorder_action_combined = self.action_combined[self.reorder_indexes]
-        # Stiffness Matrix
-        effective_elastic_constants = self.elastic_constants[self.reorder_indexes]\
-                [:self.number_of_degrees_of_freedom]
-        new_structure_stiffness = self.structure_stiffness + np.diag(self.elastic_constants) # Elastic Support Effects
-        self.reorder_stiffness = new_structure_stiffness[:, self.reorder_indexes][self.reorder_indexes, :]
+        self._factorize()
         # Solving
-        submatrix_to_solve = self.reorder_stiffness[:self.number_of_degrees_of_freedom,:self.number_of_degrees_of_freedom]
-        subvector_to_solve = self.reorder_action_combined[:self.number_of_degrees_of_freedom]
-        self.displacements = np.linalg.inv(submatrix_to_solve) @ subvector_to_solve
-        self.reactions = -self.reorder_action_combined[self.number_of_degrees_of_freedom:] + self.reorder_stiffness[self.number_of_degrees_of_freedom:,:self.number_of_degrees_of_freedom] @ self.displacements
-        self.elastic_reactions = -self.displacements * effective_elastic_constants
-
-    def solve(self):
-        self._solve()
-        self._redistribution()
-        for member in self.members:
-            member._end_actions()
+        with phase('back_substitution'):
+            self.displacements, self.reactions, self.elastic_reactions, self.solver_statistics = \
+                    self._back_substitution(self.reorder_action_combined)
+
+    def _back_substitution(self, reorder_action: np.ndarray, state: _SolveState=None):
+        """
+        Solve a reordered action vector, or matrix with one column per
+        right hand side, with the factorization of the solver (see
+        _factorize) or the one of state, the structure is not modified
+
+        Returns
+        -------
+        displacements: np.ndarray
+            Displacements of the free degrees
+        reactions: np.ndarray
+            Reactions of the restrained degrees
+        elastic_reactions: np.ndarray
+            Reactions of the elastic supports of the free degrees
+        solver_statistics: dict
+            Statistics of the solver (see Solver.statistics)
+        """
+        state = state or self._solve_state()
+        plan = state.plan
+        free = plan.number_of_degrees_of_freedom
+        effective_elastic_constants = np.asarray(plan.elastic_constants)[plan.reorder_indexes][:free]
+        # IterativeSolver keeps the statistics and the start of the next
+        # solve, its solves do not run in parallel
+        with contextlib.nullcontext() if state.solver.direct else self._lock:
+            displacements = state.solver.solve(reorder_action[:free])
+            solver_statistics = dict(state.solver.statistics)
+        reactions = -reorder_action[free:] + state.stiffness_rf @ displacements
+        elastic_reactions = -displacements * effective_elastic_constants.reshape(
+                (-1,) + (1,)*(displacements.ndim - 1))
+        return displacements, reactions, elastic_reactions, solver_statistics
+
+    def _member_end_actions(self, node_displacements: np.ndarray, fixed_end_actions: np.ndarray,
+            state: _SolveState=None) -> np.ndarray:
+        """
+        Member oriented end actions of every member (K T d plus the fixed-end
+        actions), zero at the released degrees, shape (members, 12), or
+        (members, 12, k) for node displacements of shape (nodes, 6, k), the
+        arrays of the members must be up to date (see _refresh_members), or
+        the ones of state
+        """
+        state = state or self._solve_state()
+        displacements = node_displacements[state.plan.member_nodes]
+        displacements = displacements.reshape((len(displacements), 12) + displacements.shape[3:])
+        # The released degrees are excluded (as in the assembly)
+        releases = state.member_release_masks.reshape(state.member_release_masks.shape + (1,)*(displacements.ndim - 2))
+        displacements = np.where(releases, 0, displacements)
+        return np.einsum('mij,mj...->mi...', state.member_kt, displacements) + fixed_end_actions
+
+    def profile(self, memory: bool=False, callbacks=()) -> Profiler:
+        """
+        Profiler of the phases of the analysis (see profiling.Profiler), use
+        it as a context manager around solve
+
+        Parameters
+        ----------
+        memory: bool
+            If True the memory allocated by every phase is measured
+        callbacks: list
+            Functions called with every phase event when the phase ends
+        """
+        return Profiler(memory, callbacks)
+
+    def solve(self, load_case: LoadCase=None) -> AnalysisResult:
+        """
+        Solve the loads of the model, the results are written in the nodes
+        (reactions added to their force and moment, displacements added to
+        their imposed displacements) and members (end actions), or solve a
+        load case without modifying the model
+
+        The solves of load cases share the factorization of the stiffness
+        matrix and can run in parallel threads while the model does not
+        change, e.g: ThreadPoolExecutor().map(structure.solve, load_cases)
+
+        Returns
+        -------
+        result: AnalysisResult
+            Results of the solve, the result of the loads of the model is
+            kept in result too
+        """
+        if load_case is not None:
+            return self._solve_load_case(load_case)
+        with self._lock, phase('solve'):
+            self._solve()
+            with phase('redistribution'):
+                self._redistribution()
+            # New generation, the cached results of the members are dropped
+            self.solve_generation = next(_solve_generations)
+            with phase('end_actions', members=len(self._members)):
+                # Batched, one call per member
+                with phase('member_end_actions', calls=len(self._members)):
+                    self._end_actions()
+            self.result = self._result()
+        return self.result
+
+    def _result(self) -> AnalysisResult:
+        """
+        AnalysisResult of the last solve of the loads of the model (copies
+        of the arrays of the structure)
+        """
+        return AnalysisResult(None, self.solve_generation, self.plan.node_ids, self.displacements, self.reactions,
+                self._node_actions, self._imposed_displacements, self.node_displacements,
+                self.node_reactions, self.member_end_actions, solver_statistics=self.solver_statistics,
+                **self._result_serial_numbers())
+
+    def _result_serial_numbers(self) -> dict:
+        """
+        Serial numbers of the Node and Member objects of the rows of the
+        results (see AnalysisResult)
+        """
+        return {'node_serial_numbers': [node._serial_number for node in self.plan.nodes],
+                'member_serial_numbers': [member._serial_number for member in self._members]}
+
+    def _solve_state(self) -> _SolveState:
+        """
+        The plan, the solver, the blocks and the arrays of the members a
+        solve reads (see _SolveState), they are replaced when the model
+        changes, never modified in place, so a state taken holding the lock
+        is the one of a single model while other threads change it
+        """
+        return _SolveState(self)
+
+    def _solve_load_case(self, load_case: LoadCase) -> AnalysisResult:
+        """
+        Solve a load case (see solve), only the assembly and the
+        factorization (when the model changed) hold the lock, the solve
+        reads the state taken with them (see _solve_state)
+        """
+        with phase('solve', load_case=load_case.name):
+            with self._lock:
+                self._materialize()
+                self._factorize()
+                generation = self.solve_generation
+                state = self._solve_state()
+                serial_numbers = self._result_serial_numbers()
+            plan = state.plan
+            with phase('load_vector'):
+                node_actions, member_oriented, action = self._load_case_vector(load_case, state)
+            with phase('back_substitution'):
+                displacements, reactions, elastic_reactions, solver_statistics = \
+                        self._back_substitution(action[plan.reorder_indexes], state)
+            node_displacements, node_reactions = self._node_results(displacements, reactions, elastic_reactions, plan)
+            with phase('end_actions', members=len(plan.member_nodes)):
+                member_end_actions = self._member_end_actions(node_displacements, -member_oriented, state)
+        return AnalysisResult(load_case.name, generation, plan.node_ids, displacements,
+                reactions, node_actions, np.zeros(node_actions.shape), node_displacements, node_reactions,
+                member_end_actions, solver_statistics=solver_statistics, **serial_numbers)
+
+    def _load_case_vector(self, load_case: LoadCase, state: _SolveState=None):
+        """
+        Actions of a load case, the arrays of the members must be up to date
+        (see _refresh_members), or the ones of state
+
+        Returns
+        -------
+        node_actions: np.ndarray
+            Structure oriented actions applied at every node, shape (nodes, 6)
+        member_oriented: np.ndarray
+            Member oriented equivalent joint loads of the member loads, shape
+            (members, 12)
+        action: np.ndarray
+            Action vector (nodal actions plus equivalent joint loads), shape
+            (number of degrees,)
+        """
+        state = state or self._solve_state()
+        plan = state.plan
+        node_actions = np.zeros(plan.node_degrees.shape)
+        for node, node_action in load_case.node_actions.items():
+            node_actions[plan.node_indexes[node]] += node_action
+        table = MemberLoadTable.from_member_loads(len(plan.member_nodes), {
+            state.member_rows[member]: loads for member, loads in load_case.member_loads.items()})
+        member_oriented, member_action = self._member_equivalent_joint_loads(table, state)
+        return node_actions, member_oriented, self._scatter_node_actions(node_actions, plan) + member_action
+
+    def _end_actions(self):
+        """
+        End actions of every member (batched, see _member_end_actions), set
+        in the members of the object models
+        """
+        self._refresh_members()
+        # Total displacements of the nodes (imposed plus computed)
+        self.member_end_actions = self._member_end_actions(self._imposed_displacements + self.node_displacements,
+                self._fixed_end_actions)
+        if self._model is not None:
+            return
+        for member, end_actions in zip(self._members, self.member_end_actions):
+            # The Force and Moment objects are built when they are requested
+            member._end_action_values = end_actions
+            member._solve_generation = self.solve_generation
+
+    @property
+    def load_case_actions(self):
+        """
+        Action matrix of the load cases, one column per load case (nodal
+        actions plus equivalent joint loads of the member loads)
+        """
+        self._materialize()
+        self._refresh_members()
+        actions = np.zeros((self.plan.number_of_degrees, len(self._load_cases)))
+        for column, load_case in enumerate(self._load_cases):
+            actions[:, column] = self._load_case_vector(load_case)[2]
+        return actions
+
+    def solve_load_cases(self) -> Dict[str, LoadCaseResult]:
+        """
+        Solve every load case with a single factorization of the stiffness
+        matrix, the nodes and members of the model are not modified
+
+        Returns
+        -------
+        load_case_results: Dict[str, LoadCaseResult]
+            Results of each load case by name (also stored in
+            load_case_results)
+        """
+        with self._lock:
+            self._materialize()
+            self._factorize()
+            state = self._solve_state()
+        plan = state.plan
+        # One column per load case (see _load_case_vector)
+        member_oriented = np.zeros((len(plan.member_nodes), 12, len(self._load_cases)))
+        actions = np.zeros((plan.number_of_degrees, len(self._load_cases)))
+        for column, load_case in enumerate(self._load_cases):
+            _, member_oriented[..., column], actions[:, column] = self._load_case_vector(load_case, state)
+        displacements, reactions, elastic_reactions, self.solver_statistics = \
+                self._back_substitution(actions[plan.reorder_indexes], state)
+        node_displacements, node_reactions = self._node_results(displacements, reactions, elastic_reactions, plan)
+        member_end_actions = self._member_end_actions(node_displacements, -member_oriented, state)
+        # Arrays by load case, shape (load cases, nodes, 6) and (load cases, members, 12)
+        node_displacements = np.moveaxis(node_displacements, -1, 0)
+        node_reactions = np.moveaxis(node_reactions, -1, 0)
+        member_end_actions = np.moveaxis(member_end_actions, -1, 0)
+        self.load_case_results = {}
+        for column, load_case in enumerate(self._load_cases):
+            self.load_case_results[load_case.name] = LoadCaseResult(
+                    load_case.name,
+                    plan.nodes,
+                    self._members,
+                    displacements[:, column],
+                    reactions[:, column],
+                    node_displacements[column],
+                    node_reactions[column],
+                    member_end_actions[column])
+        return self.load_case_results
@@ -0,0 +1,52 @@
+"""
+This module defines the Tracked mixin
+
+A Tracked object notifies its observers (e.g. the structures that contain
+it) when one of its tracked attributes is assigned, so the observers can
+drop whatever they computed from the old value.
+
+Notes
+-----
+The subclasses declare __slots__ (the models have many nodes and members),
+the weak references of the observers use the __weakref__ slot.
+
+Only assignments are detected, in place modifications of mutable attributes
+(e.g. node.release[0] = True) are not, assign a new object instead.
+"""
+import weakref
+
+
+class Tracked:
+    """
+    Mixin that notifies the observers when a tracked attribute is assigned
+
+    Attributes
+    ----------
+    _tracked_attributes: frozenset
+        Names of the attributes that notify the observers
+    """
+    __slots__ = ('_observers', '__weakref__')
+    _tracked_attributes = frozenset()
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name in self._tracked_attributes:
+            self._notify(name)
+
+    def _notify(self, name: str):
+        """
+        Call _changed(self, name) of every observer
+        """
+        observers = getattr(self, '_observers', None)
+        if observers:
+            for observer in list(observers):
+                observer._changed(self, name)
+
+    def _observe(self, observer):
+        """
+        Add an observer, it must implement _changed(tracked, name), only a
+        weak reference to the observer is kept
+        """
+        if getattr(self, '_observers', None) is None:
+            object.__setattr__(self, '_observers', weakref.WeakSet())
+        self._observers.add(observer)
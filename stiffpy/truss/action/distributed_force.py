@@ -3,6 +3,8 @@ from ...action.distributed_force import DistributedForce as DF
 
 
 class DistributedForce(DF):
+    __slots__ = ()
+
     def __init__(self,
             inital_magnitude: Tuple[float, float],
             final_magnitude: Tuple[float, float],
@@ -2,5 +2,7 @@ from ...action.actions import Moment
 
 
 class Moment(Moment):
+    __slots__ = ()
+
     def __init__(self, magnitude: float):
         super().__init__((0, 0, magnitude))
@@ -4,6 +4,8 @@ from ..section import Section
 
 
 class Member(Member):
+    __slots__ = ()
+
     def __init__(self, node_1: Node, node_2: Node, section: Section):
         super().__init__(
                 node_1,
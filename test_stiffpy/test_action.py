@@ -4,6 +4,7 @@ from numpy.testing import assert_almost_equal
 from stiffpy.action.actions import Moment, Force
 from stiffpy.action.distributed_force import DistributedForce
 from stiffpy.member import Member
+from stiffpy.member_loads import MemberLoadTable
 from stiffpy.node import Node
 from stiffpy.section import Section
 from stiffpy.material import Material
@@ -71,6 +72,49 @@ class TestAction(unittest.TestCase):
         assert_almost_equal(force_2.components, np.array([0, .07, .07]), decimal=2)
         assert_almost_equal(moment_2.components, np.array([0, 0, 0]), decimal=2)
 
+    def test_force_equivalent_loads_pinned(self):
+        """
+        Test Force equivalent joint loads for a beam with both ends articulated
+        (the moments of both ends are released together)
+        """
+        member = Member(
+                self.node_1,
+                self.node_2,
+                self.section,
+                node_1_release=(False,False,False,False,True,True),
+                node_2_release=(False,False,False,False,True,True))
+        member.forces = (.3, self.force)
+        force_1, moment_1, force_2, moment_2 = member.member_oriented_equivalent_joint_loads
+        assert_almost_equal(force_1.components, np.array([.7, .7, .7]))
+        assert_almost_equal(moment_1.components, np.array([0, 0, 0]))
+        assert_almost_equal(force_2.components, np.array([.3, .3, .3]))
+        assert_almost_equal(moment_2.components, np.array([0, 0, 0]))
+
+    def test_load_table(self):
+        """
+        Test the vectorized equivalent joint loads against the ones of each
+        action
+        """
+        rng = np.random.default_rng(1)
+        releases = [(False,)*12, (False,)*4 + (True, True) + (False,)*6,
+                (False,)*10 + (True, True), (False,)*4 + (True, True) + (False,)*4 + (True, True)]
+        lengths = [1, 2.5, 4, 3]
+        member_loads = {}
+        expected = np.zeros((len(lengths), 12))
+        for row, (length, release) in enumerate(zip(lengths, releases)):
+            actions = (Force(rng.normal(size=3)), Moment(rng.normal(size=3)),
+                    DistributedForce(rng.normal(size=3), rng.normal(size=3), length/3))
+            for action in actions:
+                action.position = length*rng.uniform(0, .6)
+                action.member_length = length
+                action.node_1_releases = release[:6]
+                action.node_2_releases = release[6:]
+                action.member_section = self.section
+                expected[row] += np.concatenate([load.components for load in action.compute_equivalent_joint_loads()])
+            member_loads[row] = ([actions[0]], [actions[1]], [actions[2]])
+        table = MemberLoadTable.from_member_loads(len(lengths), member_loads)
+        self.assertEqual(len(table), 12)
+        assert_almost_equal(table.equivalent_joint_loads(lengths, releases), expected)
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,108 @@
+import pickle
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from numpy.testing import assert_allclose
+from stiffpy import frame
+from stiffpy.analysis_result import AnalysisResult
+from stiffpy.load_case import LoadCase
+from stiffpy.section import Section
+from test_stiffpy.test_structure import two_bay_frame
+
+
+class TestAnalysisResult(unittest.TestCase):
+    def setUp(self):
+        self.structure = two_bay_frame()
+        self.result = self.structure.solve()
+
+    def test_views(self):
+        self.assertIs(self.result, self.structure.result)
+        for node in self.structure.nodes:
+            view = self.result.node(node)
+            assert_allclose(view.force.components, node.force.components, atol=1e-9)
+            assert_allclose(view.moment.components, node.moment.components, atol=1e-9)
+            assert_allclose(view.displacements, node.displacements, atol=1e-12)
+            assert_allclose(self.result.node(node.no).reaction, self.result.node_reaction(node))
+        for row, member in enumerate(self.structure.members):
+            view = self.result.member(member)
+            self.assertEqual(view.row, row)
+            for name in ('force_left', 'moment_left', 'force_right', 'moment_right'):
+                assert_allclose(getattr(view, name).components, getattr(member, name).components)
+            assert_allclose(self.result.end_actions(row), member.end_actions)
+        with self.assertRaises(KeyError):
+            self.result.node(100)
+        with self.assertRaises(KeyError):
+            self.result.member(frame.Member(frame.Node((0, 0), no=101), frame.Node((1, 0), no=102),
+                self.structure.members[0].section))
+
+    def test_immutable(self):
+        with self.assertRaises(AttributeError):
+            self.result.name = 'other'
+        with self.assertRaises(ValueError):
+            self.result.node_displacements[0, 0] = 1
+        # The arrays are not shared with the structure
+        self.structure.node_displacements[0, 0] = 1
+        self.assertEqual(self.result.node_displacements[0, 0], 0)
+
+    def test_results_coexist(self):
+        node = self.structure.members[0].node_2
+        displacements = self.result.node_displacement(node).copy()
+        node.force = frame.Force((10, 0))
+        result = self.structure.solve()
+        self.assertIsNot(result, self.result)
+        self.assertGreater(result.generation, self.result.generation)
+        assert_allclose(self.result.node_displacement(node), displacements)
+        self.assertFalse(np.allclose(result.node_displacement(node), displacements))
+
+    def test_pickle(self):
+        result = pickle.loads(pickle.dumps(self.result))
+        self.assertIsInstance(result, AnalysisResult)
+        assert_allclose(result.member_end_actions, self.result.member_end_actions)
+        assert_allclose(result.end_actions(self.structure.members[2]), self.result.end_actions(2))
+        self.assertFalse(result.node_reactions.flags.writeable)
+
+    def test_load_cases_in_parallel(self):
+        members = self.structure.members
+        cases = []
+        for i in range(6):
+            load_case = LoadCase(f'case {i}')
+            load_case.add_node_force(members[i % 3].node_2, frame.Force((i + 1, 0)))
+            load_case.add_distributed_load(members[3], 0, frame.DistributedForce((0, -i), (0, -i), 5))
+            cases.append(load_case)
+        self.structure.load_cases = cases
+        expected = self.structure.solve_load_cases()
+        forces = [node.force.components.copy() for node in self.structure.nodes]
+        end_actions = [member.end_actions for member in members]
+        with ThreadPoolExecutor(3) as executor:
+            results = list(executor.map(self.structure.solve, cases))
+        for load_case, result in zip(cases, results):
+            self.assertEqual(result.name, load_case.name)
+            assert_allclose(result.displacements, expected[load_case.name].displacements, atol=1e-12)
+            assert_allclose(result.reactions, expected[load_case.name].reactions, atol=1e-9)
+            assert_allclose(result.member_end_actions, expected[load_case.name].member_end_actions, atol=1e-9)
+        # The model and its result are not modified
+        for node, force in zip(self.structure.nodes, forces):
+            assert_allclose(node.force.components, force)
+        for member, values in zip(members, end_actions):
+            assert_allclose(member.end_actions, values)
+        self.assertIsNone(self.structure.result.name)
+
+    def test_solve_state(self):
+        members = self.structure.members
+        load_case = LoadCase('case')
+        load_case.add_node_force(members[0].node_2, frame.Force((10, 0)))
+        expected = self.structure.solve(load_case)
+        state = self.structure._solve_state()
+        arrays = [state.member_kt.copy(), state.stiffness_rf.copy()]
+        # A stiffness change (low rank update) after the state is taken
+        members[1].section = Section(A=0.08, Ix=.2**4/6, material=members[1].section.material)
+        self.assertFalse(np.allclose(self.structure.solve(load_case).displacements, expected.displacements))
+        assert_allclose(state.member_kt, arrays[0])
+        assert_allclose(state.stiffness_rf, arrays[1])
+        action = self.structure._load_case_vector(load_case, state)[2]
+        displacements = self.structure._back_substitution(action[state.plan.reorder_indexes], state)[0]
+        assert_allclose(displacements, expected.displacements, atol=1e-12)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+import numpy as np
+from numpy.testing import assert_allclose
+from stiffpy.material import Material
+from stiffpy.section import Section
+from stiffpy.diagram import Diagram, linear_load_terms
+from stiffpy.beam import *
+from stiffpy import node, member
+from stiffpy.structure import Structure
+from stiffpy.action.actions import Moment
+
+
+class TestDiagram(unittest.TestCase):
+    def setUp(self):
+        # Simply supported beam of span 10 with a point force -6 at 7
+        self.bending = Diagram.from_terms(10, [(0, [0, 1.8]), (7, [0, -6])])
+
+    def test_evaluate(self):
+        assert_allclose(self.bending.evaluate([0, 5, 7, 10]), [0, 9, 12.6, 0], atol=1e-12)
+        self.assertAlmostEqual(self.bending(8.5), 6.3)
+        self.assertEqual(len(self.bending.coefficients), 2)
+
+    def test_extrema(self):
+        self.assertEqual(self.bending.maximum(), (7, 12.6))
+        self.assertAlmostEqual(self.bending.minimum()[1], 0)
+        shear = self.bending.derivative()
+        assert_allclose(shear.evaluate([6.9, 7]), [1.8, -4.2])
+        assert_allclose(shear.antiderivative().evaluate(self.bending.breakpoints), [0, 12.6, 0], atol=1e-12)
+
+    def test_linear_load(self):
+        # Triangular load from 0 to 3 between 2 and 8, its resultant and moment
+        load = Diagram.from_terms(10, linear_load_terms(2, 6, 0, 3))
+        shear = Diagram.from_terms(10, linear_load_terms(2, 6, 0, 3, 1))
+        bending = Diagram.from_terms(10, linear_load_terms(2, 6, 0, 3, 2))
+        assert_allclose(load.evaluate([1, 5, 9]), [0, 1.5, 0])
+        assert_allclose(shear.evaluate(10), 9)
+        assert_allclose(bending.evaluate(10), 9*(10 - 6))
+        assert_allclose(load.antiderivative().evaluate(np.linspace(0, 10, 11)),
+                shear.evaluate(np.linspace(0, 10, 11)), atol=1e-12)
+
+    def test_operations(self):
+        other = Diagram.from_terms(10, [(0, [1]), (4, [2])])
+        total = self.bending + 2*other - 1
+        x = np.linspace(0, 10, 21)
+        assert_allclose(total(x), self.bending(x) + 2*other(x) - 1)
+        assert_allclose(total.breakpoints, [0, 4, 7, 10])
+        assert_allclose((-other)(x), -other(x))
+        assert_allclose(other.roots(), [])
+        assert_allclose((self.bending - 6.3).roots(), [3.5, 8.5])
+
+    def test_linear_combination_extremes(self):
+        cubic = Diagram.from_terms(10, linear_load_terms(2, 6, 0, 3, 2))
+        quartic = Diagram.from_terms(10, linear_load_terms(1, 5, -2, 4, 3))
+        factors = np.array([[1.2, -0.4, 0], [-1, 0.3, 2], [0, 1, -1.5], [0.9, 0.9, 0.9]])
+        for diagrams in ([self.bending, cubic, Diagram.from_terms(10, [(0, [1]), (4, [2])])],
+                [self.bending, cubic, quartic]):
+            combined = [sum(factor*diagram for factor, diagram in zip(row, diagrams))
+                    for row in factors]
+            maximum, minimum = Diagram.linear_combination_extremes(diagrams, factors)
+            assert_allclose(maximum, max((diagram.maximum() for diagram in combined), key=lambda peak: peak[1]))
+            assert_allclose(minimum, min((diagram.minimum() for diagram in combined), key=lambda peak: peak[1]))
+
+    def test_member_diagrams(self):
+        # Simply supported beam of span 10 with a uniform load -2 between 2 and 6
+        section = Section(1, 1, material=Material(1, 1, 1))
+        node_1 = Node(0, no=1)
+        node_2 = Node(10, no=2)
+        member = Member(node_1, node_2, section)
+        member.distributed_loads = (2, DistributedForce(-2, -2, 4))
+        node_1.restrains = (True, False)
+        node_2.restrains = (True, False)
+        beam = Beam()
+        beam.members = [member]
+        beam.solve()
+        diagrams = member.diagrams
+        assert_allclose(diagrams['shear_xy'].roots(), [4.4])
+        x, moment = diagrams['bending_xy'].absolute_maximum()
+        self.assertAlmostEqual(x, 4.4)
+        self.assertAlmostEqual(moment, 15.36)
+        assert_allclose(diagrams['shear_xy'](10), -3.2)
+        bending, _ = member.bending
+        assert_allclose(bending, diagrams['bending_xy'](member.domain))
+
+    def _fixed_member(self, moment):
+        # Fixed-fixed member of length 5 with a point moment at 2
+        section = Section(0.04, 1e-4, 2e-4, material=Material(2e7, 1, 1))
+        node_1 = node.Node((0, 0, 0), no=1)
+        node_2 = node.Node((5, 0, 0), no=2)
+        node_1.restrains = (True,)*6
+        node_2.restrains = (True,)*6
+        fixed_member = member.Member(node_1, node_2, section)
+        fixed_member.moments = (2, Moment(moment))
+        structure = Structure()
+        structure.members = [fixed_member]
+        structure.solve()
+        return fixed_member
+
+    def test_point_moment_end_values(self):
+        for moment in ((3, 0, 0), (0, 0, 3), (0, 3, 0)):
+            member = self._fixed_member(moment)
+            end_actions, diagrams = member.end_actions, member.diagrams
+            assert_allclose(diagrams['torsion']([0, 5]), [-end_actions[3], end_actions[9]], atol=1e-12)
+            assert_allclose(diagrams['bending_xy']([0, 5]), [-end_actions[5], end_actions[11]], atol=1e-12)
+            assert_allclose(diagrams['shear_xz']([0, 5]), [end_actions[2], -end_actions[8]], atol=1e-12)
+            self.assertAlmostEqual(diagrams['bending_xz'](0), -end_actions[4])
+        # Known limitation (see Member._bending), the far end of bending_xz
+        # does not match for a y component
+        self.assertNotAlmostEqual(diagrams['bending_xz'](5), end_actions[10])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+import numpy as np
+from numpy.testing import assert_allclose
+from stiffpy.material import Material
+from stiffpy.section import Section
+from stiffpy.load_case import LoadCase
+from stiffpy.combination import LoadCombinations
+from stiffpy.beam import *
+
+
+class TestLoadCase(unittest.TestCase):
+    """
+    Beam with Kneecap in the middle of the span (see test_beam_release), one
+    load case for the point force and other for the distributed force
+    """
+    def build_beam(self):
+        material = Material(E=2e6, f_y=1, f_u=1)
+        section = Section(A=1, Ix=6e-3, material=material)
+        node_1 = Node(0, no=1)
+        node_2 = Node(5, no=2)
+        node_3 = Node(10, no=3)
+        member_1 = Member(node_1, node_2, section, (False, False), (False, True))
+        member_2 = Member(node_2, node_3, section, (False, True), (False, False))
+        node_1.restrains = (True, True)
+        node_3.restrains = (True, True)
+        beam = Beam()
+        beam.members = [member_1, member_2]
+        return beam, node_2, member_1, member_2
+
+    def setUp(self):
+        self.beam, node_2, member_1, member_2 = self.build_beam()
+        point = LoadCase('point')
+        point.add_member_force(member_1, 2.5, Force(-10))
+        distributed = LoadCase('distributed')
+        distributed.add_distributed_load(member_2, 0, DistributedForce(-10, -10, 5))
+        node = LoadCase('node')
+        node.add_node_force(node_2, Force(-4))
+        self.beam.load_cases = [point, distributed, node]
+        self.results = self.beam.solve_load_cases()
+
+    def test_load_case_reactions(self):
+        total = sum(result.reactions for name, result in self.results.items() if name != 'node')
+        assert_allclose(total, [17.8125, 64.0625, 42.1875, -85.9375])
+
+    def test_load_case_against_solve(self):
+        beam, node_2, member_1, member_2 = self.build_beam()
+        node_2.force = Force(-4)
+        beam.solve()
+        result = self.results['node']
+        assert_allclose(result.reactions, beam.reactions, atol=1e-10)
+        assert_allclose(result.displacements, beam.displacements, atol=1e-10)
+        assert_allclose(result.node_displacement(node_2), node_2.displacements, atol=1e-10)
+        end_actions = np.concatenate((member_1.force_left.components,
+            member_1.moment_left.components, member_1.force_right.components,
+            member_1.moment_right.components))
+        assert_allclose(result.end_actions(self.beam.members[0]), end_actions, atol=1e-10)
+
+    def test_model_not_modified(self):
+        for member in self.beam.members:
+            self.assertEqual(member.forces, [])
+            self.assertEqual(member.distributed_loads, [])
+
+    def test_combinations(self):
+        combinations = LoadCombinations({
+            'all': {'point': 1, 'distributed': 1},
+            'factored': {'point': 1.5, 'distributed': 1.5, 'node': 0}})
+        combined = combinations.combine(self.results)
+        assert_allclose(combined['all'].reactions, [17.8125, 64.0625, 42.1875, -85.9375])
+        assert_allclose(combined['factored'].member_end_actions,
+                1.5*combined['all'].member_end_actions)
+
+    def test_envelopes(self):
+        combinations = LoadCombinations({
+            'point': {'point': 1},
+            'all': {'point': 1, 'distributed': 1}})
+        envelopes = combinations.envelopes(self.beam)
+        beam, node_2, member_1, member_2 = self.build_beam()
+        member_1.forces = (2.5, Force(-10))
+        beam.solve()
+        bending_point, _ = member_1.bending
+        shear_point, _ = member_1.shear
+        diagram_point = member_1.diagrams['bending_xy']
+        member_2.distributed_loads = (0, DistributedForce(-10, -10, 5))
+        beam.solve()
+        bending_all, _ = member_1.bending
+        shear_all, _ = member_1.shear
+        maximum, minimum = envelopes['bending_xy'].of(self.beam.members[0])
+        assert_allclose(maximum, np.maximum(bending_point, bending_all), atol=1e-8)
+        assert_allclose(minimum, np.minimum(bending_point, bending_all), atol=1e-8)
+        maximum, minimum = envelopes['shear_xy'].of(self.beam.members[0])
+        assert_allclose(maximum, np.maximum(shear_point, shear_all), atol=1e-8)
+        assert_allclose(minimum, np.minimum(shear_point, shear_all), atol=1e-8)
+        # Exact extremes of the combined diagrams, not of the samples
+        diagram_all = member_1.diagrams['bending_xy']
+        (_, peak_maximum), (_, peak_minimum) = envelopes['bending_xy'].peak(self.beam.members[0])
+        self.assertAlmostEqual(peak_maximum, max(diagram_point.maximum()[1], diagram_all.maximum()[1]))
+        self.assertAlmostEqual(peak_minimum, min(diagram_point.minimum()[1], diagram_all.minimum()[1]))
+        self.assertGreaterEqual(peak_maximum, np.max(bending_point))
+
+    def test_combine_without_results(self):
+        combinations = LoadCombinations({'all': {'point': 1}})
+        with self.assertRaises(ValueError):
+            combinations.combine({})
+        with self.assertRaises(ValueError):
+            combinations.envelopes(self.build_beam()[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
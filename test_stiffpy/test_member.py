@@ -5,6 +5,13 @@ from stiffpy.section import Section
 from stiffpy.material import Material
 from stiffpy.node import Node
 from stiffpy.member import Member
+from stiffpy.structure import Structure
+from stiffpy.cache import LRUCache
+from stiffpy.action.actions import Force
+from stiffpy.action.distributed_force import DistributedForce
+from stiffpy.kernels import CONDENSATION_CACHE, condensation_operator, condensation_operators, \
+        member_properties, local_stiffness_matrices, \
+        condense_releases, transformation_matrices, global_stiffness_matrices
 
 class TestMember(unittest.TestCase):
     def setUp(self):
@@ -153,6 +160,162 @@ class TestMember(unittest.TestCase):
         ])
         assert_almost_equal(self.frame_member.member_rotation_matrix, k)
 
+    def test_member_rotation_matrix_cache(self):
+        member = self.truss_member
+        rotation = member.member_rotation_matrix
+        self.assertIs(member.member_rotation_matrix, rotation)
+        # Moving a node changes the direction of the member
+        member.node_2.r = np.array((8, 6, 0))
+        self.assertEqual(member.length, 10)
+        assert_almost_equal(member.member_rotation_matrix[:2, :2], [[4/5, 3/5], [-3/5, 4/5]])
+        # Skewed node, same matrix as the single node computation
+        member.node_1.angle = np.array((0, 0, .4))
+        assert_almost_equal(member.node_rotation_matrices[0],
+                member.node_1.compute_node_rotation_matrix(member.angle))
+        assert_almost_equal(member.member_rotation_matrix[:2, :2],
+                member.node_1.compute_node_rotation_matrix(member.angle)[:2, :2])
+
+    def test_batched_stiffness_matrices(self):
+        members = [self.beam_member, self.truss_member, self.frame_member,
+                self.space_truss_member, self.force_left_beam, self.moment_left_beam,
+                self.force_right_beam, self.moment_right_beam,
+                Member(Node((0, 0, 0), angle=(0, 0, .3), no=1), Node((1, 2, 3), no=2),
+                    Section(2, 3, 4, 5, Material(1, 1, 2, .3))),
+                Member(Node((0, 0, 0), no=1), Node((0, 4, 0), no=2), Section(1, 2))]
+        releases = np.array([member.node_1_release + member.node_2_release
+            for member in members])
+        properties = member_properties(members)
+        stiffness = condense_releases(local_stiffness_matrices(*properties), releases, properties[-1])
+        transformation = transformation_matrices(
+                [member.node_1.compute_node_rotation_matrix(member.angle) for member in members],
+                [member.node_2.compute_node_rotation_matrix(member.angle) for member in members])
+        global_stiffness = global_stiffness_matrices(stiffness, transformation)
+        for member, local, structure, released in zip(members, stiffness, global_stiffness, releases):
+            assert_almost_equal(local[~released][:, ~released], member.member_oriented_stiffness_matrix)
+            assert_almost_equal(structure[~released][:, ~released], member.structure_oriented_stiffness_matrix)
+            assert_almost_equal(structure[released], 0)
+
+    def test_deformations(self):
+        # Cantilever with a tip force (E = 2, A = 3, Ix = 4, Iy = 5)
+        section = Section(3, 4, 5, 1, Material(1, 1, 2))
+        node_1 = Node((0, 0, 0), no=1)
+        node_2 = Node((6, 0, 0), no=2)
+        member = Member(node_1, node_2, section)
+        node_1.restrains = (True, True, True, True, True, True)
+        node_2.force = Force((1, 2, 3))
+        structure = Structure()
+        structure.members = [member]
+        structure.solve()
+        member.resolution = 7
+        x = member.domain
+        deflection_xy, deflection_xz = member.deflection
+        assert_almost_equal(deflection_xy, 2*x**2*(18 - x)/(6*2*4))
+        assert_almost_equal(deflection_xz, 3*x**2*(18 - x)/(6*2*5))
+        assert_almost_equal(member.axial_deformation, x/(2*3))
+        slope_xy, slope_xz = member.slope
+        assert_almost_equal(slope_xy, 2*x*(12 - x)/(2*2*4))
+        assert_almost_equal(slope_xz, -3*x*(12 - x)/(2*2*5))
+        assert_almost_equal(member.stacked_deformation[:, -1], node_2.displacements[:3])
+
+    def test_deformations_released(self):
+        # Simply supported by a hinge at the left end, uniform load -2
+        section = Section(1, 1, 1, 1, Material(1, 1, 1))
+        node_1 = Node((0, 0, 0), no=1)
+        node_2 = Node((4, 0, 0), no=2)
+        member = Member(node_1, node_2, section, (False, False, False, False, True, True))
+        member.distributed_loads = (0, DistributedForce((0, -2, 0), (0, -2, 0), 4))
+        node_1.restrains = (True, True, True, True, False, False)
+        node_2.restrains = (True, True, True, False, False, False)
+        structure = Structure()
+        structure.members = [member]
+        structure.solve()
+        member.resolution = 9
+        x = member.domain
+        deflection_xy, _ = member.deflection
+        assert_almost_equal(deflection_xy, -2*x*(64 - 8*x**2 + x**3)/24)
+        slope_xy, _ = member.slope
+        assert_almost_equal(slope_xy[-1], node_2.displacements[5])
+
+    def test_memoized_results(self):
+        section = Section(1, 1, 1, 1, Material(1, 1, 1))
+        node_1 = Node((0, 0, 0), no=1)
+        node_2 = Node((4, 0, 0), no=2)
+        member = Member(node_1, node_2, section)
+        node_1.restrains = (True, True, True, True, True, True)
+        node_2.force = Force((0, 1, 0))
+        structure = Structure()
+        structure.members = [member]
+        structure.solve()
+        shear = member.shear
+        self.assertIs(member.shear, shear)
+        self.assertFalse(shear[0].flags.writeable)
+        assert_almost_equal(shear[0], -1)
+        # New member loads drop the cached results
+        member.forces = (2, Force((0, 1, 0)))
+        self.assertIsNot(member.shear, shear)
+        structure.solve()
+        generation = structure.solve_generation
+        assert_almost_equal(member.shear[0][0], -2)
+        structure.solve()
+        self.assertGreater(structure.solve_generation, generation)
+        # Memory cap
+        cache = LRUCache(maxsize=None, maxbytes=3*8000)
+        for key in range(4):
+            cache.put(key, np.zeros(1000))
+        self.assertEqual(len(cache), 3)
+        self.assertNotIn(0, cache)
+        self.assertEqual(cache.info()['nbytes'], 3*8000)
+
+    def test_compact_memory(self):
+        section = Section(1, 1, 1, 1, Material(1, 1, 1))
+        node_1 = Node((0, 0, 0), no=1)
+        node_2 = Node((4, 0, 0), no=2)
+        node_3 = Node((8, 0, 0), no=3)
+        member_1 = Member(node_1, node_2, section)
+        member_2 = Member(node_2, node_3, section)
+        member_2.forces = (1, Force((0, 1, 0)))
+        node_1.restrains = (True, True, True, True, True, True)
+        for value in (node_1, member_1, member_2.forces[0]):
+            self.assertFalse(hasattr(value, '__dict__'))
+        # The members of the same length share the domain
+        self.assertIs(member_1.domain, member_2.domain)
+        structure = Structure()
+        structure.members = [member_1, member_2]
+        structure.solve()
+        shear = member_2.shear[0]
+        usage = structure.memory_usage()
+        self.assertEqual(usage['total'], sum(value for name, value in usage.items() if name != 'total'))
+        self.assertGreaterEqual(usage['results'], shear.nbytes)
+        # Single precision sampled results
+        member_2.result_dtype = np.float32
+        self.assertEqual(member_2.shear[0].dtype, np.float32)
+        assert_almost_equal(member_2.shear[0], shear, decimal=6)
+        self.assertEqual(member_1.shear[0].dtype, np.float64)
+
+    def test_condensation_cache(self):
+        CONDENSATION_CACHE.clear()
+        releases = np.array([False]*4 + [True]*2 + [False]*4 + [True]*2)
+        operator = condensation_operator(releases, 2.)
+        self.assertIs(condensation_operator(releases.copy(), 2.), operator)
+        self.assertEqual(CONDENSATION_CACHE.info()['hits'], 1)
+        self.assertEqual(CONDENSATION_CACHE.info()['misses'], 1)
+        # Both ends pinned, the released rotations follow the displacements
+        assert_almost_equal(operator[:, releases], 0)
+        assert_almost_equal(operator[5, [1, 7]], [-.5, .5])
+        self.assertFalse(operator.flags.writeable)
+
+    def test_batched_condensation(self):
+        CONDENSATION_CACHE.clear()
+        rng = np.random.default_rng(0)
+        patterns = np.array([[False]*12, [False]*4 + [True]*2 + [False]*6, [False]*10 + [True]*2])
+        releases = patterns[rng.integers(0, 3, 50)]
+        lengths = rng.uniform(1, 10, 50)
+        operators = condensation_operators(releases, lengths)
+        # The batched operators do not go through the cache
+        self.assertEqual(CONDENSATION_CACHE.info()['misses'], 0)
+        for operator, member_releases, length in zip(operators, releases, lengths):
+            assert_almost_equal(operator, condensation_operator(member_releases, length))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,110 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from numpy.testing import assert_allclose
+from stiffpy.material import Material
+from stiffpy.section import Section
+from stiffpy.node_registry import NodeRegistry
+from stiffpy.frame import *
+
+
+def portal_frame(ids=(None, None, None, None)) -> Frame:
+    """
+    Portal frame with a lateral force, the nodes have the ids given (None
+    for the nodes without id)
+    """
+    section = Section(A=0.04, Ix=.2**4/12, material=Material(E=2e7, f_y=1, f_u=1))
+    nodes = [Node(r, no=no) for r, no in zip(((0, 0), (0, 3), (5, 3), (5, 0)), ids)]
+    nodes[0].restrains = (True, True, True)
+    nodes[3].restrains = (True, True, True)
+    nodes[1].force = Force((10, 0))
+    frame = Frame()
+    frame.members = [Member(nodes[i], nodes[i + 1], section) for i in range(3)]
+    return frame
+
+
+class TestNodeRegistry(unittest.TestCase):
+    def test_numbering_is_scoped(self):
+        for _ in range(2):
+            frame = portal_frame()
+            self.assertEqual(frame.node_registry.ids, (1, 2, 3, 4))
+            self.assertEqual([node.r[0] for node in frame.nodes], [0, 0, 5, 5])
+        # After the largest integer id
+        frame = portal_frame((None, 7, None, 2))
+        self.assertEqual(frame.node_registry.ids, (2, 7, 8, 9))
+        self.assertEqual(frame.indexes_grouped_by_node[0], [0, 1, 2])
+
+    def test_hashable_ids(self):
+        reference = portal_frame()
+        reference_result = reference.solve()
+        for ids in (('A', 'B', 'C', 'D'), (('grid', 1), ('grid', 2), ('grid', 3), ('grid', 4)),
+                ('A', 2, 'C', 4)):
+            frame = portal_frame(ids)
+            result = frame.solve()
+            self.assertEqual(frame.node_registry.row(ids[1]), 1)
+            assert_allclose(result.node_displacement(ids[1]), reference_result.node_displacement(2), atol=1e-12)
+            assert_allclose(result.member_end_actions, reference_result.member_end_actions, atol=1e-9)
+
+    def test_same_id(self):
+        node = Node((0, 0), no=1)
+        self.assertEqual(NodeRegistry([node, node]).nodes, (node,))
+        with self.assertRaises(ValueError):
+            NodeRegistry([node, Node((5, 0), no=1)])
+        section = Section(A=0.04, Ix=.2**4/12, material=Material(E=2e7, f_y=1, f_u=1))
+        # Two members built with their own node 2
+        members = [Member(node, Node((5, 0), no=2), section), Member(Node((5, 0), no=2), Node((5, 3), no=3), section)]
+        with self.assertRaises(ValueError):
+            Frame().members = members
+        # Id assigned after the creation
+        renumbered = Node((1, 0))
+        renumbered.no = 1
+        with self.assertRaises(ValueError):
+            NodeRegistry([node, renumbered])
+
+    def test_nodes_are_not_modified(self):
+        frame = portal_frame()
+        for node in frame.nodes:
+            self.assertIsNone(node.no)
+            self.assertEqual(frame.node_registry.node(frame.node_registry.node_id(node)), node)
+        result = frame.solve()
+        node = frame.node_registry.node(2)
+        assert_allclose(result.node(node).displacements, node.displacements)
+        assert_allclose(result.node(2).displacements, node.displacements)
+
+    def test_shared_nodes(self):
+        first = portal_frame()
+        shared = first.members[0].node_2
+        self.assertEqual(first.node_registry.node_id(shared), 2)
+        # In a structure with a node 1 the shared node gets another number
+        section = first.members[0].section
+        second = Frame()
+        second.members = [Member(Node((0, -3), no=1), shared, section)]
+        self.assertEqual(second.node_registry.ids, (1, 2))
+        self.assertEqual(second.node_registry.node_id(shared), 2)
+        self.assertIsNone(shared.no)
+        third = Frame()
+        third.members = [Member(Node((0, -3), no=7), shared, section)]
+        self.assertEqual(third.node_registry.node_id(shared), 8)
+        self.assertEqual(first.node_registry.node_id(shared), 2)
+
+    def test_parallel_models(self):
+        def solve(_):
+            frame = portal_frame()
+            return frame.node_registry.ids, frame.solve()
+        with ThreadPoolExecutor(4) as executor:
+            outputs = list(executor.map(solve, range(8)))
+        for ids, result in outputs:
+            self.assertEqual(ids, (1, 2, 3, 4))
+            assert_allclose(result.node_reactions, outputs[0][1].node_reactions)
+
+    def test_shared_nodes_in_parallel(self):
+        nodes = [Node((i, 0)) for i in range(200)]
+        with ThreadPoolExecutor(4) as executor:
+            registries = list(executor.map(NodeRegistry, [nodes, nodes[::-1], nodes[100:], nodes]))
+        for registry in registries:
+            self.assertEqual(registry.ids, tuple(range(1, len(registry) + 1)))
+            self.assertEqual(registry.nodes, tuple(nodes[-len(registry):]))
+        self.assertTrue(all(node.no is None for node in nodes))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+import numpy as np
+from numpy.testing import assert_allclose, assert_array_equal
+from stiffpy.material import Material
+from stiffpy.section import Section
+from stiffpy.ordering import reverse_cuthill_mckee, minimum_degree
+from stiffpy.structure import Structure
+from stiffpy.truss import Node, Force, Member, Truss
+
+
+def ladder_truss(panels: int, ordering: str=None) -> Truss:
+    """
+    Truss of panels panels, the bottom chord is numbered first and the top
+    chord after it (large bandwidth without ordering)
+    """
+    section = Section(1, 1, material=Material(1, 1, 1))
+    bottom = [Node((i, 0), no=i + 1) for i in range(panels + 1)]
+    top = [Node((i, 1), no=panels + i + 2) for i in range(panels + 1)]
+    members = [Member(bottom[i], bottom[i + 1], section) for i in range(panels)]
+    members += [Member(top[i], top[i + 1], section) for i in range(panels)]
+    members += [Member(bottom[i], top[i], section) for i in range(panels + 1)]
+    members += [Member(bottom[i], top[i + 1], section) for i in range(panels)]
+    for node in top:
+        node.force = Force((0, -1))
+    bottom[0].restrains = (True, True)
+    bottom[-1].restrains = (False, True)
+    truss = Truss(ordering=ordering)
+    truss.members = members
+    return truss
+
+
+class TestOrdering(unittest.TestCase):
+    def test_orderings_are_permutations(self):
+        member_nodes = np.array([(0, 1), (1, 2), (2, 3), (0, 3), (3, 4)])
+        for ordering in (reverse_cuthill_mckee, minimum_degree):
+            assert_array_equal(np.sort(ordering(5, member_nodes)), np.arange(5))
+        # The leaf (least degree) is eliminated first
+        self.assertEqual(minimum_degree(5, member_nodes)[0], 4)
+
+    def test_same_results(self):
+        natural = ladder_truss(10)
+        natural.solve()
+        for ordering in ('rcm', 'amd'):
+            truss = ladder_truss(10, ordering)
+            truss.solve()
+            self.assertEqual(truss.plan.ordering, ordering)
+            assert_allclose(truss.node_displacements, natural.node_displacements, atol=1e-9)
+            assert_allclose(truss.node_reactions, natural.node_reactions, atol=1e-9)
+            assert_allclose(truss.member_end_actions, natural.member_end_actions, atol=1e-9)
+            # The solved system is permuted
+            assert_allclose(np.sort(truss.displacements), np.sort(natural.displacements), atol=1e-9)
+
+    def test_statistics(self):
+        truss = ladder_truss(20, 'rcm')
+        statistics = truss.plan.ordering_statistics
+        self.assertGreater(statistics['before']['half_bandwidth'], 40)
+        self.assertLess(statistics['after']['half_bandwidth'], 8)
+        self.assertLess(statistics['after']['profile'], statistics['before']['profile'])
+        # Without ordering both are the same
+        statistics = ladder_truss(20).plan.ordering_statistics
+        self.assertEqual(statistics['before'], statistics['after'])
+        self.assertEqual(statistics['after']['half_bandwidth'], ladder_truss(20).plan.half_bandwidth)
+
+    def test_ordering_change(self):
+        truss = ladder_truss(5)
+        plan = truss.plan
+        truss.ordering = 'rcm'
+        self.assertIsNot(truss.plan, plan)
+        with self.assertRaises(ValueError):
+            ladder_truss(5, 'metis').plan
+
+    def test_from_arrays(self):
+        section = Section(1, 1, material=Material(1, 1, 1))
+        coordinates = [(0, 0, 0), (4, 0, 0), (8, 0, 0), (4, 3, 0)]
+        connectivity = [(0, 3), (1, 3), (2, 3), (0, 1), (1, 2)]
+        restraints = [[True]*6, [False, False, True, True, True, False], [True]*6,
+                [False, False, True, True, True, False]]
+        node_actions = [[0]*6, [0, -10, 0, 0, 0, 0], [0]*6, [5, 0, 0, 0, 0, 0]]
+        natural = Structure.from_arrays(coordinates, connectivity, [section],
+                restraints=restraints, node_actions=node_actions)
+        natural.solve()
+        ordered = Structure.from_arrays(coordinates, connectivity, [section],
+                restraints=restraints, node_actions=node_actions, ordering='amd')
+        ordered.solve()
+        assert_allclose(ordered.node_displacements, natural.node_displacements, atol=1e-9)
+        assert_allclose(ordered.member_end_actions, natural.member_end_actions, atol=1e-9)
+
+
+if __name__ == '__main__':
+    unittest.main()
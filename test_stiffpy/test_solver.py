@@ -0,0 +1,180 @@
+import unittest
+import numpy as np
+import scipy.sparse as sp
+from numpy.testing import assert_allclose
+from stiffpy.material import Material
+from stiffpy.section import Section
+import warnings
+from stiffpy.solver import DenseSolver, SparseSolver, BandedSolver, IterativeSolver
+from stiffpy.beam import *
+
+
+class TestSolver(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        a = rng.random((8, 8))
+        self.matrix = a @ a.T + 8*np.eye(8)
+        self.rhs = rng.random((8, 3))
+
+    def test_dense_solver(self):
+        solver = DenseSolver().factorize(self.matrix)
+        self.assertEqual(solver.method, 'cholesky')
+        assert_allclose(solver.solve(self.rhs), np.linalg.solve(self.matrix, self.rhs))
+        assert_allclose(solver.solve(self.rhs[:, 0]), np.linalg.solve(self.matrix, self.rhs[:, 0]))
+
+    def test_dense_solver_not_positive_definite(self):
+        matrix = self.matrix - 20*np.eye(8)
+        solver = DenseSolver().factorize(matrix)
+        self.assertEqual(solver.method, 'lu')
+        assert_allclose(solver.solve(self.rhs), np.linalg.solve(matrix, self.rhs))
+
+    def test_sparse_solver(self):
+        solver = SparseSolver().factorize(sp.csr_matrix(self.matrix))
+        self.assertIn(solver.method, ('cholmod', 'splu'))
+        assert_allclose(solver.solve(self.rhs), np.linalg.solve(self.matrix, self.rhs))
+
+    def test_banded_solver(self):
+        # Tridiagonal matrix plus a second band
+        size = 12
+        matrix = 4*np.eye(size) - np.eye(size, k=1) - np.eye(size, k=-1) \
+                + 0.5*np.eye(size, k=2) + 0.5*np.eye(size, k=-2)
+        rhs = np.arange(2*size, dtype=float).reshape(size, 2)
+        solver = BandedSolver().factorize(sp.csr_matrix(matrix))
+        self.assertEqual(solver.method, 'cholesky_banded')
+        self.assertEqual(solver.bandwidth, 2)
+        assert_allclose(solver.solve(rhs), np.linalg.solve(matrix, rhs))
+        solver = BandedSolver().factorize(matrix - 10*np.eye(size))
+        self.assertEqual(solver.method, 'banded_lu')
+        assert_allclose(solver.solve(rhs), np.linalg.solve(matrix - 10*np.eye(size), rhs))
+
+    def test_update(self):
+        delta = np.array([[2., -1.], [-1., 3.]])
+        updated = self.matrix.copy()
+        updated[np.ix_([1, 4], [1, 4])] += delta
+        updated[np.ix_([4, 6], [4, 6])] += delta
+        for solver in (DenseSolver(), SparseSolver(), BandedSolver()):
+            solver.factorize(sp.csr_matrix(self.matrix))
+            generation = solver.generation
+            solver.update([1, 4], delta).update([4, 6], delta)
+            self.assertEqual(solver.update_rank, 3)
+            self.assertEqual(solver.generation, generation + 2)
+            assert_allclose(solver.solve(self.rhs), np.linalg.solve(updated, self.rhs))
+            assert_allclose(solver.solve(self.rhs[:, 0]), np.linalg.solve(updated, self.rhs[:, 0]))
+            # A new factorization drops the updates
+            solver.factorize(sp.csr_matrix(self.matrix))
+            self.assertEqual(solver.update_rank, 0)
+            assert_allclose(solver.solve(self.rhs), np.linalg.solve(self.matrix, self.rhs))
+
+    def test_iterative_solver(self):
+        expected = np.linalg.solve(self.matrix, self.rhs)
+        for preconditioner in IterativeSolver.PRECONDITIONERS:
+            solver = IterativeSolver(preconditioner).factorize(sp.csr_matrix(self.matrix))
+            assert_allclose(solver.solve(self.rhs), expected, rtol=1e-8)
+            self.assertTrue(solver.statistics['converged'])
+            self.assertEqual(len(solver.statistics['iterations']), 3)
+            self.assertTrue(all(residual <= 1e-10 for residual in solver.statistics['residuals']))
+        # Dense matrices and blocks given by the structure
+        solver = IterativeSolver('block_jacobi')
+        solver.blocks = np.array([0, 0, 0, 1, 1, 2, 2, 2])
+        solver.factorize(self.matrix)
+        assert_allclose(solver.solve(self.rhs[:, 0]), expected[:, 0], rtol=1e-8)
+
+    def test_iterative_solver_warm_start(self):
+        solver = IterativeSolver('jacobi', warm_start=True).factorize(self.matrix)
+        solution = solver.solve(self.rhs[:, 0])
+        cold = solver.statistics['iterations'][0]
+        # Same system again, the previous solution is already converged
+        assert_allclose(solver.solve(self.rhs[:, 0]), solution)
+        self.assertEqual(solver.statistics['iterations'], [0])
+        # Small change of the matrix, fewer iterations than from zero
+        solver.factorize(self.matrix + 1e-3*np.eye(8))
+        assert_allclose(solver.solve(self.rhs[:, 0]),
+                np.linalg.solve(self.matrix + 1e-3*np.eye(8), self.rhs[:, 0]), rtol=1e-8)
+        self.assertLess(solver.statistics['iterations'][0], cold)
+
+    def test_iterative_solver_not_converged(self):
+        solver = IterativeSolver(None, maxiter=1).factorize(self.matrix)
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            solver.solve(self.rhs[:, 0])
+        self.assertFalse(solver.statistics['converged'])
+        self.assertEqual(caught[0].category, RuntimeWarning)
+
+    def test_beam_iterative_solver(self):
+        dense = self._continuous_beam(DenseSolver())
+        for preconditioner in ('jacobi', 'block_jacobi', 'incomplete_cholesky'):
+            iterative = self._continuous_beam(IterativeSolver(preconditioner))
+            assert_allclose(iterative.displacements, dense.displacements, rtol=1e-8)
+            assert_allclose(iterative.reactions, dense.reactions, rtol=1e-8)
+            self.assertTrue(iterative.solver_statistics['converged'])
+            self.assertGreater(iterative.solver_statistics['iterations'][0], 0)
+        # One block per node (the rotation of the nodes 2 to 6 is free)
+        assert_allclose(iterative.solver.blocks, [1, 2, 3, 4, 5])
+
+    def _continuous_beam(self, solver=None) -> Beam:
+        material = Material(1, 1, 1)
+        section = Section(1, 1, material=material)
+        nodes = [Node(4*i, no=i + 1) for i in range(6)]
+        members = [Member(nodes[i], nodes[i + 1], section) for i in range(5)]
+        for member in members:
+            member.distributed_loads = (0, DistributedForce(-10, -10, 4))
+        nodes[0].restrains = (True, True)
+        for node in nodes[1:]:
+            node.restrains = (True, False)
+        beam = Beam(solver=solver)
+        beam.members = members
+        beam.solve()
+        return beam
+
+    def test_beam_banded_solver(self):
+        banded = self._continuous_beam()
+        self.assertIsInstance(banded.solver, BandedSolver)
+        self.assertEqual(banded.solver.method, 'cholesky_banded')
+        dense = self._continuous_beam(DenseSolver())
+        assert_allclose(banded.displacements, dense.displacements)
+        assert_allclose(banded.reactions, dense.reactions)
+
+    def test_singular_matrix(self):
+        singular = np.array([[1., 1.], [1., 1.]])
+        for solver in (DenseSolver(), SparseSolver(), BandedSolver()):
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                with self.assertRaises(np.linalg.LinAlgError):
+                    solver.factorize(sp.csr_matrix(singular) if solver.sparse else singular)
+
+    def test_unstable_structure(self):
+        # Continuous beam without supports (a mechanism)
+        for solver in (None, DenseSolver(), SparseSolver()):
+            material = Material(1, 1, 1)
+            section = Section(1, 1, material=material)
+            nodes = [Node(4*i, no=i + 1) for i in range(4)]
+            beam = Beam(solver=solver)
+            beam.members = [Member(nodes[i], nodes[i + 1], section) for i in range(3)]
+            nodes[1].force = Force(-10)
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                with self.assertRaises(np.linalg.LinAlgError):
+                    beam.solve()
+
+    def test_structure_keeps_factorization(self):
+        material = Material(1, 1, 1)
+        section = Section(1, 1, material=material)
+        node_1 = Node(0, no=1)
+        node_2 = Node(6, no=2)
+        node_3 = Node(10, no=3)
+        member_1 = Member(node_1, node_2, section)
+        member_2 = Member(node_2, node_3, section)
+        member_1.distributed_loads = (0, DistributedForce(-25, -25, 6))
+        node_1.restrains = (True, True)
+        node_2.restrains = (True, False)
+        node_3.restrains = (True, True)
+        beam = Beam()
+        beam.members = [member_1, member_2]
+        beam.solve()
+        self.assertTrue(beam.solver.factorized)
+        assert_allclose(beam.solver.solve(beam.reorder_action_combined[:1]),
+                beam.displacements)
+
+
+if __name__ == '__main__':
+    unittest.main()
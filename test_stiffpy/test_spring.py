@@ -0,0 +1,28 @@
+import unittest
+import numpy as np
+from numpy.testing import assert_allclose
+from stiffpy.spring import *
+
+
+class TestSpring(unittest.TestCase):
+    def setUp(self):
+        self.node_1 = Node(0)
+        self.node_2 = Node(10)
+        self.node_3 = Node(20)
+        self.node_2.force = Force(-10)
+        self.node_1.restrains = True
+        self.node_3.restrains = True
+        self.spring = Spring()
+        self.spring.members = [Member(self.node_1, self.node_2, 10), Member(self.node_2, self.node_3, 20)]
+
+    def test_single_degree_per_node(self):
+        self.spring.solve()
+        # Only the axial degree of the inner node is free
+        self.assertEqual(self.spring.number_of_degrees_of_freedom, 1)
+        assert_allclose(self.spring.displacements, [-1/3])
+        assert_allclose(self.spring.reactions, [10/3, 20/3])
+        assert_allclose(self.node_2.displacements, [-1/3, 0, 0, 0, 0, 0], atol=1e-12)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,5 @@
+import subprocess
+import sys
 import unittest
 import numpy as np
 from numpy.testing import assert_allclose
@@ -6,10 +8,34 @@ from stiffpy.section import Section
 from stiffpy.action.actions import Moment, Force
 from stiffpy.action.distributed_force import DistributedForce
 from stiffpy.member import Member
+from stiffpy.member_loads import MemberLoadTable
 from stiffpy.node import Node
 from stiffpy.structure import Structure
 
 
+def two_bay_frame(sparse: bool=False):
+    """
+    Plane frame of two bays and two storeys with a uniform load on the beams
+    and lateral forces
+    """
+    from stiffpy import frame
+    section = Section(A=0.04, Ix=.2**4/12, material=Material(E=2e7, f_y=1, f_u=1))
+    nodes = [[frame.Node((5*bay, 3*storey), no=3*storey + bay + 1) for bay in range(3)] for storey in range(3)]
+    members = []
+    for storey in range(1, 3):
+        members += [frame.Member(nodes[storey - 1][bay], nodes[storey][bay], section) for bay in range(3)]
+        for bay in range(2):
+            beam = frame.Member(nodes[storey][bay], nodes[storey][bay + 1], section)
+            beam.distributed_loads = (0, frame.DistributedForce((0, -10), (0, -10), 5))
+            members.append(beam)
+        nodes[storey][0].force = frame.Force((5, 0))
+    for node in nodes[0]:
+        node.restrains = (True, True, True)
+    structure = frame.Frame(sparse=sparse)
+    structure.members = members
+    return structure
+
+
 class TestStructure(unittest.TestCase):
     def setUp(self):
         # Beam (Solution Manual Hibbeler problem 15-1)
@@ -171,6 +197,210 @@ class TestStructure(unittest.TestCase):
         k = np.array([-1.875, -5, 1.875, 750])
         assert_allclose(self.frame.reactions, k, rtol=.01, atol=.01)
 
+    def test_sparse_structure_stiffness_matrix(self):
+        for structure in (self.beam, self.truss, self.frame, self.constrained_frame):
+            assert_allclose(structure.sparse_structure_stiffness.toarray(),
+                    structure.structure_stiffness, atol=1e-12)
+
+    def test_sparse_action_result_vector(self):
+        self.constrained_frame.sparse = True
+        self.constrained_frame.solve()
+        k = np.array([-4.423, -10, -5.577, 10])
+        assert_allclose(self.constrained_frame.reactions, k, rtol=.01, atol=.01)
+        self.beam.sparse = True
+        self.beam.solve()
+        k = np.array([82.5, 90, 84.375, -16.875, 22.5])
+        assert_allclose(self.beam.reactions, k, rtol=.01, atol=.01)
+
+    def test_partitioned_stiffness(self):
+        # Elastic support at a free degree
+        self.frame.plan.nodes[1].elastic_constants = (0, 0, 0, 0, 0, 100)
+        for structure in (self.beam, self.truss, self.frame, self.constrained_frame):
+            structure.partitioned = False
+            structure.solve()
+            free = structure.number_of_degrees_of_freedom
+            full = structure.reorder_stiffness
+            for sparse in (False, True):
+                blocks = structure.partitioned_stiffness(sparse)
+                for block, expected in zip(blocks, (full[:free, :free], full[free:, :free], full[free:, free:])):
+                    assert_allclose(block.toarray() if sparse else block, expected, atol=1e-12)
+            structure.partitioned = True
+            structure.solve()
+            assert_allclose(structure.reorder_stiffness, full, atol=1e-12)
+
+    def test_compiled_plan(self):
+        plan = self.truss.compile()
+        self.assertIs(self.truss.compile(), plan)
+        assert_allclose(plan.reorder_indexes[plan.inverse_reorder_indexes],
+                np.arange(plan.number_of_degrees))
+        # Changing a restrain drops the plan
+        node = plan.nodes[0]
+        node.restrains = (True, True, False, False, False, False)
+        self.assertIsNot(self.truss.compile(), plan)
+        self.assertEqual(self.truss.number_of_degrees_of_freedom, 0)
+
+    def test_from_arrays(self):
+        # Same beam as setUp (Hibbeler problem 15-1)
+        section = Section(1, 1, material=Material(1, 1, 1))
+        releases = (True, False, True, True, True, False)
+        restraints = [
+                (False, True, False, False, False, True),
+                (False, True, False, False, False, False),
+                (False, True, False, False, False, True)]
+        member_loads = MemberLoadTable(2)
+        member_loads.add_distributed_forces([0], [0], [6], [(0, -25, 0)], [(0, -25, 0)])
+        beam = Structure.from_arrays(
+                [(0, 0, 0), (6, 0, 0), (10, 0, 0)],
+                [(0, 1), (1, 2)],
+                [section],
+                release_masks=[releases*2]*2,
+                restraints=restraints,
+                member_loads=member_loads)
+        beam.solve()
+        self.assertIsNotNone(beam._model)
+        k = np.array([82.5, 90, 84.375, -16.875, 22.5])
+        assert_allclose(beam.reactions, k, rtol=.01, atol=.01)
+        end_actions = beam.member_end_actions
+        # The objects are created on demand with the results of the solve
+        members = beam.members
+        self.assertIsNone(beam._model)
+        assert_allclose([member.end_actions for member in members], end_actions, atol=1e-9)
+        self.beam.solve()
+        assert_allclose([member.end_actions for member in self.beam.members], end_actions, atol=1e-9)
+        assert_allclose([node.displacements for node in sorted(beam.nodes, key=lambda node: node.no)],
+                beam.node_displacements, atol=1e-9)
+
+    def test_from_arrays_validation(self):
+        section = Section(1, 1, material=Material(1, 1, 1))
+        coordinates = [(0, 0, 0), (6, 0, 0), (10, 0, 0)]
+        for connectivity, section_ids in (
+                ([(0, 1)], None),                # Node 2 is not connected
+                ([(0, 1), (1, 3)], None),        # Row 3 does not exist
+                ([(0, 1), (-1, 1)], None),
+                ([(0, 1), (1, 2)], [0, 1])):     # Section 1 does not exist
+            with self.assertRaises(ValueError):
+                Structure.from_arrays(coordinates, connectivity, [section], section_ids=section_ids)
+
+    def test_profile(self):
+        events = []
+        with self.beam.profile(memory=True, callbacks=[events.append]) as profiler:
+            self.beam.solve()
+        self.beam.solve()
+        phases = profiler.as_dict()['phases']
+        for name in ('load_vector', 'member_load_actions', 'assembly', 'factorization',
+                'back_substitution', 'redistribution', 'end_actions', 'displacements_effects'):
+            self.assertEqual(phases[name]['calls'], 1)
+        self.assertEqual(phases['member_end_actions']['calls'], 2)
+        self.assertGreaterEqual(phases['solve']['time'], phases['factorization']['time'])
+        self.assertIn('peak', phases['assembly'])
+        self.assertEqual(len(events), len(profiler.events))
+        # The solve uses the batched rotations, not the member matrices
+        self.assertEqual(profiler.counters['node_rotation_matrices_computed'], 2)
+        self.assertNotIn('member_rotation_matrix', profiler.counters)
+        trace = profiler.chrome_trace()['traceEvents']
+        self.assertEqual({event['ph'] for event in trace}, {'X', 'C'})
+        with self.assertLogs('stiffpy.profiling') as logs:
+            profiler.log()
+        self.assertTrue(any('factorization' in line for line in logs.output))
+        # The peak of tracemalloc is global
+        with self.beam.profile():
+            with self.assertRaises(RuntimeError):
+                with self.beam.profile(memory=True):
+                    pass
+            with self.beam.profile():
+                self.beam.solve()
+
+    def test_solve_again(self):
+        for structure in (self.beam, self.truss, self.frame, self.constrained_frame):
+            structure.solve()
+            results = [(node.action, node.displacements) for node in structure.plan.nodes]
+            end_actions = [member.end_actions for member in structure.members]
+            structure.solve()
+            for node, (action, displacements) in zip(structure.plan.nodes, results):
+                assert_allclose(node.action, action, atol=1e-9)
+                assert_allclose(node.displacements, displacements, atol=1e-9)
+            assert_allclose([member.end_actions for member in structure.members], end_actions, atol=1e-9)
+        # The actions applied after a solve are kept
+        node = self.truss.plan.nodes[0]
+        node.force = Force((0, -20, 0))
+        self.truss.solve()
+        assert_allclose(self.truss.reactions, 2*np.array([0, 8.75, 1.667, 1.25, -1.667, 0]), rtol=.01, atol=.01)
+        assert_allclose(node.force.components, (0, -20, 0))
+
+    def _edits(self):
+        """
+        Edits of two_bay_frame and the counter of the solve that follows
+        """
+        section = Section(A=0.08, Ix=.2**4/6, material=Material(E=2e7, f_y=1, f_u=1))
+        return [
+                # Loads only
+                ('factorization_reused', lambda structure: setattr(structure.members[3], 'forces',
+                    (2, Force((0, -15, 0))))),
+                ('factorization_reused', lambda structure: setattr(structure.members[3].forces[0], 'components',
+                    np.array((0, -30, 0)))),
+                # Stiffness of a member, section and material
+                ('solver_updates', lambda structure: setattr(structure.members[1], 'section', section)),
+                ('solver_updates', lambda structure: setattr(section.material, 'E', 3e7)),
+                # Geometry
+                ('solver_updates', lambda structure: setattr(structure.plan.nodes[4], 'r', np.array((5, 3.5, 0))))]
+
+    def test_incremental_solve(self):
+        for sparse, low_rank_limit in ((False, 96), (True, 96), (False, 0)):
+            edits = self._edits()
+            structure = two_bay_frame(sparse)
+            structure.low_rank_limit = low_rank_limit
+            structure.solve()
+            for i, (counter, edit) in enumerate(edits):
+                edit(structure)
+                with structure.profile() as profiler:
+                    structure.solve()
+                self.assertNotIn('partitioned_stiffness', profiler.counters)
+                if low_rank_limit:
+                    self.assertIn(counter, profiler.counters)
+                reference = two_bay_frame()
+                for _, previous in edits[:i + 1]:
+                    previous(reference)
+                reference.solve()
+                assert_allclose(structure.node_displacements, reference.node_displacements, rtol=1e-9, atol=1e-12)
+                assert_allclose(structure.node_reactions, reference.node_reactions, rtol=1e-9, atol=1e-9)
+                assert_allclose(structure.member_end_actions, reference.member_end_actions, rtol=1e-9, atol=1e-9)
+            assert_allclose(structure.reorder_stiffness.toarray() if sparse else structure.reorder_stiffness,
+                    reference.reorder_stiffness, atol=1e-6)
+
+    def test_assembled_once(self):
+        structure = two_bay_frame()
+        with structure.profile() as profiler:
+            structure._assemble()
+            structure.solve()
+        self.assertEqual(profiler.as_dict()['phases']['assembly']['calls'], 1)
+        self.assertEqual(profiler.counters['partitioned_stiffness'], 1)
+
+    def test_lazy_imports(self):
+        # scipy and matplotlib are only imported on first use
+        code = "import sys, stiffpy.frame; print(any(m in sys.modules for m in ('scipy', 'matplotlib')))"
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+        self.assertEqual(output.stdout.strip(), 'False')
+
+    def test_node_numbering_with_gaps(self):
+        material = Material(1, 1, 1)
+        section = Section(1, 1, material=material)
+        node_1 = Node((0, 0, 0), no=10)
+        node_2 = Node((6, 0, 0), no=25)
+        node_3 = Node((10, 0, 0), no=7)
+        releases = (True, False, True, True, True, False)
+        member_1 = Member(node_1, node_2, section, releases, releases)
+        member_2 = Member(node_2, node_3, section, releases, releases)
+        member_1.distributed_loads = (0, DistributedForce((0, -25, 0), (0, -25, 0), 6))
+        node_1.restrains = (False, True, False, False, False, True)
+        node_2.restrains = (False, True, False, False, False, False)
+        node_3.restrains = (False, True, False, False, False, True)
+        beam = Structure()
+        beam.members = [member_1, member_2]
+        beam.solve()
+        # Nodes sorted by number: 3, 1, 2
+        k = np.array([-16.875, 22.5, 82.5, 90, 84.375])
+        assert_allclose(beam.reactions, k, rtol=.01, atol=.01)
+
 
 if __name__ == '__main__':
     unittest.main()